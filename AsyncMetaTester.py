@@ -0,0 +1,206 @@
+"""
+Asynchronous execution of `MetaTester` processes with bounded concurrency
+"""
+
+import asyncio
+import os
+import signal
+import subprocess
+import threading
+
+from GenUtility import TimeOutLevel, isNoneOrEmpty
+
+
+class MetaTesterJob:
+    def __init__(self, inArguments: list, inTimeOut: int = TimeOutLevel.MEDIUM, inOutputFilePath: str = None,
+                 inOnLine=None):
+        """
+        :param inArguments: MetaTester's executable path followed by its arguments
+        :param inTimeOut: Time in seconds allowed for MetaTester to complete
+        :param inOutputFilePath: Path to stream MetaTester's output to, not written if None
+        :param inOnLine: Callable receiving every line of MetaTester's output without line terminator,
+                         MetaTester is stopped as soon as it returns True
+        """
+        if isNoneOrEmpty(inArguments) or inTimeOut is None or inTimeOut <= 0:
+            raise ValueError('Invalid MetaTester arguments or time out')
+        self.__mArguments = list(inArguments)
+        self.__mTimeOut = int(inTimeOut)
+        self.__mOutputFilePath = inOutputFilePath
+        self.__mOnLine = inOnLine
+
+    def getArguments(self):
+        return self.__mArguments
+
+    def getTimeOut(self):
+        return self.__mTimeOut
+
+    def getOutputFilePath(self):
+        return self.__mOutputFilePath
+
+    def getOnLine(self):
+        return self.__mOnLine
+
+
+class AsyncMetaTesterExecutor:
+
+    # Global Variables
+    MetaTesterDirName = 'MetaTester'
+    StreamLimit = 1024 * 1024
+
+    # Result Attributes
+    ReturnCode = 'ReturnCode'
+    HasOutput = 'HasOutput'
+    TimedOut = 'TimedOut'
+    Stopped = 'Stopped'
+    Error = 'Error'
+
+    def __init__(self, inConcurrency: int = 1):
+        """
+        :param inConcurrency: Maximum number of MetaTester processes running at once
+        """
+        if inConcurrency is None or inConcurrency < 1:
+            raise ValueError('Concurrency must be at least 1')
+        self.__mConcurrency = inConcurrency
+        self.__mSemaphore = None
+        self.__mRunningJobs = set()
+        self.__mLoop = None
+        self.__mThread = None
+        self.__mLock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, inExcType, inExcValue, inTraceback):
+        self.close()
+
+    @staticmethod
+    async def _killProcessTree(inProcess: asyncio.subprocess.Process):
+        """Kills the process along with every process it started"""
+        if inProcess.returncode is not None:
+            return
+        try:
+            if os.name == 'nt':
+                killer = await asyncio.create_subprocess_exec('taskkill', '/F', '/T', '/PID', str(inProcess.pid),
+                                                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                await killer.wait()
+            else:
+                os.killpg(inProcess.pid, signal.SIGKILL)
+        except (ProcessLookupError, OSError):
+            pass
+        if inProcess.returncode is None:
+            try:
+                inProcess.kill()
+            except ProcessLookupError:
+                pass
+        await inProcess.wait()
+
+    @staticmethod
+    async def _stream(inProcess: asyncio.subprocess.Process, inJob: MetaTesterJob, inOutputFile, inResult: dict):
+        onLine = inJob.getOnLine()
+        while True:
+            rawLine = await inProcess.stdout.readline()
+            if len(rawLine) == 0:
+                return
+            inResult[AsyncMetaTesterExecutor.HasOutput] = True
+            line = rawLine.decode(errors='replace').rstrip('\r\n')
+            if inOutputFile is not None:
+                inOutputFile.write(line + '\n')
+            if onLine is not None and onLine(line):
+                inResult[AsyncMetaTesterExecutor.Stopped] = True
+                await AsyncMetaTesterExecutor._killProcessTree(inProcess)
+                return
+
+    async def runJob(self, inJob: MetaTesterJob):
+        """
+        Runs MetaTester once a slot is free among the bounded concurrent runs \n
+        :param inJob: MetaTester's Job
+        :return: Dictionary of `ReturnCode`, `HasOutput`, `TimedOut`, `Stopped` & `Error` of the run
+        """
+        self.__mRunningJobs.add(asyncio.current_task())
+        try:
+            return await self.__runJob(inJob)
+        finally:
+            self.__mRunningJobs.discard(asyncio.current_task())
+
+    async def __runJob(self, inJob: MetaTesterJob):
+        if self.__mSemaphore is None:
+            self.__mSemaphore = asyncio.Semaphore(self.__mConcurrency)
+        result = {AsyncMetaTesterExecutor.ReturnCode: None, AsyncMetaTesterExecutor.HasOutput: False,
+                  AsyncMetaTesterExecutor.TimedOut: False, AsyncMetaTesterExecutor.Stopped: False,
+                  AsyncMetaTesterExecutor.Error: None}
+        async with self.__mSemaphore:
+            # A new process group (POSIX) lets the whole tree be killed at once
+            spawning = asyncio.ensure_future(asyncio.create_subprocess_exec(
+                *inJob.getArguments(), stdout=subprocess.PIPE, limit=AsyncMetaTesterExecutor.StreamLimit,
+                start_new_session=os.name != 'nt'))
+            try:
+                # Spawning is shielded as a cancelled spawn waits for the children of MetaTester
+                # holding its output open, instead the whole tree is killed once spawned
+                process = await asyncio.shield(spawning)
+            except asyncio.CancelledError:
+                try:
+                    await self._killProcessTree(await spawning)
+                except Exception:
+                    pass
+                raise
+            except Exception as error:
+                result[AsyncMetaTesterExecutor.Error] = str(error)
+                return result
+            outputFile = None
+            try:
+                if inJob.getOutputFilePath() is not None:
+                    outputFile = open(inJob.getOutputFilePath(), 'w')
+                await asyncio.wait_for(self._stream(process, inJob, outputFile, result), inJob.getTimeOut())
+                result[AsyncMetaTesterExecutor.ReturnCode] = await process.wait()
+            except asyncio.TimeoutError:
+                result[AsyncMetaTesterExecutor.TimedOut] = True
+                await self._killProcessTree(process)
+            except asyncio.CancelledError:
+                await self._killProcessTree(process)
+                raise
+            except Exception as error:
+                result[AsyncMetaTesterExecutor.Error] = str(error)
+                await self._killProcessTree(process)
+            finally:
+                if outputFile is not None:
+                    outputFile.close()
+        return result
+
+    async def runJobs(self, inJobs: list):
+        """Runs all the given Jobs, at most `inConcurrency` at once, and returns their results in order"""
+        return await asyncio.gather(*(self.runJob(job) for job in inJobs))
+
+    def __ensureLoop(self):
+        with self.__mLock:
+            if self.__mLoop is None:
+                self.__mLoop = asyncio.new_event_loop()
+                self.__mThread = threading.Thread(target=self.__mLoop.run_forever, daemon=True,
+                                                  name='AsyncMetaTesterExecutor')
+                self.__mThread.start()
+            return self.__mLoop
+
+    def submit(self, inJob: MetaTesterJob):
+        """
+        Schedules the Job on the executor's event loop, safe to call from any thread \n
+        :param inJob: MetaTester's Job
+        :return: concurrent.futures.Future resolving to the result of `runJob`
+        """
+        return asyncio.run_coroutine_threadsafe(self.runJob(inJob), self.__ensureLoop())
+
+    async def __cancelAll(self):
+        # Only the Jobs are cancelled as each of them kills its own MetaTester on cancellation
+        tasks = list(self.__mRunningJobs)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def close(self):
+        """Cancels the Jobs still running, killing their MetaTester processes, and stops the event loop"""
+        with self.__mLock:
+            loop, thread = self.__mLoop, self.__mThread
+            self.__mLoop = self.__mThread = None
+        if loop is not None:
+            asyncio.run_coroutine_threadsafe(self.__cancelAll(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
@@ -0,0 +1,251 @@
+"""
+End-to-end benchmark of the runners' own work over synthetic Packages & MetaTester Logs, without network or Driver
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+
+import FakeMetaTester
+import TestCLI
+from FakeMetaTester import generateLogs
+from GenUtility import createDir
+from INIFileTestRunner import INIFileTester
+from MetaTestRunner import MetaTester
+from Packages import Core, Plugin
+
+# Global Variables
+DefaultResultsFileName = 'BenchmarkResults.json'
+CoreBranch = 'Benchmark'
+PluginName = 'Bench'
+
+
+def _writeZip(inZipPath: str, inFiles: dict, inFileSize: int, inSeed: int):
+    """Writes a Zip of the given files, half of each file being incompressible like the binaries of a Package"""
+    randomGenerator = random.Random(inSeed)
+    createDir(os.path.dirname(os.path.abspath(inZipPath)))
+    with zipfile.ZipFile(inZipPath, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for archiveName, content in inFiles.items():
+            if content is None:
+                content = randomGenerator.randbytes(inFileSize // 2) + b'\0' * (inFileSize - inFileSize // 2)
+            archive.writestr(archiveName, content)
+
+
+def generateCore(inDir: str, inFileCount: int, inFileSize: int, inSeed: int = 0):
+    """
+    Generates a Core Package with its `lib` & `ThirdParty` files \n
+    :return: Path to the Core Zip
+    """
+    odbcPath = f"Core/{CoreBranch}/ODBC"
+    files = {f"{odbcPath}/lib/core_{index}.dll": None for index in range(inFileCount // 2)}
+    files.update({f"{odbcPath}/ThirdParty/lib{index}/thirdparty_{index}.dll": None
+                  for index in range(inFileCount - inFileCount // 2)})
+    corePath = os.path.join(inDir, 'Core.zip')
+    _writeZip(corePath, files, inFileSize, inSeed)
+    return corePath
+
+
+def generatePlugin(inDir: str, inFileCount: int, inFileSize: int, inBit: int = 64, inSeed: int = 1):
+    """
+    Generates a Plugin Package with the Branding, INI & Error Messages overlaid by the set-up \n
+    :return: Path to the Plugin Zip
+    """
+    files = {f"Branding/Simba/{PluginName}ODBC.did": b'<DID/>',
+             'lib/CoreBranding/Simba/Setup/rdf.rdfodbc.ini': b'[Driver]\nDriverManagerEncoding=UTF-16\n',
+             f"ErrorMessages/en-US/{PluginName}Messages.xml": b'<Messages/>'}
+    files.update({f"lib/plugin_{index}.dll": None for index in range(inFileCount)})
+    pluginPath = os.path.join(inDir, f"{PluginName}_{inBit}.zip")
+    _writeZip(pluginPath, files, inFileSize, inSeed)
+    return pluginPath
+
+
+def _measure(inFunction, inRepeat: int, inSetup=None):
+    """
+    Times the function, running the setup untimed before every run \n
+    :return: Median, minimum & every duration in seconds
+    """
+    durations = list()
+    for _ in range(inRepeat):
+        if inSetup is not None:
+            inSetup()
+        startTime = time.perf_counter()
+        if inFunction() is False:
+            raise RuntimeError(f"{getattr(inFunction, '__name__', inFunction)} failed")
+        durations.append(time.perf_counter() - startTime)
+    return {'Median': round(statistics.median(durations), 6), 'Min': round(min(durations), 6),
+            'Runs': [round(duration, 6) for duration in durations]}
+
+
+def _getTableFailureCount(inLines):
+    """Returns the count of the `Number of table failures` line of MetaTester's Logs, None if absent"""
+    for line in inLines:
+        if line.startswith('Number of table failures:'):
+            return int(line.split(':', 1)[1])
+    return None
+
+
+def _getCommit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(__file__),
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+def measureStartup(inWorkDir: str, inInputFileName: str, inRepeat: int):
+    """
+    Times `TestCLI.py --help` & `TestCLI.py validate` in new interpreters, as run from the command line \n
+    :return: Results of the bare interpreter, `--help` & `validate` in Key Value pair
+    """
+    cliPath = os.path.abspath(TestCLI.__file__)
+    commands = {'StartupInterpreter': [sys.executable, '-c', 'pass'],
+                'StartupHelp': [sys.executable, cliPath, '--help'],
+                'StartupValidate': [sys.executable, cliPath, 'validate', inWorkDir, inInputFileName]}
+    return {name: _measure(lambda: subprocess.run(command, stdout=subprocess.DEVNULL, cwd=inWorkDir).returncode == 0,
+                           inRepeat)
+            for name, command in commands.items()}
+
+
+def checkStartupBudgets(inResults: dict):
+    """
+    Compares the time `--help` & `validate` take above the bare interpreter with `TestCLI.StartupBudgetsInSeconds` \n
+    :return: True if within the budgets else False
+    """
+    status = True
+    for name, budget in TestCLI.StartupBudgetsInSeconds.items():
+        overhead = inResults[f"Startup{name}"]['Median'] - inResults['StartupInterpreter']['Median']
+        if overhead > budget:
+            print(f"Error: {name} takes {overhead:.3f}s above the interpreter, over its budget of {budget}s")
+            status = False
+    return status
+
+
+def run(inWorkDir: str, inParameters: dict):
+    """
+    Runs every benchmark in the work directory \n
+    :param inWorkDir: Scratch directory for the Packages & Logs
+    :param inParameters: `Repeat`, `FileCount`, `FileSizeInKB`, `Tables`, `Columns`, `CheckedRate` & `CriticalRate`
+    :return: Results of every benchmark in Key Value pair
+    """
+    repeat = inParameters['Repeat']
+    fileSize = inParameters['FileSizeInKB'] * 1024
+    sourceDir = os.path.join(inWorkDir, 'Source')
+    corePath = generateCore(sourceDir, inParameters['FileCount'], fileSize)
+    pluginPath = generatePlugin(sourceDir, inParameters['FileCount'], fileSize)
+    coreInfo = Core(corePath, os.path.join(inWorkDir, 'Core'), CoreBranch, True)
+    pluginInfo = Plugin(pluginPath, os.path.join(inWorkDir, 'Plugin'), 'Simba', {'Host': 'localhost'}, False, True)
+    results = dict()
+
+    def clearDestination(inPackage):
+        return lambda: shutil.rmtree(inPackage.getDestinationPath(), ignore_errors=True)
+
+    results['CoreDownload'] = _measure(coreInfo.download, repeat, clearDestination(coreInfo))
+    results['PluginDownload'] = _measure(pluginInfo.download, repeat, clearDestination(pluginInfo))
+    # A first overlay copies every Core file, the next ones only check that nothing changed
+    results['OverlayCold'] = _measure(lambda: pluginInfo.overlay(coreInfo), repeat,
+                                      lambda: (clearDestination(pluginInfo)(), pluginInfo.download()))
+    results['OverlayWarm'] = _measure(lambda: pluginInfo.overlay(coreInfo), repeat)
+
+    logs = '\n'.join(generateLogs(pluginInfo.getDataSourceName(), inParameters['Tables'], inParameters['Columns'],
+                                  inParameters['CheckedRate'], inParameters['CriticalRate']))
+    parsedLogFilePath = os.path.join(inWorkDir, 'ParsedLogs.txt')
+
+    def parseLogs():
+        # The verdict depends on the mismatch mix, so the failures counted in the parsed Logs are checked instead
+        MetaTester.parseLogs(logs, parsedLogFilePath)
+
+    results['ParseLogs'] = _measure(parseLogs, repeat)
+    with open(parsedLogFilePath) as parsedLogFile:
+        parsedTableFailures = _getTableFailureCount(parsedLogFile)
+    if parsedTableFailures != _getTableFailureCount(logs.splitlines()):
+        raise RuntimeError(f"Parsed Logs report {parsedTableFailures} table failures instead of the generated ones")
+    # The Error Message is reported last so that the whole Logs are scanned
+    iniLogs = logs + '\n' + '\n'.join(generateLogs(pluginInfo.getDataSourceName(), 0, 0, inErrorMessage='Found'))
+    results['INIParseLogs'] = _measure(lambda: INIFileTester._parseLogs(iniLogs), repeat)
+
+    inputFileName = 'Input.json'
+    with open(os.path.join(inWorkDir, inputFileName), 'w') as file:
+        json.dump({'RemoteMachineAddress': 'localhost',
+                   'Core': {'SourcePath': corePath, 'DestPath': os.path.join(inWorkDir, 'Core'), 'Branch': CoreBranch,
+                            'ForceUpdate': False},
+                   'Plugin': {'Compile': [{'SourcePath': pluginPath, 'DestPath': os.path.join(inWorkDir, 'Plugin'),
+                                           'Brand': 'Simba', 'DataSourceConfiguration': {'Host': 'localhost'},
+                                           'WaitForUserToSetupDSN': False, 'ForceUpdate': False}]}}, file)
+    results.update(measureStartup(inWorkDir, inputFileName, repeat))
+
+    if os.name != 'nt':
+        # The fake MetaTester is run through the same executor as the real one, as an executable script
+        metaTesterDir = os.path.join(inWorkDir, MetaTester.MetaTesterDirName)
+        createDir(metaTesterDir)
+        metaTesterPath = os.path.join(metaTesterDir, f"MetaTester{pluginInfo.getPackageBitCount()}.exe")
+        with open(metaTesterPath, 'w') as file:
+            file.write(f"#!/bin/sh\nexec \"{sys.executable}\" \"{os.path.abspath(FakeMetaTester.__file__)}\" "
+                       f"\"$@\" --tables {inParameters['Tables']} --columns {inParameters['Columns']} "
+                       f"--checked-rate {inParameters['CheckedRate']} "
+                       f"--critical-rate {inParameters['CriticalRate']}\n")
+        os.chmod(metaTesterPath, os.stat(metaTesterPath).st_mode | stat.S_IXUSR)
+        results['RunAndParse'] = _measure(
+            lambda: MetaTester.runAndParse(pluginInfo.getDataSourceName(), pluginInfo.getPackageBitCount(),
+                                           metaTesterDir, parsedLogFilePath) is not None, repeat)
+    return results
+
+
+def compare(inResults: dict, inBaselineResults: dict):
+    """Prints the ratio of every benchmark's median to the baseline's, above 1 being slower"""
+    for name, result in inResults['Results'].items():
+        baseline = inBaselineResults.get('Results', dict()).get(name)
+        if baseline is None or baseline['Median'] == 0:
+            print(f"{name:>18}: {result['Median']:.6f}s (no baseline)")
+        else:
+            print(f"{name:>18}: {result['Median']:.6f}s vs {baseline['Median']:.6f}s "
+                  f"x{result['Median'] / baseline['Median']:.2f}")
+
+
+def main(inArguments: list):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--output', default=DefaultResultsFileName, help='Path to write the results to')
+    parser.add_argument('--compare', help='Path to the results of a previous commit to compare with')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--file-count', type=int, default=200, help='Number of files of each Package')
+    parser.add_argument('--file-size', type=int, default=64, help='Size of every Package file in KB')
+    parser.add_argument('--tables', type=int, default=200)
+    parser.add_argument('--columns', type=int, default=50)
+    parser.add_argument('--checked-rate', type=float, default=0.1)
+    parser.add_argument('--critical-rate', type=float, default=0.01)
+    parser.add_argument('--work-dir', help='Scratch directory, a temporary one is used and removed if not given')
+    arguments = parser.parse_args(inArguments)
+    parameters = {'Repeat': arguments.repeat, 'FileCount': arguments.file_count,
+                  'FileSizeInKB': arguments.file_size, 'Tables': arguments.tables, 'Columns': arguments.columns,
+                  'CheckedRate': arguments.checked_rate, 'CriticalRate': arguments.critical_rate}
+
+    workDir = arguments.work_dir if arguments.work_dir is not None else tempfile.mkdtemp(prefix='MetaTestBenchmark')
+    try:
+        results = {'Commit': _getCommit(), 'Python': platform.python_version(), 'Platform': platform.platform(),
+                   'Parameters': parameters, 'Results': run(workDir, parameters)}
+    finally:
+        if arguments.work_dir is None:
+            shutil.rmtree(workDir, ignore_errors=True)
+    with open(arguments.output, 'w') as file:
+        json.dump(results, file, indent=1)
+    print(f"Results: {os.path.abspath(arguments.output)}")
+    if arguments.compare is not None:
+        with open(arguments.compare) as file:
+            compare(results, json.load(file))
+    else:
+        compare(results, dict())
+    return 0 if checkStartupBudgets(results['Results']) else 1
+
+
+if __name__ == '__main__':
+    # i.e python Benchmark.py --output BenchmarkResults.json --compare BaselineResults.json
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,223 @@
+"""
+Stores of the ODBC Driver & Data Source configurations
+"""
+
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from GenUtility import isNoneOrEmpty, createDir
+
+try:
+    import winreg
+except ImportError:
+    # Only the file backed store is available off Windows
+    winreg = None
+
+
+class ConfigurationStore(ABC):
+    """
+    String values grouped under key paths relative to `HKEY_LOCAL_MACHINE\\Software\\ODBC`,
+    i.e `ODBC.INI\\Simba Dremio`, in the view of the given Driver bitness
+    """
+
+    # Key Paths
+    ODBCInstIni = 'ODBCINST.INI'
+    ODBCIni = 'ODBC.INI'
+    ODBCDrivers = 'ODBCINST.INI\\ODBC Drivers'
+    ODBCDataSources = 'ODBC.INI\\ODBC Data Sources'
+
+    # Global Variables
+    DefaultFileName = 'ConfigurationStore.json'
+    __mDefault = None
+    __mDefaultLock = threading.Lock()
+
+    def __init__(self):
+        self.__mLock = threading.Lock()
+        self.__mStatistics = {'Reads': 0, 'Writes': 0, 'Batches': 0, 'Unchanged': 0}
+
+    @abstractmethod
+    def _readValues(self, inKeyPath: str, inDriverBit: int):
+        """Returns the current values of the key, empty if the key does not exist"""
+        pass
+
+    @abstractmethod
+    def _writeValues(self, inKeyPath: str, inDriverBit: int, inValues: dict):
+        """Writes the values to the key in one batch, creating the key if it does not exist"""
+        pass
+
+    def close(self):
+        """Releases the resources held by the store"""
+        pass
+
+    def getValues(self, inKeyPath: str, inDriverBit: int):
+        """
+        Reads the values of the key \n
+        :return: Dictionary of the values if succeeded else None
+        """
+        try:
+            with self.__mLock:
+                self.__mStatistics['Reads'] += 1
+                return self._readValues(inKeyPath, inDriverBit)
+        except Exception as error:
+            print(f"Error: {error}")
+            return None
+
+    def setValues(self, inKeyPath: str, inValues: dict, inDriverBit: int):
+        """
+        Writes only the values which differ from the current ones, in one batch \n
+        :param inKeyPath: Path of the key relative to `Software\\ODBC`. i.e `ODBC.INI\\Simba Dremio`
+        :param inValues: Values in Key Value pair
+        :param inDriverBit: Bit count of the Driver, selecting the 32-bit or 64-bit view
+        :return: True if succeeded else False
+        """
+        if isNoneOrEmpty(inKeyPath, inValues) or inDriverBit not in [32, 64]:
+            print('Error: Invalid Arguments passed')
+            return False
+        try:
+            with self.__mLock:
+                self.__mStatistics['Reads'] += 1
+                # Value names are case insensitive as in the registry
+                currentValues = {name.lower(): value for name, value in self._readValues(inKeyPath, inDriverBit).items()}
+                changedValues = {name: value for name, value in inValues.items()
+                                 if currentValues.get(name.lower()) != value}
+                self.__mStatistics['Unchanged'] += len(inValues) - len(changedValues)
+                if len(changedValues) > 0:
+                    self._writeValues(inKeyPath, inDriverBit, changedValues)
+                    self.__mStatistics['Writes'] += len(changedValues)
+                    self.__mStatistics['Batches'] += 1
+            return True
+        except Exception as error:
+            print(f"Error: {error}")
+            return False
+
+    def getStatistics(self):
+        """Returns the counts of `Reads` of keys, `Writes` of values, written `Batches` & `Unchanged` values"""
+        with self.__mLock:
+            return dict(self.__mStatistics)
+
+    @staticmethod
+    def getDefault():
+        """
+        Returns the store shared by all the users of the process, the Registry on Windows
+        else a file in the Current Working Directory
+        """
+        with ConfigurationStore.__mDefaultLock:
+            if ConfigurationStore.__mDefault is None:
+                if winreg is not None:
+                    ConfigurationStore.__mDefault = RegistryConfigurationStore()
+                else:
+                    print(f"Warning: Registry is not available, configurations are stored in "
+                          f"{ConfigurationStore.DefaultFileName}")
+                    ConfigurationStore.__mDefault = FileConfigurationStore(ConfigurationStore.DefaultFileName)
+            return ConfigurationStore.__mDefault
+
+
+class RegistryConfigurationStore(ConfigurationStore):
+
+    def __init__(self):
+        if winreg is None:
+            raise RuntimeError('Registry is available only on Windows')
+        super().__init__()
+        self.__mSystemBit = int(platform.architecture()[0][:2])
+        self.__mKeys = dict()
+
+    def __getKey(self, inKeyPath: str, inDriverBit: int):
+        """Returns the handle of the key, opened once and kept open for the next reads & writes"""
+        cacheKey = (inDriverBit, inKeyPath.lower())
+        if cacheKey not in self.__mKeys:
+            odbcKeyPath = 'Software\\ODBC' if self.__mSystemBit == inDriverBit else 'Software\\Wow6432Node\\ODBC'
+            self.__mKeys[cacheKey] = winreg.CreateKeyEx(winreg.HKEY_LOCAL_MACHINE, f"{odbcKeyPath}\\{inKeyPath}",
+                                                        0, winreg.KEY_ALL_ACCESS)
+        return self.__mKeys[cacheKey]
+
+    def _readValues(self, inKeyPath: str, inDriverBit: int):
+        key = self.__getKey(inKeyPath, inDriverBit)
+        values = dict()
+        valueCount = winreg.QueryInfoKey(key)[1]
+        for index in range(valueCount):
+            name, value, _ = winreg.EnumValue(key, index)
+            values[name] = value
+        return values
+
+    def _writeValues(self, inKeyPath: str, inDriverBit: int, inValues: dict):
+        key = self.__getKey(inKeyPath, inDriverBit)
+        for name, value in inValues.items():
+            winreg.SetValueEx(key, name, 0, winreg.REG_SZ, value)
+
+    def close(self):
+        for key in self.__mKeys.values():
+            winreg.CloseKey(key)
+        self.__mKeys = dict()
+
+
+class FileConfigurationStore(ConfigurationStore):
+    """Stand-in of the Registry keeping the values in a JSON file"""
+
+    def __init__(self, inFilePath: str):
+        if isNoneOrEmpty(inFilePath):
+            raise ValueError('Invalid Configuration Store file path')
+        super().__init__()
+        self.__mFilePath = os.path.abspath(inFilePath)
+        self.__mViews = dict()
+        if os.path.exists(self.__mFilePath):
+            with open(self.__mFilePath) as file:
+                self.__mViews = json.load(file)
+
+    def __getKey(self, inKeyPath: str, inDriverBit: int):
+        return self.__mViews.setdefault(str(inDriverBit), dict()).setdefault(inKeyPath.lower(), dict())
+
+    def _readValues(self, inKeyPath: str, inDriverBit: int):
+        return dict(self.__getKey(inKeyPath, inDriverBit))
+
+    def _writeValues(self, inKeyPath: str, inDriverBit: int, inValues: dict):
+        key = self.__getKey(inKeyPath, inDriverBit)
+        for name, value in inValues.items():
+            # Replaces the value of the same name in any case
+            for currentName in [currentName for currentName in key if currentName.lower() == name.lower()]:
+                del key[currentName]
+            key[name] = value
+        createDir(os.path.dirname(self.__mFilePath))
+        temporaryFilePath = self.__mFilePath + '.tmp'
+        with open(temporaryFilePath, 'w') as file:
+            json.dump(self.__mViews, file)
+        os.replace(temporaryFilePath, self.__mFilePath)
+
+
+def benchmark(inIterations: int, inStore: ConfigurationStore):
+    """
+    Replays the writes of a Plugin's set-up followed by INI File Tests flipping its Host,
+    and compares the values written with the values requested \n
+    :param inIterations: Number of INI File Tests
+    :param inStore: Store to write to
+    """
+    dataSourceName = 'Simba Benchmark'
+    dataSourceConfiguration = {'Driver': f"{dataSourceName} ODBC Driver", 'Host': 'localhost', 'Port': '9047',
+                               'AuthenticationType': 'Basic Authentication', 'UID': 'user', 'SSL': '0'}
+    requestedCount = 0
+    startTime = time.perf_counter()
+    for iteration in range(inIterations):
+        for keyPath, values in [(f"{ConfigurationStore.ODBCInstIni}\\{dataSourceName} ODBC Driver",
+                                 {'Description': f"{dataSourceName} ODBC Driver", 'Driver': 'MPAPlugin.dll',
+                                  'Setup': 'MPAPlugin.dll'}),
+                                (ConfigurationStore.ODBCDrivers, {f"{dataSourceName} ODBC Driver": 'Installed'}),
+                                (ConfigurationStore.ODBCDataSources, {dataSourceName: f"{dataSourceName} ODBC Driver"}),
+                                (f"{ConfigurationStore.ODBCIni}\\{dataSourceName}", dataSourceConfiguration),
+                                (f"{ConfigurationStore.ODBCIni}\\{dataSourceName}", {'Host': 'lclohtsoa'}),
+                                (f"{ConfigurationStore.ODBCIni}\\{dataSourceName}", {'Host': 'localhost'})]:
+            inStore.setValues(keyPath, values, 64)
+            requestedCount += len(values)
+    duration = time.perf_counter() - startTime
+    statistics = inStore.getStatistics()
+    print(f"{requestedCount} values requested, {statistics['Writes']} written in {statistics['Batches']} batches, "
+          f"{statistics['Unchanged']} unchanged, {duration * 1000 / inIterations:.3f} ms per INI File Test")
+
+
+if __name__ == '__main__':
+    # i.e python ConfigurationStore.py 1000 C:fakepath\ConfigurationStore.json
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1000,
+              FileConfigurationStore(sys.argv[2]) if len(sys.argv) > 2 else ConfigurationStore.getDefault())
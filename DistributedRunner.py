@@ -0,0 +1,520 @@
+"""
+Sharding of the Plugins of an Input File across worker machines pulling jobs from a coordinator
+"""
+
+import collections
+import functools
+import hmac
+import json
+import multiprocessing
+import os
+import secrets
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+from GenUtility import isNoneOrEmpty, createDir
+from Input import InputReader, ManifestReader, validateEntry
+
+
+def _sendMessage(inFile, inMessage: dict):
+    """Writes one message as a line of JSON"""
+    inFile.write((json.dumps(inMessage) + '\n').encode())
+    inFile.flush()
+
+
+def _receiveMessage(inFile):
+    """Reads one message, None once the other side closed the connection"""
+    line = inFile.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+class Coordinator:
+    """
+    Splits the Plugins of the Input File into one job each and hands them to the workers asking for work.
+    Jobs of workers which disconnect or stop sending heartbeats are given to other workers
+    """
+
+    # Message Types
+    Register = 'Register'
+    Request = 'Request'
+    Heartbeat = 'Heartbeat'
+    Log = 'Log'
+    Result = 'Result'
+    Job = 'Job'
+    Wait = 'Wait'
+    Done = 'Done'
+    Ack = 'Ack'
+    Cancelled = 'Cancelled'
+    Rejected = 'Rejected'
+
+    # Global Variables
+    TokenVariableName = 'DISTRIBUTED_RUNNER_TOKEN'
+    SummaryFileName = 'DistributedTestSummary.json'
+    LogsDirName = 'Logs'
+    DefaultLeaseTimeOutInSeconds = 300
+    DefaultMaxAttempts = 3
+    WaitIntervalInSeconds = 1
+
+    def __init__(self, inInputFilePath: str, inOutputDir: str, inTestKinds: list = None, inHost: str = '127.0.0.1',
+                 inPort: int = 0, inLeaseTimeOutInSeconds: float = DefaultLeaseTimeOutInSeconds,
+                 inMaxAttempts: int = DefaultMaxAttempts, inToken: str = None):
+        """
+        :param inInputFilePath: Path to the Input File or JSON Lines manifest
+        :param inOutputDir: Directory to write the streamed Logs & the summary to
+        :param inTestKinds: Kinds of tests the workers run on every Plugin, all if not given
+        :param inHost: Address to listen on, only this machine by default. Workers of other machines need the
+                       address of a reachable interface
+        :param inPort: Port to listen on, any free port if 0
+        :param inLeaseTimeOutInSeconds: Time without heartbeat after which a job is taken back from its worker
+        :param inMaxAttempts: Number of workers a job may be lost with before it is reported as failed
+        :param inToken: Secret every worker must register with, a random one if not given
+        """
+        if isNoneOrEmpty(inInputFilePath, inOutputDir) or not os.path.isfile(inInputFilePath) or \
+                inLeaseTimeOutInSeconds is None or inLeaseTimeOutInSeconds <= 0 or \
+                inMaxAttempts is None or inMaxAttempts < 1:
+            raise ValueError('Invalid Coordinator parameters')
+        self.__mToken = inToken if not isNoneOrEmpty(inToken) else secrets.token_hex(16)
+        self.__mOutputDir = os.path.abspath(inOutputDir)
+        self.__mTestKinds = inTestKinds
+        self.__mLeaseTimeOut = inLeaseTimeOutInSeconds
+        self.__mMaxAttempts = inMaxAttempts
+        self.__mCondition = threading.Condition()
+        # Entries are read from the Input File or manifest only when a worker asks for work,
+        # so that a large matrix is never expanded at once
+        self.__mEntries = ManifestReader(inInputFilePath).iterEntries()
+        self.__mIsExhausted = False
+        self.__mIncompleteCount = 0
+        self.__mJobs = dict()
+        self.__mPendingJobs = collections.deque()
+        self.__mWorkers = dict()
+        self.__mRequeuedCount = 0
+
+        coordinator = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                coordinator._serve(self.rfile, self.wfile, f"{self.client_address[0]}:{self.client_address[1]}")
+
+        self.__mServer = socketserver.ThreadingTCPServer((inHost, inPort), Handler, bind_and_activate=False)
+        self.__mServer.daemon_threads = True
+        self.__mServer.allow_reuse_address = True
+        self.__mServer.server_bind()
+        self.__mServer.server_activate()
+
+    def getAddress(self):
+        """Returns the host & port the coordinator listens on"""
+        return self.__mServer.server_address
+
+    def getToken(self):
+        """Returns the secret the workers register with"""
+        return self.__mToken
+
+    def __isComplete(self):
+        return self.__mIsExhausted and self.__mIncompleteCount == 0
+
+    def __pullJob(self):
+        """Creates the job of the next valid entry, called with the condition held"""
+        for entry in self.__mEntries:
+            jobId = f"Job{len(self.__mJobs)}"
+            pluginEntry = entry[InputReader.Plugin]
+            job = {'Entry': entry['Entry'], 'Plugin': None, 'Input': None, 'Worker': None, 'LeaseDeadline': None,
+                   'Attempts': 0, 'Summary': None}
+            if isinstance(pluginEntry, dict) and isinstance(pluginEntry.get(InputReader.SourcePath), str):
+                job['Plugin'] = os.path.abspath(pluginEntry[InputReader.SourcePath])
+            self.__mJobs[jobId] = job
+            validateEntry(entry)
+            if len(entry['Errors']) > 0:
+                job['Summary'] = {'Status': 'Invalid', 'Errors': entry['Errors']}
+                continue
+            # Every job carries an Input File of its own Plugin, so that a worker runs it like any Input File
+            job['Input'] = {InputReader.RemoteMachineAddress: entry[InputReader.RemoteMachineAddress],
+                            InputReader.Core: entry[InputReader.Core],
+                            InputReader.PackageCache: entry[InputReader.PackageCache],
+                            InputReader.Plugin: {InputReader.Compile: [pluginEntry]}}
+            self.__mIncompleteCount += 1
+            return jobId
+        self.__mIsExhausted = True
+        self.__mCondition.notify_all()
+        return None
+
+    def __complete(self, inJob: dict, inSummary):
+        """Records the summary of the job, called with the condition held"""
+        inJob['Summary'] = inSummary
+        inJob['Input'] = None
+        inJob['LeaseDeadline'] = None
+        self.__mIncompleteCount -= 1
+        self.__mCondition.notify_all()
+
+    def __requeue(self, inJobId: str, inReason: str):
+        """Takes the job back from its worker, called with the condition held"""
+        job = self.__mJobs[inJobId]
+        print(f"Warning: {inJobId} of {job['Plugin']} is taken back from {job['Worker']}. {inReason}")
+        job['Worker'] = None
+        job['LeaseDeadline'] = None
+        if job['Attempts'] >= self.__mMaxAttempts:
+            self.__complete(job, {'Status': 'Failed', 'Reason': f"Lost by {job['Attempts']} workers. {inReason}"})
+        else:
+            self.__mRequeuedCount += 1
+            # Taken back jobs go first as they are the oldest
+            self.__mPendingJobs.appendleft(inJobId)
+        self.__mCondition.notify_all()
+
+    def __isAssigned(self, inJobId: str, inWorker: str):
+        return inJobId in self.__mJobs and self.__mJobs[inJobId]['Worker'] == inWorker
+
+    def _handleMessage(self, inWorker: str, inMessage: dict):
+        """
+        Updates the work queue with a message of the worker \n
+        :return: Reply to the worker
+        """
+        messageType = inMessage.get('Type')
+        with self.__mCondition:
+            if messageType == Coordinator.Register:
+                token = inMessage.get('Token')
+                if not isinstance(token, str) or not hmac.compare_digest(token.encode(), self.__mToken.encode()):
+                    return {'Type': Coordinator.Rejected, 'Error': 'Invalid Token'}
+                self.__mWorkers[inWorker] = {'Name': inMessage.get('Name', inWorker), 'Jobs': 0, 'Connected': True}
+                return {'Type': Coordinator.Ack}
+            elif inWorker not in self.__mWorkers:
+                return {'Type': Coordinator.Rejected, 'Error': 'Worker is not registered'}
+            elif messageType == Coordinator.Request:
+                jobId = self.__mPendingJobs.popleft() if len(self.__mPendingJobs) > 0 else self.__pullJob()
+                if jobId is not None:
+                    job = self.__mJobs[jobId]
+                    job['Worker'] = inWorker
+                    job['Attempts'] += 1
+                    job['LeaseDeadline'] = time.monotonic() + self.__mLeaseTimeOut
+                    return {'Type': Coordinator.Job, 'JobId': jobId, 'Input': job['Input'],
+                            'TestKinds': self.__mTestKinds, 'Attempt': job['Attempts']}
+                if self.__isComplete():
+                    return {'Type': Coordinator.Done}
+                # Jobs of other workers may still be taken back
+                return {'Type': Coordinator.Wait, 'Seconds': Coordinator.WaitIntervalInSeconds}
+            elif messageType in [Coordinator.Heartbeat, Coordinator.Log, Coordinator.Result]:
+                jobId = inMessage.get('JobId')
+                if not self.__isAssigned(jobId, inWorker):
+                    # The job was taken back and given to another worker
+                    return {'Type': Coordinator.Cancelled}
+                job = self.__mJobs[jobId]
+                job['LeaseDeadline'] = time.monotonic() + self.__mLeaseTimeOut
+                if messageType == Coordinator.Log:
+                    self.__writeLog(jobId, inMessage)
+                elif messageType == Coordinator.Result:
+                    summary = inMessage.get('Summary')
+                    # Paths to the Logs on the worker are replaced by the ones of the streamed copies
+                    if isinstance(summary, dict):
+                        for key, logName in inMessage.get('Logs', dict()).items():
+                            summary[key] = self.__getLogFilePath(jobId, logName)
+                        summary['Worker'] = self.__mWorkers.get(inWorker, dict()).get('Name', inWorker)
+                    self.__complete(job, summary if summary is not None else 'Failed')
+                    self.__mWorkers[inWorker]['Jobs'] += 1
+                return {'Type': Coordinator.Ack}
+            return {'Type': Coordinator.Ack, 'Error': f"Unknown message type {messageType}"}
+
+    def __getLogFilePath(self, inJobId: str, inLogName: str):
+        return os.path.join(self.__mOutputDir, Coordinator.LogsDirName, inJobId, os.path.basename(inLogName))
+
+    def __writeLog(self, inJobId: str, inMessage: dict):
+        logFilePath = self.__getLogFilePath(inJobId, inMessage['Name'])
+        createDir(os.path.dirname(logFilePath))
+        # A retried job streams its Logs again from the start
+        with open(logFilePath, 'w' if inMessage.get('Offset', 0) == 0 else 'a') as file:
+            file.write(inMessage.get('Data', ''))
+
+    def _serve(self, inReader, inWriter, inWorker: str):
+        """Answers the messages of one worker's connection until it is closed"""
+        try:
+            while True:
+                message = _receiveMessage(inReader)
+                if message is None:
+                    break
+                reply = self._handleMessage(inWorker, message)
+                _sendMessage(inWriter, reply)
+                if reply['Type'] == Coordinator.Rejected:
+                    print(f"Warning: {inWorker} is rejected. {reply['Error']}")
+                    break
+        except (OSError, ValueError) as error:
+            print(f"Warning: Connection of {inWorker} is lost. {error}")
+        finally:
+            with self.__mCondition:
+                if inWorker in self.__mWorkers:
+                    self.__mWorkers[inWorker]['Connected'] = False
+                for jobId, job in self.__mJobs.items():
+                    if job['Worker'] == inWorker and job['Summary'] is None:
+                        self.__requeue(jobId, 'Worker disconnected')
+
+    def __reapExpiredLeases(self):
+        with self.__mCondition:
+            now = time.monotonic()
+            for jobId, job in self.__mJobs.items():
+                if job['LeaseDeadline'] is not None and job['LeaseDeadline'] < now and job['Summary'] is None:
+                    self.__requeue(jobId, f"No heartbeat for {self.__mLeaseTimeOut} seconds")
+
+    def run(self, inTimeOutInSeconds: float = None):
+        """
+        Serves the workers until every job completed \n
+        :param inTimeOutInSeconds: Time after which the incomplete jobs are given up, unlimited if None
+        :return: Combined summary of the jobs
+        """
+        serverThread = threading.Thread(target=self.__mServer.serve_forever, daemon=True, name='Coordinator')
+        serverThread.start()
+        deadline = time.monotonic() + inTimeOutInSeconds if inTimeOutInSeconds is not None else None
+        try:
+            while True:
+                with self.__mCondition:
+                    if self.__isComplete():
+                        break
+                    elif deadline is not None and time.monotonic() >= deadline:
+                        print('Error: Jobs did not complete in time')
+                        break
+                    self.__mCondition.wait(min(self.__mLeaseTimeOut / 4, Coordinator.WaitIntervalInSeconds * 5))
+                self.__reapExpiredLeases()
+            # Workers still asking for work are told that everything is done before the server stops
+            time.sleep(Coordinator.WaitIntervalInSeconds)
+        finally:
+            self.__mServer.shutdown()
+            self.__mServer.server_close()
+        return self.writeSummary()
+
+    def getSummary(self):
+        """Returns the summary of every job & the workers"""
+        with self.__mCondition:
+            return {'Jobs': {jobId: {'Entry': job['Entry'], 'Plugin': job['Plugin'], 'Attempts': job['Attempts'],
+                                     'Summary': job['Summary'] if job['Summary'] is not None else 'Incomplete'}
+                             for jobId, job in self.__mJobs.items()},
+                    'Workers': {worker['Name']: {'Jobs': worker['Jobs']} for worker in self.__mWorkers.values()},
+                    'RequeuedJobs': self.__mRequeuedCount}
+
+    def writeSummary(self):
+        summary = self.getSummary()
+        createDir(self.__mOutputDir)
+        with open(os.path.join(self.__mOutputDir, Coordinator.SummaryFileName), 'w') as file:
+            json.dump(summary, file)
+        return summary
+
+
+class Worker:
+    """Pulls jobs from the coordinator, runs them locally and streams back their Logs & results"""
+
+    # Global Variables
+    JobFileName = 'Job.json'
+    HeartbeatIntervalInSeconds = 30
+    LogChunkSize = 64 * 1024
+    ConnectTimeOutInSeconds = 30
+
+    def __init__(self, inHost: str, inPort: int, inBasePath: str, inJobRunner, inToken: str, inName: str = None,
+                 inHeartbeatIntervalInSeconds: float = HeartbeatIntervalInSeconds):
+        """
+        :param inHost: Address of the coordinator
+        :param inPort: Port of the coordinator
+        :param inBasePath: Current Working Directory Path of the jobs
+        :param inJobRunner: Callable receiving the job & the Base Path, returning the summary of the job's Plugin
+        :param inToken: Secret of the coordinator
+        :param inName: Name of the worker in the summary, the host name & process id if not given
+        :param inHeartbeatIntervalInSeconds: Time between two heartbeats while a job runs
+        """
+        if isNoneOrEmpty(inHost, inBasePath, inToken) or inPort is None or inJobRunner is None or \
+                inHeartbeatIntervalInSeconds is None or inHeartbeatIntervalInSeconds <= 0:
+            raise ValueError('Invalid Worker parameters')
+        self.__mAddress = (inHost, inPort)
+        self.__mBasePath = inBasePath
+        self.__mJobRunner = inJobRunner
+        self.__mToken = inToken
+        self.__mName = inName if inName is not None else f"{socket.gethostname()}:{os.getpid()}"
+        self.__mHeartbeatInterval = inHeartbeatIntervalInSeconds
+        self.__mLock = threading.Lock()
+        self.__mFile = None
+
+    def __call(self, inMessage: dict):
+        """Sends a message and returns the coordinator's reply, the heartbeats being sent from another thread"""
+        with self.__mLock:
+            _sendMessage(self.__mFile, inMessage)
+            reply = _receiveMessage(self.__mFile)
+        if reply is None:
+            raise ConnectionError('Coordinator closed the connection')
+        return reply
+
+    def __connect(self):
+        deadline = time.monotonic() + Worker.ConnectTimeOutInSeconds
+        while True:
+            try:
+                return socket.create_connection(self.__mAddress)
+            except OSError:
+                # The coordinator may be starting
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(1)
+
+    def __heartbeat(self, inJobId: str, inStopEvent: threading.Event):
+        while not inStopEvent.wait(self.__mHeartbeatInterval):
+            try:
+                self.__call({'Type': Coordinator.Heartbeat, 'JobId': inJobId})
+            except (OSError, ConnectionError):
+                return
+
+    def __streamLogs(self, inJobId: str, inSummary: dict):
+        """Streams the Log files referred to by the summary, returns the names they are streamed under"""
+        logs = dict()
+        if not isinstance(inSummary, dict):
+            return logs
+        for key, value in inSummary.items():
+            if not key.endswith('Logs') or not isinstance(value, str) or not os.path.isfile(value):
+                continue
+            logName = f"{key}_{os.path.basename(value)}"
+            offset = 0
+            with open(value, errors='replace') as file:
+                while True:
+                    data = file.read(Worker.LogChunkSize)
+                    if len(data) == 0 and offset > 0:
+                        break
+                    reply = self.__call({'Type': Coordinator.Log, 'JobId': inJobId, 'Name': logName,
+                                         'Offset': offset, 'Data': data})
+                    if reply['Type'] == Coordinator.Cancelled:
+                        return None
+                    offset += len(data)
+                    if len(data) == 0:
+                        break
+            logs[key] = logName
+        return logs
+
+    def __runJob(self, inJob: dict):
+        stopEvent = threading.Event()
+        heartbeatThread = threading.Thread(target=self.__heartbeat, args=(inJob['JobId'], stopEvent), daemon=True)
+        heartbeatThread.start()
+        try:
+            summary = self.__mJobRunner(inJob, self.__mBasePath)
+        except Exception as error:
+            print(f"Error: {inJob['JobId']} failed. {error}")
+            summary = 'Failed'
+        finally:
+            stopEvent.set()
+            heartbeatThread.join()
+        logs = self.__streamLogs(inJob['JobId'], summary)
+        if logs is None:
+            print(f"Warning: {inJob['JobId']} was given to another worker")
+            return
+        self.__call({'Type': Coordinator.Result, 'JobId': inJob['JobId'], 'Summary': summary, 'Logs': logs})
+
+    def run(self):
+        """
+        Runs jobs until the coordinator has none left \n
+        :return: Number of jobs run
+        """
+        jobCount = 0
+        with self.__connect() as connection:
+            self.__mFile = connection.makefile('rwb')
+            try:
+                reply = self.__call({'Type': Coordinator.Register, 'Name': self.__mName, 'Token': self.__mToken})
+                if reply['Type'] == Coordinator.Rejected:
+                    print(f"Error: {self.__mName} is rejected by the coordinator. {reply['Error']}")
+                    return jobCount
+                while True:
+                    reply = self.__call({'Type': Coordinator.Request})
+                    if reply['Type'] == Coordinator.Done:
+                        break
+                    elif reply['Type'] == Coordinator.Wait:
+                        time.sleep(reply['Seconds'])
+                    elif reply['Type'] == Coordinator.Job:
+                        print(f"{self.__mName}: Running {reply['JobId']}")
+                        self.__runJob(reply)
+                        jobCount += 1
+            finally:
+                self.__mFile.close()
+        return jobCount
+
+
+def runJob(inJob: dict, inBasePath: str, inUserName: str, inPassword: str):
+    """
+    Sets up & tests the job's Plugin through the orchestrator \n
+    :return: Summary of the Plugin
+    """
+    from TestOrchestrator import TestKind, orchestrate
+    jobFileName = f"{inJob['JobId']}_{Worker.JobFileName}"
+    with open(os.path.join(inBasePath, jobFileName), 'w') as file:
+        json.dump(inJob['Input'], file)
+    summary = orchestrate(inUserName, inPassword, inBasePath, jobFileName,
+                          inJob['TestKinds'] if inJob['TestKinds'] is not None else TestKind.All)
+    if summary is None:
+        return 'Failed'
+    elif 'Plugins' not in summary:
+        return {'CoreSetup': summary.get('CoreSetup', 'Failed')}
+    return next(iter(summary['Plugins'].values()))
+
+
+def simulateJob(inJob: dict, inBasePath: str):
+    """
+    Stand-in of `runJob` without Packages, Driver or MetaTester, parsing the Logs of `FakeMetaTester.py` \n
+    :return: Summary of the Plugin
+    """
+    from FakeMetaTester import generateLogs
+    from MetaTestRunner import MetaTester
+    pluginEntry = inJob['Input'][InputReader.Plugin][InputReader.Compile][0]
+    logsPath = os.path.join(inBasePath, inJob['JobId'], 'MetaTesterLogs.txt')
+    createDir(os.path.dirname(logsPath))
+    logs = '\n'.join(generateLogs(pluginEntry[InputReader.SourcePath], 20, 20))
+    status = MetaTester.parseLogs(logs, logsPath)
+    return {'MetaDataTest': 'Succeed' if status else 'Failed', 'MetaDataTestLogs': logsPath}
+
+
+def _runWorker(inHost: str, inPort: int, inBasePath: str, inJobRunner, inToken: str, inName: str):
+    Worker(inHost, inPort, inBasePath, inJobRunner, inToken, inName).run()
+
+
+def runLocal(inInputFilePath: str, inOutputDir: str, inWorkerCount: int, inJobRunner=simulateJob,
+             inTestKinds: list = None):
+    """
+    Runs a coordinator and several worker processes on this machine, talking over a local socket \n
+    :param inJobRunner: Picklable job runner of the workers
+    :return: Combined summary of the jobs
+    """
+    coordinator = Coordinator(inInputFilePath, inOutputDir, inTestKinds)
+    host, port = coordinator.getAddress()
+    workers = list()
+    for index in range(inWorkerCount):
+        workerBasePath = os.path.join(inOutputDir, f"Worker{index}")
+        createDir(workerBasePath)
+        worker = multiprocessing.Process(target=_runWorker,
+                                         args=(host, port, workerBasePath, inJobRunner, coordinator.getToken(),
+                                               f"Worker{index}"))
+        worker.start()
+        workers.append(worker)
+    try:
+        return coordinator.run()
+    finally:
+        for worker in workers:
+            worker.join(Worker.ConnectTimeOutInSeconds)
+            if worker.is_alive():
+                worker.terminate()
+
+
+if __name__ == '__main__':
+    # i.e python DistributedRunner.py coordinate C:fakepath input.json 8765 0.0.0.0
+    #     python DistributedRunner.py work username password C:fakepath coordinator-host 8765
+    #     python DistributedRunner.py local C:fakepath input.json 4
+    # The coordinator & the workers share the secret given by the `DISTRIBUTED_RUNNER_TOKEN` environment variable
+    mode = sys.argv[1] if len(sys.argv) > 1 else None
+    token = os.environ.get(Coordinator.TokenVariableName)
+    if mode == 'coordinate':
+        coordinator = Coordinator(os.path.join(sys.argv[2], sys.argv[3]), sys.argv[2],
+                                  inHost=sys.argv[5] if len(sys.argv) > 5 else '127.0.0.1',
+                                  inPort=int(sys.argv[4]) if len(sys.argv) > 4 else 8765, inToken=token)
+        if isNoneOrEmpty(token):
+            print(f"Workers must set `{Coordinator.TokenVariableName}` to {coordinator.getToken()}")
+        print(coordinator.run())
+    elif mode == 'work':
+        if isNoneOrEmpty(token):
+            print(f"Error: `{Coordinator.TokenVariableName}` must be set to the coordinator's token")
+            sys.exit(1)
+        Worker(sys.argv[5], int(sys.argv[6]) if len(sys.argv) > 6 else 8765, sys.argv[4],
+               functools.partial(runJob, inUserName=sys.argv[2], inPassword=sys.argv[3]), token).run()
+    elif mode == 'local':
+        print(runLocal(os.path.join(sys.argv[2], sys.argv[3]), sys.argv[2],
+                       int(sys.argv[4]) if len(sys.argv) > 4 else 2))
+    else:
+        print('Error: Mode must be `coordinate`, `work` or `local`')
+        sys.exit(1)
@@ -0,0 +1,227 @@
+"""
+Indexed history of the column checks of every MetaData Test, queried across runs without reading any Logs
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from GenUtility import isNoneOrEmpty
+from MismatchClassifier import MismatchVerdict
+
+
+class FailureStore:
+    """
+    Keeps every validated table of a run with its counts of mismatches, and every mismatch with its column,
+    Type Name, kind, API pair & Verdict. Tables without any mismatch are kept too, so that a table which passed
+    before & fails now can be told apart from one which never passed
+    """
+
+    # Global Variables
+    DefaultFileName = 'MetaDataFailures.db'
+    SchemaVersion = 2
+    SecondsPerDay = 24 * 60 * 60
+
+    # Attributes of a column check, as given by `MetaTesterLogParser`
+    CheckAttributes = ['ColumnNumber', 'ColumnName', 'TypeName', 'MismatchKind', 'Rule', 'FirstApi', 'SecondApi',
+                       'Verdict', 'Line']
+
+    def __init__(self, inFilePath: str):
+        """
+        :param inFilePath: Path to the SQLite database, created if absent
+        """
+        if isNoneOrEmpty(inFilePath):
+            raise ValueError('Invalid Failure Store file path')
+        self.__mFilePath = os.path.abspath(inFilePath)
+        self.__mLock = threading.Lock()
+        connection = self.__connect()
+        connection.close()
+
+    def __connect(self):
+        connection = sqlite3.connect(self.__mFilePath, timeout=30)
+        if connection.execute('PRAGMA user_version').fetchone()[0] != FailureStore.SchemaVersion:
+            connection.executescript(f"""
+                CREATE TABLE IF NOT EXISTS Runs (RunId INTEGER PRIMARY KEY AUTOINCREMENT, StartedAt REAL,
+                                                 Description TEXT);
+                CREATE TABLE IF NOT EXISTS Tables (TableId INTEGER PRIMARY KEY AUTOINCREMENT, RunId INTEGER,
+                                                   Plugin TEXT, Brand TEXT, DSN TEXT, TableName TEXT,
+                                                   CriticalCount INTEGER, CheckedCount INTEGER);
+                CREATE TABLE IF NOT EXISTS Checks (TableId INTEGER, ColumnNumber INTEGER, ColumnName TEXT,
+                                                   TypeName TEXT, MismatchKind TEXT, Rule TEXT, FirstApi TEXT,
+                                                   SecondApi TEXT, Verdict TEXT, Line TEXT);
+                DROP INDEX IF EXISTS TablesByName;
+                CREATE INDEX IF NOT EXISTS TablesByName ON Tables (Plugin, DSN, TableName, RunId);
+                CREATE INDEX IF NOT EXISTS TablesByBrand ON Tables (Brand, RunId);
+                CREATE INDEX IF NOT EXISTS TablesByRun ON Tables (RunId);
+                CREATE INDEX IF NOT EXISTS ChecksByTable ON Checks (TableId, Verdict);
+                PRAGMA user_version = {FailureStore.SchemaVersion};
+            """)
+        return connection
+
+    @staticmethod
+    def __query(inConnection, inQuery: str, inParameters: list):
+        cursor = inConnection.execute(inQuery, inParameters)
+        names = [column[0] for column in cursor.description]
+        return [dict(zip(names, row)) for row in cursor]
+
+    def beginRun(self, inDescription: str = None):
+        """
+        Starts a run the next recorded tables belong to \n
+        :return: Id of the run
+        """
+        with self.__mLock:
+            connection = self.__connect()
+            try:
+                with connection:
+                    return connection.execute('INSERT INTO Runs (StartedAt, Description) VALUES (?, ?)',
+                                              (time.time(), inDescription)).lastrowid
+            finally:
+                connection.close()
+
+    def record(self, inRunId: int, inPlugin: str, inBrand: str, inDSN: str, inTables: list):
+        """
+        Records the validated tables of a Plugin in one transaction \n
+        :param inRunId: Id returned by `beginRun`
+        :param inPlugin: Source Path of the Plugin
+        :param inBrand: Brand of the Plugin
+        :param inDSN: Name of the Data Source
+        :param inTables: List of the name & the list of column checks of every table
+        :return: True if succeeded else False
+        """
+        if isNoneOrEmpty(inPlugin, inBrand, inDSN) or inRunId is None or inTables is None:
+            print('Error: Invalid Parameters')
+            return False
+        try:
+            with self.__mLock:
+                connection = self.__connect()
+                try:
+                    with connection:
+                        for tableName, checks in inTables:
+                            verdicts = [check['Verdict'] for check in checks]
+                            tableId = connection.execute(
+                                'INSERT INTO Tables (RunId, Plugin, Brand, DSN, TableName, CriticalCount, '
+                                'CheckedCount) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                (inRunId, inPlugin, inBrand, inDSN, tableName,
+                                 verdicts.count(MismatchVerdict.Critical),
+                                 verdicts.count(MismatchVerdict.Checked))).lastrowid
+                            connection.executemany(
+                                'INSERT INTO Checks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                ((tableId, *(check[name] for name in FailureStore.CheckAttributes))
+                                 for check in checks))
+                finally:
+                    connection.close()
+            return True
+        except sqlite3.Error as error:
+            print(f"Error: Column checks of {inPlugin} could not be recorded. {error}")
+            return False
+
+    @staticmethod
+    def __getConditions(inFilters: dict):
+        filters = {name: value for name, value in inFilters.items() if value is not None}
+        return ''.join(f" AND {name} = ?" for name in filters), list(filters.values())
+
+    def getRuns(self):
+        """Returns every run, the latest first"""
+        connection = self.__connect()
+        try:
+            return FailureStore.__query(connection, 'SELECT RunId, StartedAt, Description FROM Runs '
+                                                    'ORDER BY RunId DESC', [])
+        finally:
+            connection.close()
+
+    def getMismatches(self, inVerdict: str = None, inBrand: str = None, inPlugin: str = None,
+                      inTableName: str = None, inRunId: int = None, inSince: float = None):
+        """
+        Returns the recorded mismatches matching all the given filters, the latest run first \n
+        :param inVerdict: `Critical` or `Checked`
+        :param inSince: Time since the Epoch from which the runs are considered
+        :return: List of the run, Plugin, Brand, DSN, table & every attribute of the column check
+        """
+        conditions, parameters = FailureStore.__getConditions({
+            'Checks.Verdict': inVerdict, 'Tables.Brand': inBrand, 'Tables.Plugin': inPlugin,
+            'Tables.TableName': inTableName, 'Tables.RunId': inRunId})
+        if inSince is not None:
+            conditions += ' AND Runs.StartedAt >= ?'
+            parameters.append(inSince)
+        connection = self.__connect()
+        try:
+            return FailureStore.__query(
+                connection,
+                f"SELECT Tables.RunId, Runs.StartedAt, Plugin, Brand, DSN, TableName, "
+                f"{', '.join(f'Checks.{name}' for name in FailureStore.CheckAttributes)} "
+                f"FROM Checks JOIN Tables ON Checks.TableId = Tables.TableId "
+                f"JOIN Runs ON Tables.RunId = Runs.RunId WHERE 1 = 1{conditions} "
+                f"ORDER BY Tables.RunId DESC, Tables.TableId, Checks.ColumnNumber", parameters)
+        finally:
+            connection.close()
+
+    def getRegressedTables(self, inSince: float, inBrand: str = None, inPlugin: str = None):
+        """
+        Returns the tables of every Plugin & DSN having critical mismatches in their latest run since the given
+        time, which had none in their latest run before it \n
+        :param inSince: Time since the Epoch. i.e a week ago
+        :return: List of the Plugin, Brand, table, the failing run & its Critical count and the last passing run
+        """
+        conditions, parameters = FailureStore.__getConditions({'Failing.Brand': inBrand, 'Failing.Plugin': inPlugin})
+        connection = self.__connect()
+        try:
+            firstRunId = connection.execute('SELECT MIN(RunId) FROM Runs WHERE StartedAt >= ?',
+                                            (inSince,)).fetchone()[0]
+            if firstRunId is None:
+                return list()
+            # Latest results of the tables before & since the given time, found through the index by name
+            return FailureStore.__query(
+                connection,
+                f"SELECT Failing.Plugin, Failing.Brand, Failing.DSN, Failing.TableName, Failing.RunId, "
+                f"Failing.CriticalCount, Passing.RunId AS PassedRunId "
+                f"FROM Tables AS Failing JOIN Tables AS Passing ON Passing.TableId = "
+                f"(SELECT TableId FROM Tables WHERE Plugin = Failing.Plugin AND DSN = Failing.DSN "
+                f"AND TableName = Failing.TableName AND RunId < ? ORDER BY RunId DESC LIMIT 1) "
+                f"WHERE Failing.RunId >= ? AND Failing.CriticalCount > 0 AND Passing.CriticalCount = 0 "
+                f"AND Failing.RunId = (SELECT MAX(RunId) FROM Tables WHERE Plugin = Failing.Plugin "
+                f"AND DSN = Failing.DSN AND TableName = Failing.TableName){conditions} "
+                f"ORDER BY Failing.Plugin, Failing.DSN, Failing.TableName", [firstRunId, firstRunId, *parameters])
+        finally:
+            connection.close()
+
+
+def main(inArguments: list):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('filePath', help=f"Path to the Failure Store. i.e C:fakepath\\{FailureStore.DefaultFileName}")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    mismatchesParser = subparsers.add_parser('mismatches', help='Lists the recorded mismatches')
+    mismatchesParser.add_argument('--verdict', choices=[MismatchVerdict.Critical, MismatchVerdict.Checked])
+    mismatchesParser.add_argument('--table')
+    mismatchesParser.add_argument('--run', type=int)
+    regressedParser = subparsers.add_parser('regressed', help='Lists the tables which passed before & fail now')
+    for subparser in [mismatchesParser, regressedParser]:
+        subparser.add_argument('--brand')
+        subparser.add_argument('--plugin')
+        subparser.add_argument('--days', type=float, help='Number of days back to consider')
+    arguments = parser.parse_args(inArguments)
+
+    failureStore = FailureStore(arguments.filePath)
+    since = time.time() - arguments.days * FailureStore.SecondsPerDay if arguments.days is not None else None
+    if arguments.command == 'mismatches':
+        for mismatch in failureStore.getMismatches(arguments.verdict, arguments.brand, arguments.plugin,
+                                                   arguments.table, arguments.run, since):
+            print(f"Run {mismatch['RunId']} {mismatch['DSN']} {mismatch['TableName']} "
+                  f"column {mismatch['ColumnNumber']} {mismatch['ColumnName']} ({mismatch['TypeName']}): "
+                  f"{mismatch['Line']} --- {mismatch['Verdict']}")
+    else:
+        if since is None:
+            print('Error: `--days` is required')
+            return 1
+        for table in failureStore.getRegressedTables(since, arguments.brand, arguments.plugin):
+            print(f"{table['DSN']} {table['TableName']}: {table['CriticalCount']} critical mismatches in run "
+                  f"{table['RunId']}, passed in run {table['PassedRunId']}")
+    return 0
+
+
+if __name__ == '__main__':
+    # i.e python FailureStore.py C:fakepath\MetaDataFailures.db mismatches --verdict Critical --brand Simba
+    #     python FailureStore.py C:fakepath\MetaDataFailures.db regressed --days 7
+    sys.exit(main(sys.argv[1:]))
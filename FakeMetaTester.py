@@ -0,0 +1,89 @@
+"""
+Stand-in of `MetaTester{32,64}.exe` emitting synthetic Logs, to measure the runners without a Driver
+"""
+
+import argparse
+import random
+import sys
+
+# Lines of a column validation, by the verdict the default Mismatch Rules give them
+MismatchLines = {
+    'Checked': ['Unsigned mismatch: SQLColumns: 1 SQLColAttribute: 0',
+                'Type name mismatch: SQLColumns: {type} SQLGetTypeInfo: {type}',
+                'Local type name mismatch: SQLColAttribute: W{type} SQLGetTypeInfo: {type}'],
+    'Critical': ['Column size mismatch: SQLColumns: 255 SQLColAttribute: 510',
+                 'Type name mismatch: SQLColumns: UNKNOWN SQLGetTypeInfo: {type}'],
+}
+ColumnTypes = ['VARCHAR', 'INTEGER', 'BIGINT', 'DOUBLE', 'TIMESTAMP', 'DATE', 'BOOLEAN', 'DECIMAL']
+ErrorMessageLines = {
+    'Found': '*** ODBC Error/Warning: [HY000] [Simba][Fake] (10) Failed to establish a connection with the host',
+    'Failure': '*** ODBC Error/Warning: An error occurred while attempting to retrieve the error message for key '
+               "'FakeConnectionError' and component ID 100",
+}
+
+
+def generateLogs(inDSN: str, inTableCount: int, inColumnCount: int, inCheckedRate: float = 0.1,
+                 inCriticalRate: float = 0.01, inErrorMessage: str = None, inSeed: int = 0):
+    """
+    Yields the Log lines of a MetaData sweep over synthetic tables \n
+    :param inDSN: Name of the Data Source
+    :param inTableCount: Number of tables
+    :param inColumnCount: Number of columns per table
+    :param inCheckedRate: Ratio of columns reporting an ignorable mismatch
+    :param inCriticalRate: Ratio of columns reporting a critical mismatch
+    :param inErrorMessage: `Found` or `Failure` to report a connection Error Message first, as in an INI File Test
+    :param inSeed: Seed of the mismatch mix, so that runs are comparable
+    """
+    randomGenerator = random.Random(inSeed)
+    yield f"MetaTester connecting to DSN: {inDSN}"
+    if inErrorMessage is not None:
+        yield ErrorMessageLines[inErrorMessage]
+    tableFailures = 0
+    for tableNumber in range(1, inTableCount + 1):
+        yield f"Table: FAKE.SCHEMA.TABLE_{tableNumber}"
+        yield 'Verifying SQLPreare'
+        yield 'Validating individual columns...'
+        hadFailure = False
+        for columnNumber in range(1, inColumnCount + 1):
+            columnType = ColumnTypes[randomGenerator.randrange(len(ColumnTypes))]
+            yield f"Column: {columnNumber} Name: COLUMN_{columnNumber} Type Name: {columnType}"
+            draw = randomGenerator.random()
+            if draw < inCriticalRate:
+                hadFailure = True
+                yield randomGenerator.choice(MismatchLines['Critical']).format(type=columnType)
+            elif draw < inCriticalRate + inCheckedRate:
+                yield randomGenerator.choice(MismatchLines['Checked']).format(type=columnType)
+        yield 'Done validating individual columns.'
+        tableFailures += 1 if hadFailure else 0
+    yield f"Number of table failures: {tableFailures}"
+    yield 'Done validation'
+
+
+def main(inArguments: list):
+    parser = argparse.ArgumentParser(description=__doc__)
+    # Arguments given by the runners to the real MetaTester
+    parser.add_argument('-d', dest='dsn', required=True)
+    parser.add_argument('-o', dest='logFile')
+    parser.add_argument('--tables', type=int, default=100)
+    parser.add_argument('--columns', type=int, default=50)
+    parser.add_argument('--checked-rate', type=float, default=0.1)
+    parser.add_argument('--critical-rate', type=float, default=0.01)
+    parser.add_argument('--error-message', choices=list(ErrorMessageLines))
+    parser.add_argument('--seed', type=int, default=0)
+    arguments = parser.parse_args(inArguments)
+    logFile = open(arguments.logFile, 'w') if arguments.logFile is not None else None
+    try:
+        for line in generateLogs(arguments.dsn, arguments.tables, arguments.columns, arguments.checked_rate,
+                                 arguments.critical_rate, arguments.error_message, arguments.seed):
+            sys.stdout.write(line + '\n')
+            if logFile is not None:
+                logFile.write(line + '\n')
+    finally:
+        if logFile is not None:
+            logFile.close()
+    return 0
+
+
+if __name__ == '__main__':
+    # i.e python FakeMetaTester.py -d "Simba Dremio" -o Logs.txt --tables 100 --columns 50
+    sys.exit(main(sys.argv[1:]))
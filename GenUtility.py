@@ -5,6 +5,7 @@ General Utility Functions
 import errno
 import os
 import subprocess
+import tempfile
 from enum import IntEnum
 
 
@@ -53,15 +54,29 @@ def writeInFile(inFileContent: str, inFileLocation: str):
 def runExecutable(inCommands: str, inTimeOut: TimeOutLevel = TimeOutLevel.MEDIUM):
     """Opens up an executable file."""
     if not isNoneOrEmpty(inCommands):
-        with open('exec.bat', 'w') as file:
+        # Unique batch file per call so that concurrent workers never overwrite each other's commands
+        fileDescriptor, batchFilePath = tempfile.mkstemp(suffix='.bat', prefix='exec_', dir=os.getcwd())
+        with os.fdopen(fileDescriptor, 'w') as file:
             file.write(inCommands)
         try:
-            subprocess.run('exec.bat', timeout=inTimeOut.value)
+            subprocess.run(batchFilePath, timeout=inTimeOut.value)
         except subprocess.TimeoutExpired:
             print(f"Error: {inCommands} could not be executed in {inTimeOut.value/60} Minutes!")
             return False
         finally:
-            os.remove('exec.bat')
+            os.remove(batchFilePath)
         return True
     else:
         return False
+
+
+def killProcessTree(inProcess: subprocess.Popen):
+    """Kills the process along with every process it started, i.e the executables run by a batch file"""
+    if inProcess.poll() is not None:
+        return
+    if os.name == 'nt':
+        subprocess.run(['taskkill', '/F', '/T', '/PID', str(inProcess.pid)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if inProcess.poll() is None:
+        inProcess.kill()
+    inProcess.wait()
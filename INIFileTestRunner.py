@@ -1,26 +1,39 @@
 import json
 import random
 import sys
-import winreg
-import platform
 import re
 import os
 
-from GenUtility import TimeOutLevel, isNoneOrEmpty, runExecutable, writeInFile
-from Input import InputReader
-from RemoteConnection import RemoteConnection
+from AsyncMetaTester import AsyncMetaTesterExecutor, MetaTesterJob
+from ConfigurationStore import ConfigurationStore
+from GenUtility import TimeOutLevel, isNoneOrEmpty, runExecutable, writeInFile, createDir
 from MetaTestRunner import MetaTester
+from Packages import Plugin
+from Tracer import Tracer
 
 
 class INIFileTester:
 
+    # Global Variables
+    ErrorMessageLinePrefix = '*** ODBC Error/Warning:'
+    ErrorMessageFailureMarker = 'An error occurred while attempting to retrieve the error message for key'
+    # Regex pattern to match `[SQLState] [Brand] [Plugin] (ErrorCode) ErrorMessage` sequentially
+    ErrorMessagePattern = re.compile(r'\*\*\* ODBC Error/Warning: \[([A-Z0-9]+)\] '
+                                     r'\[([A-Za-z0-9]+)\]\[([A-Za-z0-9]+)\]'
+                                     r' \(([0-9]+)\) (.)')
+
     @staticmethod
     def run(inDSN: str, inDriverBit: int, inLogsPath: str, inDriverRegistryConfig: dict,
-            inMetaTesterDir: str, inWaitForUserToSetupDSN: bool = False):
+            inMetaTesterDir: str, inWaitForUserToSetupDSN: bool = False, inProbeMode: bool = True,
+            inExecutor: AsyncMetaTesterExecutor = None, inTimeOut: int = TimeOutLevel.MEDIUM):
         """
         Tests if error-messages are correctly accessed using INI File \n
         :param inMetaTesterDir: Path to MetaTester Directory
         :param inWaitForUserToSetupDSN: If True, Wait for user to modify DSN Setup
+        :param inProbeMode: If True, MetaTester is stopped as soon as its output decides the test
+                            else it runs to completion
+        :param inExecutor: Executor to run MetaTester on in probe mode, a dedicated one if not given
+        :param inTimeOut: Time in seconds allowed for MetaTester to decide the test in probe mode
         :param inDSN: Name of the Data Source
         :param inDriverBit: Bit count of Driver
         :param inLogsPath: Path to save logs
@@ -50,13 +63,21 @@ class INIFileTester:
                 if not INIFileTester._setupDriverConfigurationsInRegistry(inDSN, inDriverBit, incorrectDSNConfig):
                     return False
             try:
-                logs = MetaTester.run(inDSN, inDriverBit, inMetaTesterDir)
-                if not isNoneOrEmpty(logs):
-                    writeInFile(logs, inLogsPath)
-                    hadFailure = not INIFileTester._parseLogs(logs)
+                if inProbeMode:
+                    probeStatus = INIFileTester.probe(inDSN, inDriverBit, inMetaTesterDir, inLogsPath, inTimeOut,
+                                                      inExecutor)
+                    if probeStatus is None:
+                        print('MetaTester failed to initiate')
+                        return False
+                    hadFailure = not probeStatus
                 else:
-                    print('MetaTester failed to initiate')
-                    return False
+                    logs = MetaTester.run(inDSN, inDriverBit, inMetaTesterDir)
+                    if not isNoneOrEmpty(logs):
+                        writeInFile(logs, inLogsPath)
+                        hadFailure = not INIFileTester._parseLogs(logs)
+                    else:
+                        print('MetaTester failed to initiate')
+                        return False
             except Exception as error:
                 print(f"Error: {error}")
                 hadFailure = True
@@ -95,25 +116,76 @@ class INIFileTester:
         :return: True if succeeded else False
         """
         if inDriverBit is not None and inDriverBit in [32, 64] and (not isNoneOrEmpty(inDriverRegistryConfig)):
-            systemBit = int(platform.architecture()[0][:2])
-            try:
-                with winreg.ConnectRegistry(None, winreg.HKEY_LOCAL_MACHINE) as hkey:
-                    with winreg.OpenKey(hkey, 'Software', 0, winreg.KEY_READ) as parentKey:
-                        if systemBit != inDriverBit:
-                            parentKey = winreg.OpenKey(parentKey, 'Wow6432Node', 0, winreg.KEY_READ)
-                        with winreg.OpenKey(parentKey, 'ODBC', 0, winreg.KEY_READ) as odbcKey:
-                            with winreg.OpenKey(odbcKey, 'ODBC.INI', 0, winreg.KEY_WRITE) as odbcIniKey:
-                                with winreg.CreateKeyEx(odbcIniKey, inTargetKey, 0, winreg.KEY_ALL_ACCESS) as driverKey:
-                                    for key, value in inDriverRegistryConfig.items():
-                                        winreg.SetValueEx(driverKey, key, 0, winreg.REG_SZ, value)
-            except Exception as e:
-                print(f"Error: {e}")
-                return False
-            return True
+            # Only the values differing from the current ones are written, so flipping a single
+            # Connection Property back and forth rewrites only that value
+            with Tracer.getDefault().span('DSNConfiguration'):
+                return ConfigurationStore.getDefault().setValues(f"{ConfigurationStore.ODBCIni}\\{inTargetKey}",
+                                                                 inDriverRegistryConfig, inDriverBit)
         else:
             print('Error: Invalid Arguments passed')
             return False
 
+    @staticmethod
+    def _checkLine(inLine: str):
+        """
+        Checks a line of MetaTester's output for the outcome of the INI File Test \n
+        :return: True if the expected Error Message is found, False if it could not be retrieved else None
+        """
+        if INIFileTester.ErrorMessageFailureMarker in inLine:
+            return False
+        if INIFileTester.ErrorMessageLinePrefix in inLine:
+            matchedStr = INIFileTester.ErrorMessagePattern.match(inLine)
+            if matchedStr is not None and len(matchedStr.groups()) >= 5:
+                print(f"Expected ErrorMessage for INI File Test found: {inLine}")
+                return True
+        return None
+
+    @staticmethod
+    def probe(inDSN: str, inDriverBit: int, inMetaTesterDir: str, inLogsPath: str,
+              inTimeOut: int = TimeOutLevel.MEDIUM, inExecutor: AsyncMetaTesterExecutor = None):
+        """
+        Streams MetaTester's output to the Logs and stops MetaTester at the first line deciding the INI File Test,
+        instead of waiting for the whole MetaData sweep \n
+        :param inDSN: Name of the Data Source
+        :param inDriverBit: Bit count of Driver
+        :param inMetaTesterDir: Path to MetaTester Directory
+        :param inLogsPath: Path to save logs
+        :param inTimeOut: Time in seconds allowed for MetaTester to decide the test
+        :param inExecutor: Executor to run MetaTester on, a dedicated one if not given
+        :return: True if the expected Error Message was found, False if not and
+                 None if MetaTester could not be executed
+        """
+        preparedCommand = MetaTester._prepareCommand(inDSN, inDriverBit, inMetaTesterDir)
+        if preparedCommand is None:
+            return None
+        arguments, _ = preparedCommand
+        outcome = dict()
+
+        def onLine(inLine: str):
+            status = INIFileTester._checkLine(inLine)
+            if status is not None:
+                outcome['Status'] = status
+                return True
+            return False
+
+        createDir(os.path.dirname(os.path.abspath(inLogsPath)))
+        executor = inExecutor if inExecutor is not None else AsyncMetaTesterExecutor()
+        try:
+            with Tracer.getDefault().span('MetaTester'):
+                result = executor.submit(MetaTesterJob(arguments, inTimeOut, inLogsPath, onLine)).result()
+        finally:
+            if inExecutor is None:
+                executor.close()
+        if result[AsyncMetaTesterExecutor.Error] is not None:
+            print(f"Error: {result[AsyncMetaTesterExecutor.Error]}")
+            return None
+        if not result[AsyncMetaTesterExecutor.HasOutput]:
+            print('Error: MetaTester did not generate any Logs')
+            return None
+        if result[AsyncMetaTesterExecutor.TimedOut]:
+            print(f"Error: MetaTester did not report any Error Message in {inTimeOut / 60} Minutes!")
+        return outcome.get('Status', False)
+
     @staticmethod
     def _parseLogs(inLogs: str):
         """
@@ -122,16 +194,10 @@ class INIFileTester:
         :return: True if succeeded else False
         """
         if not isNoneOrEmpty(inLogs):
-            if 'An error occurred while attempting to retrieve the error message for key' not in inLogs:
+            if INIFileTester.ErrorMessageFailureMarker not in inLogs:
                 for currLine in inLogs.splitlines():
-                    if '*** ODBC Error/Warning:' in currLine:
-                        # Regex pattern to match `[SQLState] [Brand] [Plugin] (ErrorCode) ErrorMessage` sequentially
-                        matchedStr = re.match(r'\*\*\* ODBC Error/Warning: \[([A-Z0-9]+)\] '
-                                              r'\[([A-Za-z0-9]+)\]\[([A-Za-z0-9]+)\]'
-                                              r' \(([0-9]+)\) (.)', currLine)
-                        if len(matchedStr.groups()) >= 5:
-                            print(f"Expected ErrorMessage for INI File Test found: {currLine}")
-                            return True
+                    if INIFileTester._checkLine(currLine):
+                        return True
                 return False
             else:
                 return False
@@ -140,51 +206,51 @@ class INIFileTester:
             return False
 
 
-def main(inUserName: str, inPassword: str, inBasePath: str, inputFileName: str):
-    if isNoneOrEmpty(inUserName, inPassword, inBasePath, inputFileName):
-        print('Error: Invalid Parameter')
-    elif not os.path.exists(inBasePath):
-        print(f"Error: Invalid Path {inBasePath}")
+def _runINIFileTest(inPluginInfo: Plugin, inBasePath: str, inExecutor: AsyncMetaTesterExecutor = None):
+    """
+    Performs INI File Test on the given set up Plugin \n
+    :param inPluginInfo: Plugin's information
+    :param inBasePath: Current Working Directory Path
+    :param inExecutor: Executor running the MetaTesters of all the workers
+    :return: Summary of the test
+    """
+    sourceFilePath = os.path.abspath(inPluginInfo.getSourcePath())
+    testSummary = dict()
+    logsPath = inPluginInfo.getLogFilePath('INIFileTestLogs')
+    MetaTesterPath = os.path.join(inBasePath, MetaTester.MetaTesterDirName)
+    if INIFileTester.run(inPluginInfo.getDataSourceName(), inPluginInfo.getPackageBitCount(), logsPath,
+                         inPluginInfo.getDataSourceConfiguration(), MetaTesterPath,
+                         inPluginInfo.shouldWaitForUserToSetupDSN(), inExecutor=inExecutor,
+                         inTimeOut=inPluginInfo.getMetaTesterTimeOut()):
+        testSummary['INIFileTest'] = 'Succeed'
+        testSummary['INIFileTestLogs'] = logsPath
+        print(f"{sourceFilePath}: INI File Test ran to completion successfully")
     else:
-        inputReader = InputReader(os.path.join(inBasePath, inputFileName))
-        summary = dict()
-        remoteConnection = RemoteConnection(inputReader.getRemoteMachineAddress(), inUserName, inPassword)
-        if remoteConnection.connect():
-            coreInfo = inputReader.getCoreInfo()
-            if coreInfo.download():
-                summary['CoreSetup'] = 'Succeed'
-            else:
-                summary['CoreSetup'] = 'Failed'
-                return summary
-
-            summary['Plugins'] = dict()
-            for pluginInfo in inputReader.getPluginInfo():
-                sourceFilePath = os.path.abspath(pluginInfo.getSourcePath())
-
-                if pluginInfo.setup(coreInfo):
-                    summary['Plugins'][sourceFilePath] = dict()
-                    summary['Plugins'][sourceFilePath]['Setup'] = 'Succeed'
-                    logsPath = os.path.join(pluginInfo.getLogsPath(), f"{pluginInfo.getPluginBrand()}_"
-                                                                      f"{pluginInfo.getPackageName()}_"
-                                                                      f"INIFileTestLogs.txt")
-                    MetaTesterPath = os.path.join(inBasePath, MetaTester.MetaTesterDirName)
-                    if INIFileTester.run(pluginInfo.getDataSourceName(), pluginInfo.getPackageBitCount(), logsPath,
-                                         pluginInfo.getDataSourceConfiguration(), MetaTesterPath,
-                                         pluginInfo.shouldWaitForUserToSetupDSN()):
-                        summary['Plugins'][sourceFilePath]['INIFileTest'] = 'Succeed'
-                        summary['Plugins'][sourceFilePath]['INIFileTestLogs'] = logsPath
-                        print(f"{sourceFilePath}: INI File Test ran to completion successfully")
-                    else:
-                        summary['Plugins'][sourceFilePath]['INIFileTest'] = 'Failed'
-                        summary['Plugins'][sourceFilePath]['INIFileTestLogs'] = logsPath
-                        print(f"{sourceFilePath}: INI File Test failed")
-                else:
-                    summary['Plugins'][sourceFilePath] = 'Failed'
-            remoteConnection.disconnect()
+        testSummary['INIFileTest'] = 'Failed'
+        testSummary['INIFileTestLogs'] = logsPath
+        print(f"{sourceFilePath}: INI File Test failed")
+    return testSummary
+
 
-            with open(os.path.join(inBasePath, 'INIFileTestSummary.json'), 'w') as file:
-                json.dump(summary, file)
+def main(inUserName: str, inPassword: str, inBasePath: str, inputFileName: str, inForceRun: bool = False,
+         inTrace: bool = False):
+    """
+    Performs INI File Test on all the Plugins of the Input File \n
+    :param inForceRun: If True, every Plugin is tested again even if it passed with the same inputs before
+    :param inTrace: If True, the stages are traced to `Trace.json` and their durations added to the summary
+    """
+    # Imported here as the orchestrator itself runs the tests of this module
+    from TestOrchestrator import TestKind, orchestrate
+    summary = orchestrate(inUserName, inPassword, inBasePath, inputFileName, [TestKind.INIFile],
+                          inForceRun=inForceRun,
+                          inTraceFilePath=os.path.join(inBasePath, Tracer.DefaultFileName) if inTrace else None)
+    if summary is not None and 'Plugins' in summary:
+        with open(os.path.join(inBasePath, 'INIFileTestSummary.json'), 'w') as file:
+            json.dump(summary, file)
+    return summary
 
 
 if __name__ == '__main__':
-    main(sys.argv[1], sys.argv[2], sys.argv[3], sys.argv[4])
+    # `--force` tests every Plugin again even if its results could be reused, `--trace` traces the stages
+    arguments = [argument for argument in sys.argv[1:] if argument not in ['--force', '--trace']]
+    main(arguments[0], arguments[1], arguments[2], arguments[3], '--force' in sys.argv[1:], '--trace' in sys.argv[1:])
@@ -1,7 +1,11 @@
+import itertools
 import json
 import os
-import sys
+import re
+from GenUtility import TimeOutLevel
 from Packages import Core, Plugin
+from PackageCache import PackageCache
+from ScalabilityTestRunner import ScalabilityTestRunner
 
 
 class InputReader:
@@ -18,51 +22,216 @@ class InputReader:
     Brand = 'Brand'
     DataSourceConfiguration = 'DataSourceConfiguration'
     WaitForUserToSetupDSN = 'WaitForUserToSetupDSN'
+    PackageCache = 'PackageCache'
+    Path = 'Path'
+    SizeQuotaInGB = 'SizeQuotaInGB'
+    MetaTesterTimeOut = 'MetaTesterTimeOut'
+    ScalabilityEngine = 'ScalabilityEngine'
+    Matrix = 'Matrix'
 
-    def __init__(self, inInputFileName: str):
-        if os.path.exists(inInputFileName):
-            with open(inInputFileName) as file:
-                inInputFile = json.load(file)
-        else:
-            print(f"Error: Given {inInputFileName} file not found")
-            sys.exit(1)
-        if InputReader.RemoteMachineAddress in inInputFile and \
-                inInputFile[InputReader.RemoteMachineAddress] is not None \
-                and len(inInputFile[InputReader.RemoteMachineAddress]) > 0:
-            self.__mRemoteMachineAddress = inInputFile[InputReader.RemoteMachineAddress]
-        else:
-            print(f"Error: Invalid Attribute: `{InputReader.RemoteMachineAddress}`")
-            sys.exit(1)
+    # Default Package Cache size quota
+    DefaultPackageCacheSizeQuotaInGB = 20
+
+
+def _substitute(inTemplate, inValues: dict, inPlaceholderPattern):
+    """
+    Replaces the `{Axis}` placeholders of every string of the template. Any other brace, i.e of
+    `{ODBC Driver}` in a Data Source Configuration, is kept as is
+    """
+    if isinstance(inTemplate, str):
+        return inPlaceholderPattern.sub(lambda match: str(inValues[match.group(1)]), inTemplate) \
+            if '{' in inTemplate else inTemplate
+    elif isinstance(inTemplate, dict):
+        return {key: _substitute(value, inValues, inPlaceholderPattern) for key, value in inTemplate.items()}
+    elif isinstance(inTemplate, list):
+        return [_substitute(value, inValues, inPlaceholderPattern) for value in inTemplate]
+    return inTemplate
+
+
+def expandMatrix(inMatrixEntry: dict):
+    """
+    Yields the Plugin entries of every combination of the matrix axes one at a time, i.e for
+    `{"Matrix": {"Brand": ["Simba"], "Bit": [32, 64]}, "Plugin": {"SourcePath": "Z:Dremio_{Bit}.zip", ...}}`.
+    The `Core` template, if given, is expanded the same way \n
+    :return: Values of the axes, Plugin entry & Core entry or None, and the error if the combination is invalid
+    """
+    axes = inMatrixEntry.get(InputReader.Matrix)
+    if not isinstance(axes, dict) or len(axes) == 0 or \
+            any(not isinstance(values, list) or len(values) == 0 for values in axes.values()) or \
+            not isinstance(inMatrixEntry.get(InputReader.Plugin), dict):
+        yield None, None, None, f"`{InputReader.Matrix}` must map every axis to a list of values " \
+                                f"and come with a `{InputReader.Plugin}` template"
+        return
+    # Only the names of the axes are placeholders
+    placeholderPattern = re.compile('{(' + '|'.join(re.escape(axis) for axis in axes) + ')}')
+    for combination in itertools.product(*axes.values()):
+        values = dict(zip(axes, combination))
+        pluginEntry = _substitute(inMatrixEntry[InputReader.Plugin], values, placeholderPattern)
+        coreEntry = _substitute(inMatrixEntry[InputReader.Core], values, placeholderPattern) \
+            if InputReader.Core in inMatrixEntry else None
+        yield values, pluginEntry, coreEntry, None
+
+
+class ManifestReader:
+    """
+    Streams the Plugin entries of an Input File (`.json`) or of a JSON Lines manifest (`.jsonl`), expanding the
+    matrices as they are reached, so that memory does not grow with the number of Plugins. Every line of a
+    manifest is either the `RemoteMachineAddress`, `Core` & `PackageCache` settings of the following lines,
+    a Plugin entry or a `Matrix`
+    """
+
+    # Global Variables
+    ManifestFileExtension = '.jsonl'
+    SettingKeys = [InputReader.RemoteMachineAddress, InputReader.Core, InputReader.PackageCache]
+
+    def __init__(self, inFilePath: str):
+        self.__mFilePath = inFilePath
+
+    def iterEntries(self):
+        """
+        Yields every Plugin entry with the settings it runs with and the errors found while reading it \n
+        :return: Entries with `Entry` (where it was read), `RemoteMachineAddress`, `Core`, `PackageCache`,
+                 `Plugin` & `Errors`
+        """
+        if not os.path.exists(self.__mFilePath):
+            yield ManifestReader.__createEntry(self.__mFilePath, dict(), None,
+                                               f"Given {self.__mFilePath} file not found")
+            return
+        if self.__mFilePath.endswith(ManifestReader.ManifestFileExtension):
+            yield from self.__iterManifestEntries()
+            return
         try:
-            self.__mCoreInfo = Core(inInputFile[InputReader.Core][InputReader.SourcePath],
-                                    inInputFile[InputReader.Core][InputReader.DestPath],
-                                    inInputFile[InputReader.Core][InputReader.Branch],
-                                    inInputFile[InputReader.Core][InputReader.ForceUpdate])
-        except Exception as e:
-            print(f"Invalid Attribute: `{InputReader.Core}`\nError: {e}")
-            sys.exit(1)
-        if InputReader.Plugin in inInputFile and InputReader.Compile in inInputFile[InputReader.Plugin] \
-                and len(inInputFile[InputReader.Plugin][InputReader.Compile]) > 0:
-            self.__mPluginInfo = list()
-            for pluginInfo in inInputFile[InputReader.Plugin][InputReader.Compile]:
+            with open(self.__mFilePath) as file:
+                inputFile = json.load(file)
+        except ValueError as error:
+            yield ManifestReader.__createEntry(self.__mFilePath, dict(), None, f"Invalid JSON. {error}")
+            return
+        yield from ManifestReader.iterInputEntries(inputFile, os.path.basename(self.__mFilePath))
+
+    @staticmethod
+    def write(inEntries, inFilePath: str):
+        """Writes the entries as a manifest, with a settings line wherever the settings change"""
+        settings = None
+        with open(inFilePath, 'w') as file:
+            for entry in inEntries:
+                entrySettings = {key: entry[key] for key in ManifestReader.SettingKeys}
+                if entrySettings != settings:
+                    file.write(json.dumps(entrySettings) + '\n')
+                    settings = entrySettings
+                file.write(json.dumps(entry[InputReader.Plugin]) + '\n')
+
+    @staticmethod
+    def iterInputEntries(inInputFile: dict, inName: str):
+        """Yields the Plugin entries of an Input File's content"""
+        if not isinstance(inInputFile, dict) or not isinstance(inInputFile.get(InputReader.Plugin), dict) or \
+                not isinstance(inInputFile[InputReader.Plugin].get(InputReader.Compile), list):
+            yield ManifestReader.__createEntry(inName, dict(), None, f"Invalid Attribute: `{InputReader.Plugin}` "
+                                                                     f"or `{InputReader.Compile}`")
+            return
+        settings = {key: inInputFile.get(key) for key in ManifestReader.SettingKeys}
+        for index, pluginEntry in enumerate(inInputFile[InputReader.Plugin][InputReader.Compile]):
+            yield from ManifestReader.__iterLineEntries(f"{inName}:{InputReader.Compile}[{index}]", settings,
+                                                        pluginEntry)
+
+    def __iterManifestEntries(self):
+        settings = {key: None for key in ManifestReader.SettingKeys}
+        fileName = os.path.basename(self.__mFilePath)
+        with open(self.__mFilePath) as file:
+            for lineNumber, line in enumerate(file, 1):
+                if len(line.strip()) == 0:
+                    continue
+                name = f"{fileName}:{lineNumber}"
                 try:
-                    self.__mPluginInfo.append(
-                        Plugin(pluginInfo[InputReader.SourcePath], pluginInfo[InputReader.DestPath],
-                               pluginInfo[InputReader.Brand], pluginInfo[InputReader.DataSourceConfiguration],
-                               pluginInfo[InputReader.WaitForUserToSetupDSN], pluginInfo[InputReader.ForceUpdate])
-                    )
-                except KeyError as e:
-                    print(f"Error: {e}")
-                    sys.exit(KeyError)
+                    lineEntry = json.loads(line)
+                except ValueError as error:
+                    yield ManifestReader.__createEntry(name, settings, None, f"Invalid JSON. {error}")
+                    continue
+                if isinstance(lineEntry, dict) and InputReader.SourcePath not in lineEntry and \
+                        InputReader.Matrix not in lineEntry:
+                    if any(key not in ManifestReader.SettingKeys for key in lineEntry):
+                        yield ManifestReader.__createEntry(name, settings, None,
+                                                           f"Settings may contain only {ManifestReader.SettingKeys}")
+                    else:
+                        settings = dict(settings, **lineEntry)
+                    continue
+                yield from ManifestReader.__iterLineEntries(name, settings, lineEntry)
+
+    @staticmethod
+    def __iterLineEntries(inName: str, inSettings: dict, inLineEntry):
+        if not isinstance(inLineEntry, dict):
+            yield ManifestReader.__createEntry(inName, inSettings, None, 'Entry must be a JSON object')
+        elif InputReader.Matrix in inLineEntry:
+            for values, pluginEntry, coreEntry, error in expandMatrix(inLineEntry):
+                settings = inSettings if coreEntry is None else dict(inSettings, **{InputReader.Core: coreEntry})
+                name = inName if values is None else \
+                    f"{inName}[{', '.join(f'{axis}={value}' for axis, value in values.items())}]"
+                yield ManifestReader.__createEntry(name, settings, pluginEntry, error)
         else:
-            print(f'Error: Invalid Attribute: `{InputReader.Plugin}` or `{InputReader.Compile}`')
-            sys.exit(1)
+            yield ManifestReader.__createEntry(inName, inSettings, inLineEntry, None)
+
+    @staticmethod
+    def __createEntry(inName: str, inSettings: dict, inPluginEntry, inError):
+        entry = {'Entry': inName, InputReader.Plugin: inPluginEntry, 'Errors': list() if inError is None else [inError]}
+        for key in ManifestReader.SettingKeys:
+            entry[key] = inSettings.get(key)
+        return entry
+
 
-    def getRemoteMachineAddress(self):
-        return self.__mRemoteMachineAddress
+def validateEntry(inEntry: dict):
+    """
+    Creates the Core & Plugin of an entry read by `ManifestReader`, adding the reasons they could not be to its
+    `Errors` \n
+    :return: Core & Plugin, None if invalid
+    """
+    errors = inEntry['Errors']
+    if len(errors) > 0:
+        return None, None
+    remoteMachineAddress = inEntry[InputReader.RemoteMachineAddress]
+    if not isinstance(remoteMachineAddress, str) or len(remoteMachineAddress) == 0:
+        errors.append(f"Invalid Attribute: `{InputReader.RemoteMachineAddress}`")
+    coreInfo = None
+    coreEntry = inEntry[InputReader.Core]
+    try:
+        coreInfo = Core(coreEntry[InputReader.SourcePath], coreEntry[InputReader.DestPath],
+                        coreEntry[InputReader.Branch], coreEntry[InputReader.ForceUpdate])
+    except (KeyError, TypeError, ValueError) as error:
+        errors.append(f"Invalid Attribute: `{InputReader.Core}`. {error}")
+    packageCacheInfo = inEntry[InputReader.PackageCache]
+    # The Package Cache is optional
+    if packageCacheInfo is not None and \
+            (not isinstance(packageCacheInfo, dict) or
+             not isinstance(packageCacheInfo.get(InputReader.SizeQuotaInGB,
+                                                 InputReader.DefaultPackageCacheSizeQuotaInGB), (int, float))):
+        errors.append(f"Invalid Attribute: `{InputReader.PackageCache}`")
+    pluginInfo = None
+    pluginEntry = inEntry[InputReader.Plugin]
+    try:
+        pluginInfo = Plugin(pluginEntry[InputReader.SourcePath], pluginEntry[InputReader.DestPath],
+                            pluginEntry[InputReader.Brand], pluginEntry[InputReader.DataSourceConfiguration],
+                            pluginEntry[InputReader.WaitForUserToSetupDSN], pluginEntry[InputReader.ForceUpdate],
+                            pluginEntry.get(InputReader.MetaTesterTimeOut, TimeOutLevel.MEDIUM),
+                            pluginEntry.get(InputReader.ScalabilityEngine, ScalabilityTestRunner.DefaultEngine))
+        if pluginInfo.getFileName()[-7:] not in ['_32.zip', '_64.zip']:
+            errors.append(f"Plugin's `{InputReader.SourcePath}` must end with `_32.zip` or `_64.zip`")
+    except KeyError as error:
+        errors.append(f"Missing Attribute of `{InputReader.Plugin}`: {error}")
+    except (TypeError, ValueError) as error:
+        errors.append(f"Invalid Attribute: `{InputReader.Plugin}`. {error}")
+    if len(errors) > 0:
+        return None, None
+    return coreInfo, pluginInfo
 
-    def getCoreInfo(self):
-        return self.__mCoreInfo
 
-    def getPluginInfo(self):
-        return self.__mPluginInfo
+def getPackageCache(inPackageCacheInfo: dict, inBasePath: str):
+    """
+    Creates the local Package Cache of the entries with the given `PackageCache` \n
+    :param inPackageCacheInfo: `PackageCache` of an entry read by `ManifestReader`
+    :param inBasePath: Current Working Directory Path where the cache is placed by default
+    :return: PackageCache, None if the entries have no `PackageCache` as the Packages are then extracted
+             straight from the share
+    """
+    if inPackageCacheInfo is None:
+        return None
+    cacheDir = inPackageCacheInfo.get(InputReader.Path, os.path.join(inBasePath, InputReader.PackageCache))
+    sizeQuota = inPackageCacheInfo.get(InputReader.SizeQuotaInGB, InputReader.DefaultPackageCacheSizeQuotaInGB)
+    return PackageCache(cacheDir, int(sizeQuota * 1024 ** 3))
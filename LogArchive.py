@@ -0,0 +1,334 @@
+"""
+Compressed history of the MetaTester & parsed Logs of every run, indexed by run, Plugin, DSN & table
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+
+from GenUtility import isNoneOrEmpty, createDir
+
+
+class _BloomFilter:
+    """Bits set by the lower case trigrams of a block, telling which blocks cannot contain a literal"""
+
+    # Global Variables
+    BitsPerTrigram = 10
+    HashCount = 7
+
+    @staticmethod
+    def getTrigrams(inLines):
+        # Lines are searched one by one, so only the trigrams within a line matter and repeated lines add none
+        return {line[index:index + 3] for line in {line.lower() for line in inLines} for index in range(len(line) - 2)}
+
+    @staticmethod
+    def __getPositions(inTrigram: str, inBitCount: int):
+        # Hashes stable across processes, unlike `hash` of a string
+        data = inTrigram.encode()
+        firstHash = zlib.crc32(data)
+        secondHash = zlib.adler32(data) | 1
+        return [(firstHash + index * secondHash) % inBitCount for index in range(_BloomFilter.HashCount)]
+
+    @staticmethod
+    def create(inTrigrams: set):
+        bits = bytearray(max(1, (len(inTrigrams) * _BloomFilter.BitsPerTrigram + 7) // 8))
+        bitCount = len(bits) * 8
+        for trigram in inTrigrams:
+            for position in _BloomFilter.__getPositions(trigram, bitCount):
+                bits[position >> 3] |= 1 << (position & 7)
+        return bytes(bits)
+
+    @staticmethod
+    def mayContain(inBits: bytes, inTrigrams: set):
+        bitCount = len(inBits) * 8
+        return all(inBits[position >> 3] & (1 << (position & 7))
+                   for trigram in inTrigrams for position in _BloomFilter.__getPositions(trigram, bitCount))
+
+
+class LogArchive:
+    """
+    Appends every archived Log to the data file of its run as zlib blocks cut at table boundaries. The index
+    keeps where every block & table starts, and a bloom filter of every block so that a search decompresses only
+    the blocks which may contain the searched text
+    """
+
+    # Global Variables
+    DefaultDirName = 'LogArchive'
+    IndexFileName = 'LogArchive.db'
+    DataFileExtension = '.zlog'
+    BlockSize = 64 * 1024
+    # A table larger than this is split over several blocks
+    MaxBlockSize = 4 * BlockSize
+    TableLinePrefix = 'Table: '
+    SchemaVersion = 1
+
+    def __init__(self, inArchiveDir: str):
+        """
+        :param inArchiveDir: Directory of the index & the data files, created if absent
+        """
+        if isNoneOrEmpty(inArchiveDir):
+            raise ValueError('Invalid Log Archive directory')
+        self.__mArchiveDir = os.path.abspath(inArchiveDir)
+        self.__mLock = threading.Lock()
+        self.__mStatistics = {'BlocksScanned': 0, 'BlocksSkipped': 0}
+        createDir(self.__mArchiveDir)
+        connection = self.__connect()
+        connection.close()
+
+    def __connect(self):
+        connection = sqlite3.connect(os.path.join(self.__mArchiveDir, LogArchive.IndexFileName), timeout=30)
+        if connection.execute('PRAGMA user_version').fetchone()[0] != LogArchive.SchemaVersion:
+            connection.executescript(f"""
+                CREATE TABLE IF NOT EXISTS Runs (RunId INTEGER PRIMARY KEY AUTOINCREMENT, StartedAt REAL,
+                                                 Description TEXT);
+                CREATE TABLE IF NOT EXISTS Logs (LogId INTEGER PRIMARY KEY AUTOINCREMENT, RunId INTEGER,
+                                                 Plugin TEXT, DSN TEXT, Kind TEXT, FileName TEXT, ArchivedAt REAL,
+                                                 LineCount INTEGER, Size INTEGER, CompressedSize INTEGER);
+                CREATE TABLE IF NOT EXISTS Blocks (LogId INTEGER, BlockNumber INTEGER, Offset INTEGER,
+                                                   CompressedSize INTEGER, FirstLine INTEGER, LineCount INTEGER,
+                                                   Bloom BLOB, PRIMARY KEY (LogId, BlockNumber));
+                CREATE TABLE IF NOT EXISTS Tables (LogId INTEGER, TableName TEXT, BlockNumber INTEGER,
+                                                   FirstLine INTEGER);
+                CREATE INDEX IF NOT EXISTS LogsByPlugin ON Logs (Plugin, RunId);
+                CREATE INDEX IF NOT EXISTS LogsByDSN ON Logs (DSN, RunId);
+                CREATE INDEX IF NOT EXISTS TablesByName ON Tables (TableName, LogId);
+                CREATE INDEX IF NOT EXISTS TablesByLog ON Tables (LogId, FirstLine);
+                PRAGMA user_version = {LogArchive.SchemaVersion};
+            """)
+        return connection
+
+    def __getDataFilePath(self, inRunId: int):
+        return os.path.join(self.__mArchiveDir, f"Run_{inRunId}{LogArchive.DataFileExtension}")
+
+    def beginRun(self, inDescription: str = None):
+        """
+        Starts a run the next archived Logs belong to \n
+        :return: Id of the run
+        """
+        with self.__mLock:
+            connection = self.__connect()
+            try:
+                with connection:
+                    return connection.execute('INSERT INTO Runs (StartedAt, Description) VALUES (?, ?)',
+                                              (time.time(), inDescription)).lastrowid
+            finally:
+                connection.close()
+
+    @staticmethod
+    def __iterBlocks(inLogFile):
+        """Yields the lines of every block, a block ending before the first table starting past the block size"""
+        lines = list()
+        size = 0
+        for line in inLogFile:
+            line = line.rstrip('\r\n')
+            if size >= LogArchive.MaxBlockSize or \
+                    (size >= LogArchive.BlockSize and line.startswith(LogArchive.TableLinePrefix)):
+                yield lines
+                lines = list()
+                size = 0
+            lines.append(line)
+            size += len(line) + 1
+        if len(lines) > 0:
+            yield lines
+
+    def archive(self, inLogFilePath: str, inRunId: int, inPlugin: str, inDSN: str, inKind: str):
+        """
+        Appends the Log file to the archive of the run \n
+        :param inLogFilePath: Path to the Log file
+        :param inRunId: Id returned by `beginRun`
+        :param inPlugin: Source Path of the Plugin
+        :param inDSN: Name of the Data Source
+        :param inKind: Kind of the Logs. i.e `MetaTesterLogs` or `MetaDataTestLogs`
+        :return: Id of the archived Log if succeeded else None
+        """
+        if isNoneOrEmpty(inLogFilePath, inPlugin, inDSN, inKind) or inRunId is None:
+            print('Error: Invalid Parameters')
+            return None
+        if not os.path.isfile(inLogFilePath):
+            print(f"Error: Given {inLogFilePath} file not found")
+            return None
+        try:
+            # Blocks are compressed outside of the lock, only appending them is serialized
+            blocks = list()
+            tables = list()
+            lineCount = 0
+            size = 0
+            with open(inLogFilePath, errors='replace') as logFile:
+                for blockNumber, lines in enumerate(LogArchive.__iterBlocks(logFile)):
+                    text = '\n'.join(lines)
+                    for index, line in enumerate(lines):
+                        if line.startswith(LogArchive.TableLinePrefix):
+                            tables.append((line[len(LogArchive.TableLinePrefix):].strip(), blockNumber,
+                                           lineCount + index))
+                    blocks.append((zlib.compress(text.encode(), 6), lineCount, len(lines),
+                                   _BloomFilter.create(_BloomFilter.getTrigrams(lines))))
+                    lineCount += len(lines)
+                    size += len(text) + 1
+            with self.__mLock:
+                dataFilePath = self.__getDataFilePath(inRunId)
+                with open(dataFilePath, 'ab') as dataFile:
+                    offset = dataFile.tell()
+                    blockRows = list()
+                    for blockNumber, (data, firstLine, blockLineCount, bloom) in enumerate(blocks):
+                        dataFile.write(data)
+                        blockRows.append((blockNumber, offset, len(data), firstLine, blockLineCount, bloom))
+                        offset += len(data)
+                connection = self.__connect()
+                try:
+                    with connection:
+                        logId = connection.execute(
+                            'INSERT INTO Logs (RunId, Plugin, DSN, Kind, FileName, ArchivedAt, LineCount, Size, '
+                            'CompressedSize) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                            (inRunId, inPlugin, inDSN, inKind, os.path.basename(inLogFilePath), time.time(),
+                             lineCount, size, sum(len(block[0]) for block in blocks))).lastrowid
+                        connection.executemany('INSERT INTO Blocks VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                               ((logId, *row) for row in blockRows))
+                        connection.executemany('INSERT INTO Tables VALUES (?, ?, ?, ?)',
+                                               ((logId, *table) for table in tables))
+                finally:
+                    connection.close()
+            return logId
+        except (OSError, sqlite3.Error) as error:
+            print(f"Error: {inLogFilePath} could not be archived. {error}")
+            return None
+
+    def __readBlock(self, inRunId: int, inOffset: int, inCompressedSize: int):
+        with open(self.__getDataFilePath(inRunId), 'rb') as dataFile:
+            dataFile.seek(inOffset)
+            return zlib.decompress(dataFile.read(inCompressedSize)).decode().split('\n')
+
+    def getLogs(self, inRunId: int = None, inPlugin: str = None, inDSN: str = None, inKind: str = None):
+        """Returns the archived Logs matching all the given filters, the latest first"""
+        conditions, parameters = LogArchive.__getConditions(inRunId, inPlugin, inDSN, inKind)
+        connection = self.__connect()
+        try:
+            cursor = connection.execute(
+                f"SELECT LogId, RunId, Plugin, DSN, Kind, FileName, ArchivedAt, LineCount, Size, CompressedSize "
+                f"FROM Logs {conditions} ORDER BY LogId DESC", parameters)
+            names = [column[0] for column in cursor.description]
+            return [dict(zip(names, row)) for row in cursor]
+        finally:
+            connection.close()
+
+    @staticmethod
+    def __getConditions(inRunId: int, inPlugin: str, inDSN: str, inKind: str):
+        filters = {'RunId': inRunId, 'Plugin': inPlugin, 'DSN': inDSN, 'Kind': inKind}
+        filters = {name: value for name, value in filters.items() if value is not None}
+        conditions = ' AND '.join(f"Logs.{name} = ?" for name in filters)
+        return (f"WHERE {conditions}" if len(conditions) > 0 else ''), list(filters.values())
+
+    def getTableLog(self, inLogId: int, inTableName: str):
+        """
+        Reads the lines of a table from the archived Log, decompressing only the blocks holding them \n
+        :return: Lines of the table if found else None
+        """
+        connection = self.__connect()
+        try:
+            row = connection.execute('SELECT RunId FROM Logs WHERE LogId = ?', (inLogId,)).fetchone()
+            table = connection.execute('SELECT FirstLine FROM Tables WHERE LogId = ? AND TableName = ? '
+                                       'ORDER BY FirstLine LIMIT 1', (inLogId, inTableName)).fetchone()
+            if row is None or table is None:
+                print(f"Error: Table {inTableName} is not in the archived Log {inLogId}")
+                return None
+            firstLine = table[0]
+            nextTable = connection.execute('SELECT MIN(FirstLine) FROM Tables WHERE LogId = ? AND FirstLine > ?',
+                                           (inLogId, firstLine)).fetchone()[0]
+            # The lines after the last table run up to the end of the Log
+            lastLine = nextTable if nextTable is not None else \
+                connection.execute('SELECT LineCount FROM Logs WHERE LogId = ?', (inLogId,)).fetchone()[0]
+            blocks = connection.execute(
+                'SELECT Offset, CompressedSize, FirstLine FROM Blocks WHERE LogId = ? AND FirstLine < ? AND '
+                'FirstLine + LineCount > ? ORDER BY BlockNumber', (inLogId, lastLine, firstLine)).fetchall()
+        finally:
+            connection.close()
+        lines = list()
+        for offset, compressedSize, blockFirstLine in blocks:
+            blockLines = self.__readBlock(row[0], offset, compressedSize)
+            lines.extend(blockLines[max(0, firstLine - blockFirstLine):lastLine - blockFirstLine])
+        return lines
+
+    def grep(self, inPattern: str, inIgnoreCase: bool = False, inRunId: int = None, inPlugin: str = None,
+             inDSN: str = None, inKind: str = None):
+        """
+        Yields the archived lines containing the text, across all the runs unless filtered. Blocks whose bloom
+        filter rules the text out are not decompressed \n
+        :param inPattern: Text to search, of at least 3 characters to skip blocks
+        :param inIgnoreCase: If True, the case of the text is ignored
+        :return: `LogId`, `RunId`, `Plugin`, `DSN`, `Kind`, `Line` number & `Text` of every matching line
+        """
+        if isNoneOrEmpty(inPattern):
+            print('Error: Invalid Parameters')
+            return
+        trigrams = _BloomFilter.getTrigrams([inPattern])
+        pattern = re.compile(re.escape(inPattern), re.IGNORECASE if inIgnoreCase else 0)
+        conditions, parameters = LogArchive.__getConditions(inRunId, inPlugin, inDSN, inKind)
+        connection = self.__connect()
+        try:
+            rows = connection.execute(
+                f"SELECT Logs.LogId, RunId, Plugin, DSN, Kind, Offset, Blocks.CompressedSize, FirstLine, Bloom "
+                f"FROM Blocks JOIN Logs ON Blocks.LogId = Logs.LogId {conditions} "
+                f"ORDER BY Logs.LogId, BlockNumber", parameters)
+            for logId, runId, plugin, dsn, kind, offset, compressedSize, firstLine, bloom in rows:
+                if not _BloomFilter.mayContain(bloom, trigrams):
+                    self.__mStatistics['BlocksSkipped'] += 1
+                    continue
+                self.__mStatistics['BlocksScanned'] += 1
+                for index, line in enumerate(self.__readBlock(runId, offset, compressedSize)):
+                    if pattern.search(line):
+                        yield {'LogId': logId, 'RunId': runId, 'Plugin': plugin, 'DSN': dsn, 'Kind': kind,
+                               'Line': firstLine + index + 1, 'Text': line}
+        finally:
+            connection.close()
+
+    def getStatistics(self):
+        """Returns the counts of blocks decompressed & skipped by the searches"""
+        return dict(self.__mStatistics)
+
+
+def main(inArguments: list):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('archiveDir', help='Path to the Log Archive. i.e C:fakepath\\LogArchive')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    logsParser = subparsers.add_parser('logs', help='Lists the archived Logs')
+    grepParser = subparsers.add_parser('grep', help='Searches the archived Logs for a text')
+    grepParser.add_argument('pattern')
+    grepParser.add_argument('--ignore-case', action='store_true')
+    for subparser in [logsParser, grepParser]:
+        subparser.add_argument('--run', type=int)
+        subparser.add_argument('--plugin')
+        subparser.add_argument('--dsn')
+        subparser.add_argument('--kind')
+    tableParser = subparsers.add_parser('table', help='Prints the lines of a table of an archived Log')
+    tableParser.add_argument('logId', type=int)
+    tableParser.add_argument('tableName')
+    arguments = parser.parse_args(inArguments)
+
+    logArchive = LogArchive(arguments.archiveDir)
+    if arguments.command == 'logs':
+        for log in logArchive.getLogs(arguments.run, arguments.plugin, arguments.dsn, arguments.kind):
+            print(f"{log['LogId']}: Run {log['RunId']} {log['Kind']} of {log['DSN']} ({log['Plugin']}), "
+                  f"{log['LineCount']} lines, {log['Size']} bytes compressed to {log['CompressedSize']}")
+    elif arguments.command == 'grep':
+        for match in logArchive.grep(arguments.pattern, arguments.ignore_case, arguments.run, arguments.plugin,
+                                     arguments.dsn, arguments.kind):
+            print(f"{match['LogId']}:{match['Line']}: {match['Text']}")
+        statistics = logArchive.getStatistics()
+        print(f"{statistics['BlocksScanned']} blocks searched, {statistics['BlocksSkipped']} skipped",
+              file=sys.stderr)
+    else:
+        lines = logArchive.getTableLog(arguments.logId, arguments.tableName)
+        if lines is None:
+            return 1
+        print('\n'.join(lines))
+    return 0
+
+
+if __name__ == '__main__':
+    # i.e python LogArchive.py C:fakepath\LogArchive grep "Column size mismatch" --plugin Z:fakepath\Dremio_64.zip
+    #     python LogArchive.py C:fakepath\LogArchive table 12 FAKE.SCHEMA.TABLE_7
+    sys.exit(main(sys.argv[1:]))
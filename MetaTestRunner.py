@@ -1,28 +1,139 @@
 import json
-import re
 import os
+import re
 import subprocess
 import sys
 
-from Input import InputReader
-from RemoteConnection import RemoteConnection
-from GenUtility import TimeOutLevel, isNoneOrEmpty, writeInFile
-from ScalabilityTestRunner import ScalabilityTestRunner
+from AsyncMetaTester import AsyncMetaTesterExecutor, MetaTesterJob
+from FailureStore import FailureStore
+from Packages import Plugin
+from GenUtility import TimeOutLevel, isNoneOrEmpty, createDir
+from MismatchClassifier import MismatchClassifier, MismatchVerdict
+from Tracer import Tracer
+
+MismatchRulesFileName = 'MismatchRules.json'
+# Lines of a table's column validation, as written by `MetaTester`
+TableLinePrefix = 'Table: '
+ColumnLinePattern = re.compile(r'Column: (\d+) Name: (.*?) Type Name: (\S*)')
+ApiPattern = re.compile(r'\b(SQLColumns|SQLColAttribute|SQLGetTypeInfo): ')
+
+
+class MetaTesterLogParser:
+    """
+    Parses the `MetaTester` generated Logs line by line and writes the parsed Logs incrementally,
+    so that memory usage does not depend on the size of the Logs
+    """
+
+    def __init__(self, inParsedLogFilePath: str, inClassifier: MismatchClassifier = None, inOnTable=None):
+        """
+        :param inParsedLogFilePath: Path to save the parsed Logs including the Log File Name
+        :param inClassifier: Classifier of mismatch lines, default Rules are used if not given
+        :param inOnTable: Callable receiving the name of every validated table & the list of its column checks,
+                          each check a dict of `ColumnNumber`, `ColumnName`, `TypeName`, `MismatchKind`, `Rule`,
+                          `FirstApi`, `SecondApi`, `Verdict` & `Line`
+        """
+        targetDir = os.path.dirname(os.path.abspath(inParsedLogFilePath))
+        if not os.path.exists(targetDir):
+            createDir(targetDir)
+        self.__mParsedLogFile = open(inParsedLogFilePath, 'w')
+        self.__mClassifier = inClassifier if inClassifier is not None else MismatchClassifier.getDefault()
+        self.__mStartChecking = False
+        self.__mColumnType = ''
+        self.__mHadFailure = False
+        self.__mTotalFailures = 0
+        self.__mCompletedValidation = False
+        self.__mOnTable = inOnTable
+        self.__mTableName = None
+        self.__mColumnLine = ''
+        self.__mChecks = list()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, inExcType, inExcValue, inTraceback):
+        self.close()
+
+    def feed(self, inLine: str):
+        """
+        Classifies the given Log line and writes it to the parsed Logs \n
+        :param inLine: A line of `MetaTester` generated Logs without line terminator
+        """
+        currLine = inLine
+        if 'Validating individual columns...' == currLine:
+            self.__mHadFailure = False
+            self.__mStartChecking = True
+            self.__mChecks = list()
+        elif 'Done validating individual columns.' == currLine:
+            self.__mTotalFailures += 1 if self.__mHadFailure else 0
+            self.__mStartChecking = False
+            if self.__mOnTable is not None:
+                self.__mOnTable(self.__mTableName, self.__mChecks)
+        elif self.__mStartChecking:
+            rule, verdict, self.__mColumnType = self.__mClassifier.classify(currLine, self.__mColumnType)
+            if verdict is not None:
+                if self.__mOnTable is not None:
+                    self.__mChecks.append(self.__getCheck(currLine, rule, verdict))
+                currLine += f" --- {verdict}"
+                if verdict == MismatchVerdict.Critical:
+                    self.__mHadFailure = True
+            elif currLine.startswith('Column:'):
+                # Parsed only if a mismatch of the column is found
+                self.__mColumnLine = currLine
+        else:
+            if currLine.startswith(TableLinePrefix):
+                self.__mTableName = currLine[len(TableLinePrefix):].strip()
+                self.__mColumnLine = ''
+            if 'Done validation' in currLine:
+                self.__mCompletedValidation = True
+            if 'Number of table failures' in currLine:
+                # Writes the failures count after filtration of checked ignorable Mismatches
+                currLine = f"Number of table failures: {self.__mTotalFailures}\n"
+        self.__mParsedLogFile.write(currLine + '\n')
+
+    def __getCheck(self, inLine: str, inRule, inVerdict: str):
+        """Returns the structured column check of a mismatch line"""
+        apis = ApiPattern.findall(inLine)
+        columnMatch = ColumnLinePattern.match(self.__mColumnLine)
+        return {'ColumnNumber': int(columnMatch.group(1)) if columnMatch is not None else None,
+                'ColumnName': columnMatch.group(2) if columnMatch is not None else None,
+                'TypeName': self.__mColumnType,
+                'MismatchKind': inLine.split(':', 1)[0].strip(),
+                'Rule': inRule.getName() if inRule is not None else None,
+                'FirstApi': apis[0] if len(apis) > 0 else None, 'SecondApi': apis[1] if len(apis) > 1 else None,
+                'Verdict': inVerdict, 'Line': inLine}
+
+    def hasCompletedValidation(self):
+        """Returns True if `MetaTester` reported the completion of validation in the fed Logs"""
+        return self.__mCompletedValidation
+
+    def close(self):
+        """
+        Closes the parsed Logs file \n
+        :return: True if no critical mismatch was found else False
+        """
+        if not self.__mParsedLogFile.closed:
+            self.__mParsedLogFile.close()
+        return not self.__mHadFailure
 
 
 class MetaTester:
 
     # Global Variables
-    MetaTesterDirName = 'MetaTester'
+    MetaTesterDirName = AsyncMetaTesterExecutor.MetaTesterDirName
 
     @staticmethod
-    def run(inDSN: str, inDriverBit: int, inMetaTesterDir: str):
+    def getLogFilePath(inDSN: str, inMetaTesterDir: str):
+        """Returns the path to MetaTester's own Log File of the Data Source"""
+        return os.path.join(inMetaTesterDir, f"{inDSN.replace(' ', '_')}_MetaTesterLogs.txt")
+
+    @staticmethod
+    def _prepareCommand(inDSN: str, inDriverBit: int, inMetaTesterDir: str):
         """
-        Executes `MetaTester` \n
-        :param inMetaTesterDir: Path to MetaTester.
+        Prepares the arguments to execute the `MetaTester` of the Driver's bitness \n
         :param inDSN: Name of the Data Source
         :param inDriverBit: Bit count of Driver
-        :return: Returns the Generated Logs during MetaTester Execution if successfully completed else None
+        :param inMetaTesterDir: Path to MetaTester.
+        :return: Tuple of the arguments and MetaTester's own Log File Name if arguments are valid else None
         """
         if not isNoneOrEmpty(inDSN) and inDriverBit in [32, 64]:
             if not isNoneOrEmpty(inMetaTesterDir) and os.path.exists(inMetaTesterDir):
@@ -30,30 +141,8 @@ class MetaTester:
                 if os.path.exists(MetaTesterPath):
                     # To generate the MetaTest logs in the `MetaTester` directory
                     # else Logs are generated at inappropriate location
-                    MetaTesterLogFileName = os.path.join(inMetaTesterDir, f"{inDSN.replace(' ', '_')}_MetaTesterLogs.txt")
-                    command = f"{MetaTesterPath} -d \"{inDSN}\" -o {MetaTesterLogFileName}"
-                    try:
-                        metatesterLogs = subprocess.check_output(command,
-                                                                 timeout=TimeOutLevel.MEDIUM.value).decode().strip()
-                        if 'Done validation' in metatesterLogs:
-                            return metatesterLogs
-                        else:
-                            print('Error: MetaTester failed to run to completion successfully')
-                            print(f"For more details, "
-                                  f"Check logs: {MetaTesterLogFileName}")
-                            return None
-
-                    except subprocess.CalledProcessError as error:
-                        return error.output.decode()
-
-                    except subprocess.TimeoutExpired:
-                        print(f"Error: \"{command}\" could not be executed in "
-                              f"{TimeOutLevel.MEDIUM.value / 60} Minutes!")
-                        return None
-
-                    except Exception as error:
-                        print(f"Error: {error}")
-                        return None
+                    MetaTesterLogFileName = MetaTester.getLogFilePath(inDSN, inMetaTesterDir)
+                    return [MetaTesterPath, '-d', inDSN, '-o', MetaTesterLogFileName], MetaTesterLogFileName
                 else:
                     print(f"Error: MetaTester{inDriverBit}.exe does not exist in {inMetaTesterDir}")
                     return None
@@ -65,141 +154,205 @@ class MetaTester:
             return None
 
     @staticmethod
-    def parseLogs(inLogs: str, inParsedLogFilePath: str):
+    def run(inDSN: str, inDriverBit: int, inMetaTesterDir: str):
         """
-        Parses the `MetaTester` generated Logs\n
-        :param inLogs: `MetaTester` generated Logs
+        Executes `MetaTester` \n
+        :param inMetaTesterDir: Path to MetaTester.
+        :param inDSN: Name of the Data Source
+        :param inDriverBit: Bit count of Driver
+        :return: Returns the Generated Logs during MetaTester Execution if successfully completed else None
+        """
+        preparedCommand = MetaTester._prepareCommand(inDSN, inDriverBit, inMetaTesterDir)
+        if preparedCommand is None:
+            return None
+        arguments, MetaTesterLogFileName = preparedCommand
+        try:
+            with Tracer.getDefault().span('MetaTester'):
+                metatesterLogs = subprocess.check_output(arguments,
+                                                         timeout=TimeOutLevel.MEDIUM.value).decode().strip()
+            if 'Done validation' in metatesterLogs:
+                return metatesterLogs
+            else:
+                print('Error: MetaTester failed to run to completion successfully')
+                print(f"For more details, "
+                      f"Check logs: {MetaTesterLogFileName}")
+                return None
+
+        except subprocess.CalledProcessError as error:
+            return error.output.decode()
+
+        except subprocess.TimeoutExpired:
+            print(f"Error: \"{subprocess.list2cmdline(arguments)}\" could not be executed in "
+                  f"{TimeOutLevel.MEDIUM.value / 60} Minutes!")
+            return None
+
+        except Exception as error:
+            print(f"Error: {error}")
+            return None
+
+    @staticmethod
+    def runAndParse(inDSN: str, inDriverBit: int, inMetaTesterDir: str, inParsedLogFilePath: str,
+                    inTimeOut: int = TimeOutLevel.MEDIUM, inClassifier: MismatchClassifier = None,
+                    inExecutor: AsyncMetaTesterExecutor = None, inOnTable=None):
+        """
+        Executes `MetaTester` and parses its output line by line as it is generated,
+        writing the parsed Logs incrementally instead of buffering the whole output \n
+        :param inDSN: Name of the Data Source
+        :param inDriverBit: Bit count of Driver
+        :param inMetaTesterDir: Path to MetaTester.
         :param inParsedLogFilePath: Path to save the parsed Logs including the Log File Name
-        :return: True if succeeded else False
+        :param inTimeOut: Time in seconds allowed for MetaTester to complete
+        :param inClassifier: Classifier of mismatch lines, default Rules are used if not given
+        :param inExecutor: Executor shared by concurrent runs to bound the number of running MetaTesters,
+                           a dedicated one is used if not given
+        :param inOnTable: Callable receiving the name & the column checks of every validated table
+        :return: True if no critical mismatch was found, False if found and
+                 None if MetaTester could not be executed to completion
         """
-        if not isNoneOrEmpty(inLogs, inParsedLogFilePath):
-            if not inParsedLogFilePath.endswith('.txt'):
-                print(f"Error: {inParsedLogFilePath} must contain Log File Name with `.txt` File Extension. "
-                      f"i.e `Z:fakepath/log_file.txt")
-                return False
-            startChecking = False
-            parsedLogs = ''
-            columnType = ''
-            hadFailure = False
-            totalFailures = 0
-            for currLine in inLogs.splitlines():
-                if 'Validating individual columns...' == currLine:
-                    hadFailure = False
-                    startChecking = True
-                elif 'Done validating individual columns.' == currLine:
-                    totalFailures += 1 if hadFailure else 0
-                    startChecking = False
-                elif startChecking:
-                    if currLine != 'Verifying SQLPreare':
-                        if 'Column:' in currLine:
-                            ans = re.search('Type Name: ([a-zA-Z]*)', currLine)
-                            columnType = ans.groups()[0] if ans is not None else None
-                        elif 'Type name mismatch' in currLine or 'Local type name mismatch' in currLine:
-                            status = None
-                            if 'SQLColumns' in currLine and 'SQLGetTypeInfo' in currLine:
-                                status = not MetaTester._fetchAndCompareSQLType(currLine, columnType,
-                                                                                'SQLColumns', 'SQLGetTypeInfo')
-                                currLine += ' --- Critical' if status else ' --- Checked'
-                            elif 'SQLColAttribute' in currLine and 'SQLGetTypeInfo' in currLine:
-                                status = not MetaTester._fetchAndCompareSQLType(currLine, columnType,
-                                                                                'SQLColAttribute', 'SQLGetTypeInfo')
-                                currLine += ' --- Critical' if status else ' --- Checked'
-                            if status:
-                                hadFailure = True
-                        elif 'Unsigned mismatch' in currLine:
-                            currLine += ' --- Checked'
-                        else:
-                            currLine += ' --- Critical'
-                            hadFailure = True
-                else:
-                    if 'Number of table failures' in currLine:
-                        # Writes the failures count after filtration of checked ignorable Mismatches
-                        currLine = f"Number of table failures: {totalFailures}\n"
-                parsedLogs += currLine + '\n'
+        if not MetaTester._isValidParsedLogFilePath(inParsedLogFilePath):
+            return None
+        preparedCommand = MetaTester._prepareCommand(inDSN, inDriverBit, inMetaTesterDir)
+        if preparedCommand is None:
+            return None
+        arguments, MetaTesterLogFileName = preparedCommand
+        executor = inExecutor if inExecutor is not None else AsyncMetaTesterExecutor()
+        try:
+            with MetaTesterLogParser(inParsedLogFilePath, inClassifier, inOnTable) as parser:
+                # The parser is fed on the executor's event loop as MetaTester writes its output
+                with Tracer.getDefault().span('MetaTester'):
+                    result = executor.submit(MetaTesterJob(arguments, inTimeOut, inOnLine=parser.feed)).result()
+                status = parser.close()
+        except Exception as error:
+            print(f"Error: {error}")
+            return None
+        finally:
+            if inExecutor is None:
+                executor.close()
 
-            writeInFile(parsedLogs, inParsedLogFilePath)
-            return not hadFailure
-        else:
+        if result[AsyncMetaTesterExecutor.Error] is not None:
+            print(f"Error: {result[AsyncMetaTesterExecutor.Error]}")
+            return None
+        elif result[AsyncMetaTesterExecutor.TimedOut]:
+            print(f"Error: \"{subprocess.list2cmdline(arguments)}\" could not be executed in "
+                  f"{inTimeOut / 60} Minutes!")
+            return None
+        elif not result[AsyncMetaTesterExecutor.HasOutput]:
+            print('Error: MetaTester did not generate any Logs')
+            return None
+        elif result[AsyncMetaTesterExecutor.ReturnCode] == 0 and not parser.hasCompletedValidation():
+            print('Error: MetaTester failed to run to completion successfully')
+            print(f"For more details, "
+                  f"Check logs: {MetaTesterLogFileName}")
+            return None
+        return status
+
+    @staticmethod
+    def _isValidParsedLogFilePath(inParsedLogFilePath: str):
+        if isNoneOrEmpty(inParsedLogFilePath):
             print('Error: Invalid Parameter')
             return False
+        if not inParsedLogFilePath.endswith('.txt'):
+            print(f"Error: {inParsedLogFilePath} must contain Log File Name with `.txt` File Extension. "
+                  f"i.e `Z:fakepath/log_file.txt")
+            return False
+        return True
 
     @staticmethod
-    def _fetchAndCompareSQLType(inData: str, inTargetKey: str, *inTargetAttributes: str):
+    def parseLogs(inLogs: str, inParsedLogFilePath: str, inClassifier: MismatchClassifier = None, inOnTable=None):
         """
-        Extracts the SQLType from given data using given attributes and matches with the Target Key\n
-        :param inData: A String containing the attributes and associated values
-        :param inTargetKey: Key to compare with associated values of the given attributes
-        :param inTargetAttributes: Attributes within the given Data
-        :return: True if TargetKey matches all of the attributes' associated values else False
+        Parses the `MetaTester` generated Logs\n
+        :param inLogs: `MetaTester` generated Logs
+        :param inParsedLogFilePath: Path to save the parsed Logs including the Log File Name
+        :param inClassifier: Classifier of mismatch lines, default Rules are used if not given
+        :param inOnTable: Callable receiving the name & the column checks of every validated table
+        :return: True if succeeded else False
         """
-        if not isNoneOrEmpty(inData, inTargetKey, *inTargetAttributes):
-            for attr in inTargetAttributes:
-                regexPattern = re.search(f"{attr}: ([a-zA-Z]*)", inData)
-                if regexPattern is not None:
-                    if inTargetKey not in regexPattern.groups()[0]:
-                        return False
-                else:
-                    return False
-            return True
+        if not isNoneOrEmpty(inLogs, inParsedLogFilePath):
+            if not MetaTester._isValidParsedLogFilePath(inParsedLogFilePath):
+                return False
+            with Tracer.getDefault().span('ParseLogs'), \
+                    MetaTesterLogParser(inParsedLogFilePath, inClassifier, inOnTable) as parser:
+                for currLine in inLogs.splitlines():
+                    parser.feed(currLine)
+                return parser.close()
         else:
             print('Error: Invalid Parameter')
             return False
 
 
-def main(inUserName: str, inPassword: str, inBasePath: str, inputFileName: str):
-    if isNoneOrEmpty(inUserName, inPassword, inBasePath, inputFileName):
-        print('Error: Invalid Parameter')
-    elif not os.path.exists(inBasePath):
-        print(f"Error: Invalid Path {inBasePath}")
+def _runMetaDataTest(inPluginInfo: Plugin, inBasePath: str, inClassifier: MismatchClassifier,
+                     inExecutor: AsyncMetaTesterExecutor, inFailureStore: FailureStore = None,
+                     inFailureRunId: int = None):
+    """
+    Performs MetaData Test on the given set up Plugin \n
+    :param inPluginInfo: Plugin's information
+    :param inBasePath: Current Working Directory Path
+    :param inClassifier: Classifier of MetaTester's mismatch lines
+    :param inExecutor: Executor running the MetaTesters of all the workers
+    :param inFailureStore: Store recording the column checks of every table, not recorded if not given
+    :param inFailureRunId: Id of the run in the Failure Store
+    :return: Summary of the test
+    """
+    sourceFilePath = os.path.abspath(inPluginInfo.getSourcePath())
+    testSummary = dict()
+    tables = list()
+    mismatchCounts = {MismatchVerdict.Critical: 0, MismatchVerdict.Checked: 0, 'FailedTables': 0}
+
+    def onTable(inTableName: str, inChecks: list):
+        verdicts = [check['Verdict'] for check in inChecks]
+        mismatchCounts[MismatchVerdict.Critical] += verdicts.count(MismatchVerdict.Critical)
+        mismatchCounts[MismatchVerdict.Checked] += verdicts.count(MismatchVerdict.Checked)
+        mismatchCounts['FailedTables'] += 1 if MismatchVerdict.Critical in verdicts else 0
+        if inFailureStore is not None:
+            tables.append((inTableName, inChecks))
+
+    logsPath = inPluginInfo.getLogFilePath('MetaTesterLogs')
+    MetaTesterPath = os.path.join(inBasePath, MetaTester.MetaTesterDirName)
+    # Streams MetaTester's output through the parser so that the Logs are never held in memory
+    metaTesterStatus = MetaTester.runAndParse(inPluginInfo.getDataSourceName(), inPluginInfo.getPackageBitCount(),
+                                              MetaTesterPath, logsPath, inPluginInfo.getMetaTesterTimeOut(),
+                                              inClassifier, inExecutor, onTable)
+    if metaTesterStatus is None:
+        testSummary['MetaDataTest'] = 'Failed'
+        print(f"{sourceFilePath}: MetaTester failed to initiate")
     else:
-        inputReader = InputReader(os.path.join(inBasePath, inputFileName))
-        summary = dict()
-        remoteConnection = RemoteConnection(inputReader.getRemoteMachineAddress(), inUserName, inPassword)
-        if remoteConnection.connect():
-            coreInfo = inputReader.getCoreInfo()
-            if coreInfo.download():
-                summary['CoreSetup'] = 'Succeed'
-            else:
-                summary['CoreSetup'] = 'Failed'
-                return summary
-
-            summary['Plugins'] = dict()
-            for pluginInfo in inputReader.getPluginInfo():
-                sourceFilePath = os.path.abspath(pluginInfo.getSourcePath())
-
-                if pluginInfo.setup(coreInfo):
-                    summary['Plugins'][sourceFilePath] = dict()
-                    summary['Plugins'][sourceFilePath]['Setup'] = 'Succeed'
-                    logsPath = os.path.join(pluginInfo.getLogsPath(), f"{pluginInfo.getPluginBrand()}_"
-                                                                      f"{pluginInfo.getPackageName()}_"
-                                                                      f"MetaTesterLogs.txt")
-                    MetaTesterPath = os.path.join(inBasePath, MetaTester.MetaTesterDirName)
-                    metaTesterLogs = MetaTester.run(pluginInfo.getDataSourceName(), pluginInfo.getPackageBitCount(),
-                                                    MetaTesterPath)
-                    if isNoneOrEmpty(metaTesterLogs):
-                        summary['Plugins'][sourceFilePath]['MetaDataTest'] = 'Failed'
-                        print(f"{sourceFilePath}: MetaTester failed to initiate")
-                    else:
-                        if MetaTester.parseLogs(metaTesterLogs, logsPath):
-                            summary['Plugins'][sourceFilePath]['MetaDataTest'] = 'Succeed'
-                            summary['Plugins'][sourceFilePath]['MetaDataTestLogs'] = logsPath
-                            print(f"{sourceFilePath}: MetaTester ran to completion successfully")
-                        else:
-                            summary['Plugins'][sourceFilePath]['MetaDataTest'] = 'Failed'
-                            summary['Plugins'][sourceFilePath]['MetaDataTestLogs'] = logsPath
-                            print(f"{sourceFilePath}: MetaTester reported critical errors")
-
-                    ScalabilityTestRunner(os.path.join(inBasePath, 'ScalabilityTester.exe'),
-                                          pluginInfo.getDestinationPath(),
-                                          os.path.join(pluginInfo.getLogsPath(), pluginInfo.getPackageName()) + '\\',
-                                          'dsn=' + pluginInfo.getDataSourceName()).start(inBasePath)
-                else:
-                    summary['Plugins'][sourceFilePath] = 'Failed'
-            remoteConnection.disconnect()
+        testSummary['MetaTesterLogs'] = MetaTester.getLogFilePath(inPluginInfo.getDataSourceName(), MetaTesterPath)
+        testSummary['MetaDataTestMismatches'] = mismatchCounts
+        # Checks of a MetaTester which did not run to completion are not recorded
+        if inFailureStore is not None:
+            inFailureStore.record(inFailureRunId, sourceFilePath, inPluginInfo.getPluginBrand(),
+                                  inPluginInfo.getDataSourceName(), tables)
+        if metaTesterStatus:
+            testSummary['MetaDataTest'] = 'Succeed'
+            testSummary['MetaDataTestLogs'] = logsPath
+            print(f"{sourceFilePath}: MetaTester ran to completion successfully")
+        else:
+            testSummary['MetaDataTest'] = 'Failed'
+            testSummary['MetaDataTestLogs'] = logsPath
+            print(f"{sourceFilePath}: MetaTester reported critical errors")
+    return testSummary
+
 
-            with open(os.path.join(inBasePath, 'MetaTestSummary.json'), 'w') as file:
-                json.dump(summary, file)
+def main(inUserName: str, inPassword: str, inBasePath: str, inputFileName: str, inWorkerCount: int = 1,
+         inForceRun: bool = False, inTrace: bool = False):
+    """
+    Performs MetaData & Scalability Test on all the Plugins of the Input File \n
+    :param inForceRun: If True, every Plugin is tested again even if it passed with the same inputs before
+    :param inTrace: If True, the stages are traced to `Trace.json` and their durations added to the summary
+    """
+    # Imported here as the orchestrator itself runs the tests of this module
+    from TestOrchestrator import TestKind, orchestrate
+    summary = orchestrate(inUserName, inPassword, inBasePath, inputFileName, [TestKind.MetaData, TestKind.Scalability],
+                          inWorkerCount, inForceRun,
+                          os.path.join(inBasePath, Tracer.DefaultFileName) if inTrace else None)
+    if summary is not None and 'Plugins' in summary:
+        with open(os.path.join(inBasePath, 'MetaTestSummary.json'), 'w') as file:
+            json.dump(summary, file)
+    return summary
 
 
 if __name__ == '__main__':
-    main(sys.argv[1], sys.argv[2], sys.argv[3], sys.argv[4])
+    # `--force` tests every Plugin again even if its results could be reused, `--trace` traces the stages
+    arguments = [argument for argument in sys.argv[1:] if argument not in ['--force', '--trace']]
+    main(arguments[0], arguments[1], arguments[2], arguments[3], int(arguments[4]) if len(arguments) > 4 else 1,
+         '--force' in sys.argv[1:], '--trace' in sys.argv[1:])
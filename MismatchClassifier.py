@@ -0,0 +1,261 @@
+"""
+Table driven classification of `MetaTester` mismatch lines
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+from GenUtility import isNoneOrEmpty
+
+
+class MismatchVerdict:
+
+    Critical = 'Critical'
+    Checked = 'Checked'
+    # Checked if the Column's Type Name is found in the values of all the Rule's Attributes else Critical
+    CompareColumnType = 'CompareColumnType'
+
+
+class MismatchRule:
+    def __init__(self, inName: str, inEquals: str = None, inContains: list = None, inPattern: str = None,
+                 inVerdict: str = None, inAttributes: list = None, inColumnTypeAttribute: str = None):
+        if isNoneOrEmpty(inName):
+            raise ValueError('Rule must contain `Name`')
+        if isNoneOrEmpty(inEquals) and isNoneOrEmpty(inContains) and isNoneOrEmpty(inPattern):
+            raise ValueError(f"Rule {inName} must contain `Equals`, `Contains` or `Pattern`")
+        if inVerdict not in [None, MismatchVerdict.Critical, MismatchVerdict.Checked,
+                             MismatchVerdict.CompareColumnType]:
+            raise ValueError(f"Invalid `Verdict` {inVerdict} for Rule {inName}")
+        if inVerdict == MismatchVerdict.CompareColumnType and isNoneOrEmpty(inAttributes):
+            raise ValueError(f"Rule {inName} must contain `Attributes` to compare the Column's Type Name")
+        self.__mName = inName
+        self.__mEquals = inEquals if not isNoneOrEmpty(inEquals) else None
+        # Every entry of `Contains` must be found in the line, an entry may list alternative keywords
+        self.__mContains = [[entry] if isinstance(entry, str) else list(entry)
+                            for entry in (inContains if inContains is not None else list())]
+        self.__mVerdict = inVerdict
+        self.__mAttributes = list(inAttributes) if inAttributes is not None else list()
+        # Patterns are compiled once per Rule instead of once per classified line
+        self.__mPattern = re.compile(inPattern) if not isNoneOrEmpty(inPattern) else None
+        self.__mAttributePatterns = [re.compile(f"{re.escape(attr)}: ([a-zA-Z]*)") for attr in self.__mAttributes]
+        self.__mColumnTypePattern = re.compile(f"{re.escape(inColumnTypeAttribute)}: ([a-zA-Z]*)") \
+            if not isNoneOrEmpty(inColumnTypeAttribute) else None
+
+    def getName(self):
+        return self.__mName
+
+    def getEquals(self):
+        return self.__mEquals
+
+    def getContains(self):
+        return self.__mContains
+
+    def getVerdict(self):
+        return self.__mVerdict
+
+    def getAttributes(self):
+        return self.__mAttributes
+
+    def matchesPattern(self, inLine: str):
+        """Returns True if the Rule has no `Pattern` or the `Pattern` is found in the given line"""
+        return self.__mPattern is None or self.__mPattern.search(inLine) is not None
+
+    def capturesColumnType(self):
+        return self.__mColumnTypePattern is not None
+
+    def fetchColumnType(self, inLine: str):
+        """Returns the Column's Type Name found in the given line or None"""
+        ans = self.__mColumnTypePattern.search(inLine)
+        return ans.groups()[0] if ans is not None else None
+
+    def compareColumnType(self, inLine: str, inColumnType: str):
+        """
+        Matches the Column's Type Name with the values of all the Rule's Attributes found in the given line \n
+        :param inLine: A line containing the attributes and associated values
+        :param inColumnType: Column's Type Name
+        :return: True if the Type Name is found in all of the attributes' associated values else False
+        """
+        if isNoneOrEmpty(inColumnType):
+            return False
+        for pattern in self.__mAttributePatterns:
+            ans = pattern.search(inLine)
+            if ans is None or inColumnType not in ans.groups()[0]:
+                return False
+        return True
+
+
+class MismatchClassifier:
+
+    # Input Attributes of the Rules file
+    Rules = 'Rules'
+    DefaultVerdict = 'DefaultVerdict'
+    Name = 'Name'
+    Equals = 'Equals'
+    Contains = 'Contains'
+    Pattern = 'Pattern'
+    Verdict = 'Verdict'
+    Attributes = 'Attributes'
+    ColumnTypeAttribute = 'ColumnTypeAttribute'
+
+    # Rules are evaluated in order and the first matching Rule decides the Verdict of a line.
+    # Lines matching none of the Rules get the Default Verdict.
+    DefaultRulesConfig = {
+        DefaultVerdict: MismatchVerdict.Critical,
+        Rules: [
+            {Name: 'PrepareMarker', Equals: 'Verifying SQLPreare'},
+            {Name: 'Column', Contains: ['Column:'], ColumnTypeAttribute: 'Type Name'},
+            {Name: 'SQLColumnsTypeNameMismatch',
+             Contains: [['Type name mismatch', 'Local type name mismatch'], 'SQLColumns', 'SQLGetTypeInfo'],
+             Verdict: MismatchVerdict.CompareColumnType, Attributes: ['SQLColumns', 'SQLGetTypeInfo']},
+            {Name: 'SQLColAttributeTypeNameMismatch',
+             Contains: [['Type name mismatch', 'Local type name mismatch'], 'SQLColAttribute', 'SQLGetTypeInfo'],
+             Verdict: MismatchVerdict.CompareColumnType, Attributes: ['SQLColAttribute', 'SQLGetTypeInfo']},
+            {Name: 'TypeNameMismatch', Contains: [['Type name mismatch', 'Local type name mismatch']]},
+            {Name: 'UnsignedMismatch', Contains: ['Unsigned mismatch'], Verdict: MismatchVerdict.Checked},
+        ]
+    }
+
+    __mDefault = None
+    __mFileCache = dict()
+    __mFileCacheLock = threading.Lock()
+
+    def __init__(self, inRules: list, inDefaultVerdict: str = MismatchVerdict.Critical):
+        if inDefaultVerdict not in [MismatchVerdict.Critical, MismatchVerdict.Checked]:
+            raise ValueError(f"Invalid `{MismatchClassifier.DefaultVerdict}` {inDefaultVerdict}")
+        self.__mRules = inRules
+        self.__mDefaultVerdict = inDefaultVerdict
+        # Every distinct keyword of all the Rules gets a bit, so a single pass over the keywords turns a line
+        # into a bitmask and the Rules satisfied by a bitmask are worked out only once per distinct bitmask
+        keywords = list(dict.fromkeys(keyword for rule in inRules for entry in rule.getContains() for keyword in entry))
+        self.__mKeywordBits = [(1 << index, keyword) for index, keyword in enumerate(keywords)]
+        self.__mRuleMasks = [[sum(1 << keywords.index(keyword) for keyword in entry) for entry in rule.getContains()]
+                             for rule in inRules]
+        # A line equal to a Rule's `Equals` is known in advance, so the Rule's other conditions are checked on it
+        # once here. Rules whose other conditions do not hold for their own `Equals` can never match
+        self.__mEqualsIndex = dict()
+        for index, rule in enumerate(inRules):
+            equals = rule.getEquals()
+            if equals is not None and rule.matchesPattern(equals) and \
+                    all(any(keyword in equals for keyword in entry) for entry in rule.getContains()):
+                self.__mEqualsIndex.setdefault(equals, index)
+        self.__mCandidates = dict()
+
+    @staticmethod
+    def fromConfig(inConfig: dict):
+        """
+        Builds the classifier from the given Rules configuration \n
+        :param inConfig: Rules configuration in the format of `DefaultRulesConfig`
+        :return: MismatchClassifier
+        """
+        rules = [MismatchRule(ruleConfig.get(MismatchClassifier.Name), ruleConfig.get(MismatchClassifier.Equals),
+                              ruleConfig.get(MismatchClassifier.Contains), ruleConfig.get(MismatchClassifier.Pattern),
+                              ruleConfig.get(MismatchClassifier.Verdict), ruleConfig.get(MismatchClassifier.Attributes),
+                              ruleConfig.get(MismatchClassifier.ColumnTypeAttribute))
+                 for ruleConfig in inConfig.get(MismatchClassifier.Rules, list())]
+        return MismatchClassifier(rules, inConfig.get(MismatchClassifier.DefaultVerdict, MismatchVerdict.Critical))
+
+    @staticmethod
+    def fromFile(inRulesFilePath: str):
+        """
+        Builds the classifier from the given Rules file, reusing the one built before until the file is modified \n
+        :param inRulesFilePath: Path to the JSON Rules file
+        :return: MismatchClassifier if Rules are valid else None
+        """
+        if not os.path.exists(inRulesFilePath):
+            print(f"Error: Given {inRulesFilePath} file not found")
+            return None
+        filePath = os.path.abspath(inRulesFilePath)
+        try:
+            fileStat = os.stat(filePath)
+            signature = (fileStat.st_mtime_ns, fileStat.st_size)
+            with MismatchClassifier.__mFileCacheLock:
+                cachedSignature, classifier = MismatchClassifier.__mFileCache.get(filePath, (None, None))
+                if cachedSignature == signature:
+                    return classifier
+                with open(filePath) as file:
+                    classifier = MismatchClassifier.fromConfig(json.load(file))
+                MismatchClassifier.__mFileCache[filePath] = (signature, classifier)
+                return classifier
+        except Exception as error:
+            print(f"Error: Invalid Rules file {inRulesFilePath}\nError: {error}")
+            return None
+
+    @staticmethod
+    def getDefault():
+        """Returns the classifier built from `DefaultRulesConfig`, compiled only once"""
+        if MismatchClassifier.__mDefault is None:
+            MismatchClassifier.__mDefault = MismatchClassifier.fromConfig(MismatchClassifier.DefaultRulesConfig)
+        return MismatchClassifier.__mDefault
+
+    def __getCandidates(self, inMask: int):
+        """Returns the indices of the Rules whose `Contains` is satisfied by the given keywords bitmask"""
+        candidates = self.__mCandidates.get(inMask)
+        if candidates is None:
+            candidates = tuple(index for index, rule in enumerate(self.__mRules)
+                               if rule.getEquals() is None
+                               and all(inMask & entryMask for entryMask in self.__mRuleMasks[index]))
+            self.__mCandidates[inMask] = candidates
+        return candidates
+
+    def classify(self, inLine: str, inColumnType: str):
+        """
+        Classifies a line found between `Validating individual columns...` and
+        `Done validating individual columns.` \n
+        :param inLine: A line of `MetaTester` generated Logs
+        :param inColumnType: Type Name of the Column currently being validated
+        :return: Tuple of the matched Rule (None if no Rule matched), the Verdict (None if the line
+                 does not need any Verdict) and the Type Name of the Column being validated
+        """
+        mask = sum([bit for bit, keyword in self.__mKeywordBits if keyword in inLine])
+        ruleIndex = self.__mEqualsIndex.get(inLine)
+        for index in self.__getCandidates(mask):
+            if ruleIndex is not None and index > ruleIndex:
+                break
+            if self.__mRules[index].matchesPattern(inLine):
+                ruleIndex = index
+                break
+        if ruleIndex is None:
+            return None, self.__mDefaultVerdict, inColumnType
+
+        rule = self.__mRules[ruleIndex]
+        verdict = rule.getVerdict()
+        if rule.capturesColumnType():
+            inColumnType = rule.fetchColumnType(inLine)
+        if verdict == MismatchVerdict.CompareColumnType:
+            verdict = MismatchVerdict.Checked if rule.compareColumnType(inLine, inColumnType) \
+                else MismatchVerdict.Critical
+        return rule, verdict, inColumnType
+
+
+def benchmark(inLineCount: int = 1000000, inClassifier: MismatchClassifier = None):
+    """
+    Measures the classification throughput over a synthetic mix of mismatch lines \n
+    :param inLineCount: Number of lines to classify
+    :param inClassifier: Classifier to measure, default Rules are used if not given
+    :return: Lines classified per second
+    """
+    classifier = inClassifier if inClassifier is not None else MismatchClassifier.getDefault()
+    sampleLines = [
+        'Column: 3 Name: LastModifiedDate Type Name: TIMESTAMP',
+        'Type name mismatch: SQLColumns: TIMESTAMP SQLGetTypeInfo: TIMESTAMP',
+        'Local type name mismatch: SQLColAttribute: WVARCHAR SQLGetTypeInfo: VARCHAR',
+        'Unsigned mismatch: SQLColumns: 1 SQLColAttribute: 0',
+        'Column size mismatch: SQLColumns: 255 SQLColAttribute: 510',
+        'Verifying SQLPreare',
+    ]
+    lines = [sampleLines[index % len(sampleLines)] for index in range(inLineCount)]
+    columnType = ''
+    startTime = time.perf_counter()
+    for line in lines:
+        _, _, columnType = classifier.classify(line, columnType)
+    return inLineCount / (time.perf_counter() - startTime)
+
+
+if __name__ == '__main__':
+    rulesClassifier = MismatchClassifier.fromFile(sys.argv[2]) if len(sys.argv) > 2 else None
+    lineCount = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    print(f"Classified {benchmark(lineCount, rulesClassifier):,.0f} lines per second")
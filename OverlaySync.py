@@ -0,0 +1,115 @@
+"""
+Incremental overlay of directory trees
+"""
+
+import json
+import os
+import shutil
+
+from GenUtility import isNoneOrEmpty, createDir
+
+
+class OverlaySync:
+
+    # Global Variables
+    ManifestFileName = '.OverlayManifest.json'
+
+    # Manifest Attributes
+    Source = 'Source'
+    Size = 'Size'
+    MTime = 'MTime'
+
+    @staticmethod
+    def _loadManifest(inManifestPath: str):
+        if os.path.exists(inManifestPath):
+            try:
+                with open(inManifestPath) as file:
+                    return json.load(file)
+            except Exception as error:
+                # Without the manifest every file is compared afresh, nothing is lost
+                print(f"Warning: Overlay manifest {inManifestPath} is discarded as it could not be read. {error}")
+        return dict()
+
+    @staticmethod
+    def _placeFile(inSourcePath: str, inTargetPath: str, inCanLink: bool = True):
+        """
+        Hard links the Source at the Target where the filesystem allows it else copies it \n
+        :param inCanLink: If False, the Source is always copied
+        :return: True if hard linked else False
+        """
+        # Removed first so that a Target hard linked to another file is replaced instead of written through
+        if os.path.lexists(inTargetPath):
+            os.remove(inTargetPath)
+        if not inCanLink:
+            shutil.copy2(inSourcePath, inTargetPath)
+            return False
+        try:
+            os.link(inSourcePath, inTargetPath)
+            return True
+        except OSError:
+            shutil.copy2(inSourcePath, inTargetPath)
+            return False
+
+    @staticmethod
+    def sync(inSourceDirs: list, inTargetDir: str, inCopiedPaths: list = None):
+        """
+        Overlays the files of the Source directories on the Target directory, placing only the files added or
+        changed since the last overlay and removing the previously placed files no longer in any Source.
+        Files of a later Source directory take precedence over the same files of an earlier one \n
+        :param inSourceDirs: Paths to the Source directories
+        :param inTargetDir: Path to the Target directory
+        :param inCopiedPaths: Paths relative to the Target directory which are copied instead of hard linked,
+                              i.e the files the Target's own package ships & may write again
+        :return: Counts of `Linked`, `Copied`, `Unchanged` and `Removed` files if succeeded else None
+        """
+        if isNoneOrEmpty(inSourceDirs, inTargetDir) or not all(map(os.path.isdir, inSourceDirs)):
+            print('Error: Invalid Parameters')
+            return None
+        statistics = {'Linked': 0, 'Copied': 0, 'Unchanged': 0, 'Removed': 0}
+        manifestPath = os.path.join(inTargetDir, OverlaySync.ManifestFileName)
+        copiedPaths = {os.path.normpath(path) for path in inCopiedPaths} if inCopiedPaths is not None else set()
+        try:
+            createDir(inTargetDir)
+            manifest = OverlaySync._loadManifest(manifestPath)
+
+            overlay = dict()
+            for sourceDir in inSourceDirs:
+                for root, _, files in os.walk(sourceDir):
+                    relativeRoot = os.path.relpath(root, sourceDir)
+                    for fileName in files:
+                        overlay[os.path.normpath(os.path.join(relativeRoot, fileName))] = os.path.join(root, fileName)
+
+            for relativePath, sourcePath in overlay.items():
+                targetPath = os.path.join(inTargetDir, relativePath)
+                sourceStat = os.stat(sourcePath)
+                # Linked & copied files keep the Source's size and modification time
+                isCopied = relativePath in copiedPaths
+                if os.path.exists(targetPath):
+                    targetStat = os.stat(targetPath)
+                    # A file to be copied which an earlier overlay hard linked is placed again
+                    isLinked = (targetStat.st_ino, targetStat.st_dev) == (sourceStat.st_ino, sourceStat.st_dev)
+                    if targetStat.st_size == sourceStat.st_size and targetStat.st_mtime_ns == sourceStat.st_mtime_ns \
+                            and not (isCopied and isLinked):
+                        statistics['Unchanged'] += 1
+                        manifest[relativePath] = {OverlaySync.Source: sourcePath, OverlaySync.Size: sourceStat.st_size,
+                                                  OverlaySync.MTime: sourceStat.st_mtime_ns}
+                        continue
+                else:
+                    createDir(os.path.dirname(targetPath))
+                statistics['Linked' if OverlaySync._placeFile(sourcePath, targetPath, not isCopied) else 'Copied'] += 1
+                manifest[relativePath] = {OverlaySync.Source: sourcePath, OverlaySync.Size: sourceStat.st_size,
+                                          OverlaySync.MTime: sourceStat.st_mtime_ns}
+
+            for relativePath in [path for path in manifest if path not in overlay]:
+                targetPath = os.path.join(inTargetDir, relativePath)
+                if os.path.lexists(targetPath):
+                    os.remove(targetPath)
+                    statistics['Removed'] += 1
+                del manifest[relativePath]
+
+            with open(manifestPath, 'w') as file:
+                json.dump(manifest, file)
+            return statistics
+        except Exception as error:
+            print(f"Error: {error}")
+            return None
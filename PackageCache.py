@@ -0,0 +1,183 @@
+"""
+Local content addressed cache of the Packages pulled from the network share
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from GenUtility import isNoneOrEmpty, createDir
+
+
+class PackageCache:
+
+    # Global Variables
+    IndexFileName = 'PackageCacheIndex.json'
+    CopyChunkSize = 1024 * 1024
+
+    # Index Attributes
+    Sources = 'Sources'
+    Blobs = 'Blobs'
+    Size = 'Size'
+    MTime = 'MTime'
+    Hash = 'Hash'
+    LastAccess = 'LastAccess'
+
+    def __init__(self, inCacheDir: str, inSizeQuota: int):
+        """
+        :param inCacheDir: Path to the local directory holding the cached Packages
+        :param inSizeQuota: Maximum size of the cached Packages in Bytes
+        """
+        if isNoneOrEmpty(inCacheDir) or inSizeQuota is None or inSizeQuota <= 0:
+            raise ValueError('Invalid Package Cache directory or size quota')
+        self.__mCacheDir = os.path.abspath(inCacheDir)
+        self.__mSizeQuota = inSizeQuota
+        self.__mIndexLock = threading.Lock()
+        self.__mSourceLocks = dict()
+        # Number of users of every Blob returned by `fetch` & not released yet, such Blobs are never evicted
+        self.__mPins = dict()
+        self.__mStatistics = {'Hits': 0, 'Misses': 0, 'Evictions': 0, 'BytesPulled': 0, 'BytesServed': 0}
+        createDir(self.__mCacheDir)
+        self.__mIndex = self.__loadIndex()
+
+    def __getIndexPath(self):
+        return os.path.join(self.__mCacheDir, PackageCache.IndexFileName)
+
+    def __getBlobPath(self, inHash: str):
+        return os.path.join(self.__mCacheDir, f"{inHash}.zip")
+
+    def __loadIndex(self):
+        index = {PackageCache.Sources: dict(), PackageCache.Blobs: dict()}
+        if os.path.exists(self.__getIndexPath()):
+            try:
+                with open(self.__getIndexPath()) as file:
+                    index.update(json.load(file))
+            except Exception as error:
+                # A corrupted index only costs re-pulling the Packages
+                print(f"Warning: Package Cache index is discarded as it could not be read. {error}")
+        # Forgets the Blobs removed from the disk by anything else than the cache itself
+        for blobHash in list(index[PackageCache.Blobs]):
+            if not os.path.exists(self.__getBlobPath(blobHash)):
+                del index[PackageCache.Blobs][blobHash]
+        return index
+
+    def __saveIndex(self):
+        # Written to a temporary file first so that an interrupted run never leaves a partial index behind
+        temporaryIndexPath = self.__getIndexPath() + '.tmp'
+        with open(temporaryIndexPath, 'w') as file:
+            json.dump(self.__mIndex, file)
+        os.replace(temporaryIndexPath, self.__getIndexPath())
+
+    def __getSourceLock(self, inSourcePath: str):
+        with self.__mIndexLock:
+            return self.__mSourceLocks.setdefault(inSourcePath, threading.Lock())
+
+    def __lookup(self, inSourcePath: str, inSourceStat: os.stat_result):
+        """Returns the Hash of the cached Blob if the Source is unchanged since it was cached else None"""
+        sourceInfo = self.__mIndex[PackageCache.Sources].get(inSourcePath)
+        if sourceInfo is not None and sourceInfo[PackageCache.Size] == inSourceStat.st_size \
+                and sourceInfo[PackageCache.MTime] == inSourceStat.st_mtime_ns \
+                and sourceInfo[PackageCache.Hash] in self.__mIndex[PackageCache.Blobs]:
+            return sourceInfo[PackageCache.Hash]
+        return None
+
+    def __pull(self, inSourcePath: str):
+        """
+        Copies the Source into the cache hashing it on the way, so that the share is read only once \n
+        :param inSourcePath: Path to the Package on the share
+        :return: Hash of the pulled content
+        """
+        sha256 = hashlib.sha256()
+        temporaryBlobPath = os.path.join(self.__mCacheDir, f"{threading.get_ident()}_{time.time_ns()}.part")
+        try:
+            with open(inSourcePath, 'rb') as sourceFile, open(temporaryBlobPath, 'wb') as blobFile:
+                for chunk in iter(lambda: sourceFile.read(PackageCache.CopyChunkSize), b''):
+                    sha256.update(chunk)
+                    blobFile.write(chunk)
+            blobHash = sha256.hexdigest()
+            # Identical content pulled from another Source is stored only once
+            if os.path.exists(self.__getBlobPath(blobHash)):
+                os.remove(temporaryBlobPath)
+            else:
+                os.replace(temporaryBlobPath, self.__getBlobPath(blobHash))
+            return blobHash
+        except Exception:
+            if os.path.exists(temporaryBlobPath):
+                os.remove(temporaryBlobPath)
+            raise
+
+    def __evict(self):
+        """Removes the least recently used Blobs not in use until the cache fits in its size quota"""
+        blobs = self.__mIndex[PackageCache.Blobs]
+        totalSize = sum(blobInfo[PackageCache.Size] for blobInfo in blobs.values())
+        for blobHash in sorted(blobs, key=lambda key: blobs[key][PackageCache.LastAccess]):
+            if totalSize <= self.__mSizeQuota:
+                break
+            if self.__mPins.get(blobHash, 0) > 0:
+                continue
+            try:
+                os.remove(self.__getBlobPath(blobHash))
+            except FileNotFoundError:
+                pass
+            totalSize -= blobs.pop(blobHash)[PackageCache.Size]
+            self.__mStatistics['Evictions'] += 1
+        sources = self.__mIndex[PackageCache.Sources]
+        for sourcePath in [path for path, info in sources.items() if info[PackageCache.Hash] not in blobs]:
+            del sources[sourcePath]
+
+    def fetch(self, inSourcePath: str):
+        """
+        Returns the cached copy of the given Package, pulling it from the share only if it has changed
+        since it was cached. The copy must not be modified as it is shared by all its users, and must be released
+        once extracted so that it can be evicted again \n
+        :param inSourcePath: Path to the Package on the share
+        :return: Path to the cached copy if succeeded else None
+        """
+        try:
+            with self.__getSourceLock(inSourcePath):
+                sourceStat = os.stat(inSourcePath)
+                with self.__mIndexLock:
+                    blobHash = self.__lookup(inSourcePath, sourceStat)
+                    # Pinned at once, so that the miss of another Source cannot evict it before it is returned
+                    if blobHash is not None:
+                        self.__mPins[blobHash] = self.__mPins.get(blobHash, 0) + 1
+                isHit = blobHash is not None
+                if not isHit:
+                    blobHash = self.__pull(inSourcePath)
+                with self.__mIndexLock:
+                    self.__mIndex[PackageCache.Sources][inSourcePath] = {
+                        PackageCache.Size: sourceStat.st_size, PackageCache.MTime: sourceStat.st_mtime_ns,
+                        PackageCache.Hash: blobHash}
+                    self.__mIndex[PackageCache.Blobs][blobHash] = {PackageCache.Size: sourceStat.st_size,
+                                                                   PackageCache.LastAccess: time.time()}
+                    if isHit:
+                        self.__mStatistics['Hits'] += 1
+                        self.__mStatistics['BytesServed'] += sourceStat.st_size
+                    else:
+                        self.__mStatistics['Misses'] += 1
+                        self.__mStatistics['BytesPulled'] += sourceStat.st_size
+                        self.__mPins[blobHash] = self.__mPins.get(blobHash, 0) + 1
+                        self.__evict()
+                    self.__saveIndex()
+                return self.__getBlobPath(blobHash)
+        except Exception as error:
+            print(f"Error: {inSourcePath} could not be cached. {error}")
+            return None
+
+    def release(self, inBlobPath: str):
+        """
+        Gives back a copy returned by `fetch` \n
+        :param inBlobPath: Path returned by `fetch`
+        """
+        blobHash = os.path.splitext(os.path.basename(inBlobPath))[0]
+        with self.__mIndexLock:
+            if self.__mPins.get(blobHash, 0) > 1:
+                self.__mPins[blobHash] -= 1
+            else:
+                self.__mPins.pop(blobHash, None)
+
+    def getStatistics(self):
+        with self.__mIndexLock:
+            return dict(self.__mStatistics)
@@ -1,11 +1,15 @@
 import platform
-import winreg
+import threading
 import zipfile
 from abc import ABC, abstractmethod
-from GenUtility import isNoneOrEmpty, createDir, runExecutable
-from shutil import unpack_archive, copy, copytree
+from ConfigurationStore import ConfigurationStore
+from GenUtility import TimeOutLevel, isNoneOrEmpty, createDir, runExecutable
+from OverlaySync import OverlaySync
+from PackageCache import PackageCache
+from ScalabilityTestRunner import ScalabilityTestRunner
+from ZipExtractor import ZipExtractor
+from shutil import copy
 import os
-import sys
 
 
 class Package(ABC):
@@ -16,9 +20,10 @@ class Package(ABC):
             self.__mDestinationPath = inDestinationPath
             self.__mForceUpdate = inForceUpdate
             self.__mFileName = inSourcePath.split(os.sep)[-1]
+            # Serializes downloads of the same package requested by concurrent workers
+            self.__mDownloadLock = threading.Lock()
         else:
-            print('Error: Invalid Parameters')
-            sys.exit(1)
+            raise ValueError('Package must contain a Source Path, a Destination Path & ForceUpdate')
 
     def getSourcePath(self):
         return self.__mSourcePath
@@ -38,30 +43,90 @@ class Package(ABC):
     def shouldForceUpdate(self):
         return self.__mForceUpdate
 
-    def download(self):
+    def getExtractionMarkerPath(self):
+        """Returns the path of the file marking the Package as extracted at its Destination Path"""
+        return os.path.join(self.getDestinationPath(), f"{self.getFileName()}.extracted")
+
+    def getExtractedMembers(self):
+        """Returns the names of the members of the archive last extracted at the Destination Path"""
+        try:
+            with open(self.getExtractionMarkerPath()) as file:
+                # The first line is the Source Path
+                return [line.rstrip('\n') for line in file.readlines()[1:]]
+        except OSError:
+            return list()
+
+    def isDownloaded(self):
+        # Packages downloaded before extraction straight from the source have their Zip at the Destination Path
+        return os.path.exists(os.path.join(self.getDestinationPath(), self.getFileName())) or \
+            os.path.exists(self.getExtractionMarkerPath())
+
+    def needsDownload(self):
+        return self.shouldForceUpdate() or not self.isDownloaded()
+
+    def fetch(self, inCache: PackageCache = None):
+        """
+        Makes the Package's archive available for extraction \n
+        :param inCache: Local Package Cache to take unchanged Packages from instead of the share
+        :return: Path to the archive to extract the Package from if succeeded else None. An archive of the cache
+                 must be released through `releaseArchive` once extracted
+        """
         source = self.getSourcePath()
-        if os.path.exists(source):
-            destination = self.getDestinationPath()
-            forceUpdate = self.shouldForceUpdate()
-            filePath = os.path.join(destination, self.getFileName())
-            try:
-                if not os.path.exists(destination):
-                    createDir(destination)
-                if not os.path.exists(filePath) or forceUpdate:
-                    copy(source, destination)
-                    if zipfile.is_zipfile(filePath):
-                        unpack_archive(filePath, destination)
-                    else:
-                        print('Error: Expected File Type mismatched. `Zip` required')
-                        return False
+        if not os.path.exists(source):
+            print(f"Error: Given Path {source} is Invalid!")
+            return None
+        # Without a cache, the Package is extracted straight from the share without an intermediate copy
+        return inCache.fetch(source) if inCache is not None else source
+
+    @staticmethod
+    def releaseArchive(inArchivePath: str, inCache: PackageCache = None):
+        """Lets the cache evict the archive returned by `fetch` again"""
+        if inCache is not None and inArchivePath is not None:
+            inCache.release(inArchivePath)
+
+    def extract(self, inArchivePath: str):
+        """
+        Extracts the Package's archive at its Destination Path \n
+        :param inArchivePath: Path returned by `fetch`
+        :return: True if succeeded else False
+        """
+        destination = self.getDestinationPath()
+        try:
+            if not os.path.exists(destination):
+                createDir(destination)
+            if zipfile.is_zipfile(inArchivePath):
+                if not ZipExtractor.extract(inArchivePath, destination):
+                    return False
+                with zipfile.ZipFile(inArchivePath) as archive:
+                    memberNames = archive.namelist()
+                with open(self.getExtractionMarkerPath(), 'w') as file:
+                    file.write('\n'.join([self.getSourcePath()] + memberNames))
                 return True
-            except Exception as error:
-                print(f"Error: {error}")
+            else:
+                print('Error: Expected File Type mismatched. `Zip` required')
                 return False
-        else:
-            print(f"Error: Given Path {source} is Invalid!")
+        except Exception as error:
+            print(f"Error: {error}")
             return False
 
+    def download(self, inCache: PackageCache = None):
+        """
+        Downloads & extracts the Package at its Destination Path unless it is already present \n
+        :param inCache: Local Package Cache to extract unchanged Packages from instead of the share
+        :return: True if succeeded else False
+        """
+        with self.__mDownloadLock:
+            if not os.path.exists(self.getSourcePath()):
+                print(f"Error: Given Path {self.getSourcePath()} is Invalid!")
+                return False
+            if not self.needsDownload():
+                return True
+            archivePath = self.fetch(inCache)
+            try:
+                return archivePath is not None and self.extract(archivePath)
+            finally:
+                Package.releaseArchive(archivePath, inCache)
+
 
 class Core(Package):
     def __init__(self, inSourcePath: str, inDestinationPath: str, inBranch: str, inForceUpdate: bool = False):
@@ -69,8 +134,7 @@ class Core(Package):
         if not isNoneOrEmpty(inBranch):
             self.__mBranch = inBranch
         else:
-            print('Error: Invalid Parameters')
-            sys.exit(1)
+            raise ValueError('Core must contain a Branch')
 
     def getBranch(self):
         return self.__mBranch
@@ -78,27 +142,69 @@ class Core(Package):
 
 class Plugin(Package):
     def __init__(self, inSourcePath: str, inDestinationPath: str, inBrand: str,
-                 inDataSourceConfiguration: dict, inWaitForUserToSetupDSN: bool = False, inForceUpdate: bool = False):
+                 inDataSourceConfiguration: dict, inWaitForUserToSetupDSN: bool = False, inForceUpdate: bool = False,
+                 inMetaTesterTimeOut: int = TimeOutLevel.MEDIUM,
+                 inScalabilityEngine: str = ScalabilityTestRunner.DefaultEngine):
         super().__init__(inSourcePath, inDestinationPath, inForceUpdate)
-        if not isNoneOrEmpty(inBrand, inDataSourceConfiguration):
+        if not isNoneOrEmpty(inBrand, inDataSourceConfiguration) and \
+                isinstance(inMetaTesterTimeOut, (int, float)) and inMetaTesterTimeOut > 0 and \
+                inScalabilityEngine in ScalabilityTestRunner.Engines:
             self.__mBrand = inBrand
             self.__mWaitForUserToSetupDSN = inWaitForUserToSetupDSN
             self.__mDataSourceConfiguration = inDataSourceConfiguration
+            self.__mDataSourceNameSuffix = ''
+            self.__mMetaTesterTimeOut = inMetaTesterTimeOut
+            self.__mScalabilityEngine = inScalabilityEngine
         else:
-            print('Error: Invalid Parameters')
-            sys.exit(1)
+            raise ValueError(f"Plugin must contain a Brand, a DataSourceConfiguration, a positive MetaTesterTimeOut "
+                             f"and a ScalabilityEngine among {ScalabilityTestRunner.Engines}")
 
     def getPluginBrand(self):
         return self.__mBrand
 
     def getDataSourceName(self):
-        return f"{self.__mBrand} {self.getPackageName()}"
+        return f"{self.__mBrand} {self.getPackageName()}{self.__mDataSourceNameSuffix}"
+
+    def setDataSourceNameSuffix(self, inSuffix: str):
+        """Sets a suffix to make the Data Source Name unique among concurrently tested Plugins"""
+        self.__mDataSourceNameSuffix = inSuffix if inSuffix is not None else ''
+
+    @staticmethod
+    def assignUniqueDataSourceNames(inPlugins: list, inOccurrences: dict = None):
+        """
+        Suffixes the Data Source Names taken by an earlier Plugin, i.e ` 2` for the second one, so that the Plugins,
+        tested one after another or concurrently, never write the same DSN, logs or scratch files \n
+        :param inPlugins: List of Plugins to be tested
+        :param inOccurrences: Number of Plugins of every Data Source Name met so far, updated with the given ones,
+                              so that Plugins read in batches are named as if they were read at once
+        """
+        occurrences = inOccurrences if inOccurrences is not None else dict()
+        for pluginInfo in inPlugins:
+            dataSourceName = pluginInfo.getDataSourceName()
+            occurrences[dataSourceName] = occurrences.get(dataSourceName, 0) + 1
+            if occurrences[dataSourceName] > 1:
+                pluginInfo.setDataSourceNameSuffix(f" {occurrences[dataSourceName]}")
+
+    def getMetaTesterTimeOut(self):
+        """Returns the time in seconds allowed for MetaTester to complete on this Plugin"""
+        return self.__mMetaTesterTimeOut
+
+    def getScalabilityEngine(self):
+        """Returns the name of the engine generating the Scalability Test load on this Plugin"""
+        return self.__mScalabilityEngine
 
     def shouldWaitForUserToSetupDSN(self):
         return self.__mWaitForUserToSetupDSN
 
     def getDataSourceConfiguration(self):
-        return self.__mDataSourceConfiguration
+        if isNoneOrEmpty(self.__mDataSourceNameSuffix):
+            return self.__mDataSourceConfiguration
+        # A suffixed DSN must refer to its own suffixed Driver instead of the one given in the Input File
+        dataSourceConfiguration = dict(self.__mDataSourceConfiguration)
+        for key in dataSourceConfiguration:
+            if key.lower() == 'driver':
+                dataSourceConfiguration[key] = f"{self.getDataSourceName()} ODBC Driver"
+        return dataSourceConfiguration
 
     def getLogsPath(self):
         """Returns the path to `DriverLogs` folder to save the logs generated during various tests"""
@@ -111,10 +217,22 @@ class Plugin(Package):
             print('Error: Plugin is either not downloaded or set-up.')
             return None
 
-    def __setRegistryConfigurations(self, inDriverDLLPath: str):
+    def getLogFilePath(self, inLogName: str):
+        """
+        Returns the path of a log file within `DriverLogs` folder unique to this Plugin's Data Source \n
+        :param inLogName: Name of the log i.e `MetaTesterLogs`
+        :return: Path to the log file if Plugin is set-up else None
+        """
+        logsPath = self.getLogsPath()
+        if logsPath is not None:
+            return os.path.join(logsPath, f"{self.getDataSourceName().replace(' ', '_')}_{inLogName}.txt")
+        return None
+
+    def __setRegistryConfigurations(self, inDriverDLLPath: str, inConfigurationStore: ConfigurationStore = None):
         """
         Writes Driver's registry configurations \n
         :param inDriverDLLPath: Driver's DLL Path from Plugin Package
+        :param inConfigurationStore: Store to write to, the Registry if not given
         :return: True if succeeded else False
         """
         if not isNoneOrEmpty(inDriverDLLPath):
@@ -131,42 +249,24 @@ class Plugin(Package):
                     return False
                 else:
                     dataSourceName = self.getDataSourceName()
-                    try:
-                        with winreg.ConnectRegistry(None, winreg.HKEY_LOCAL_MACHINE) as hkey:
-                            with winreg.OpenKey(hkey, 'Software', 0, winreg.KEY_READ) as parentKey:
-                                if systemBit != driverBit:
-                                    parentKey = winreg.OpenKey(parentKey, 'Wow6432Node', 0, winreg.KEY_READ)
-                                with winreg.OpenKey(parentKey, 'ODBC', 0, winreg.KEY_READ) as odbcKey:
-                                    with winreg.OpenKey(odbcKey, 'ODBCINST.INI', 0, winreg.KEY_WRITE) as odbcInstIniKey:
-                                        with winreg.CreateKeyEx(odbcInstIniKey, f"{dataSourceName} ODBC Driver",
-                                                                0, winreg.KEY_ALL_ACCESS) as driverKey:
-                                            winreg.SetValueEx(driverKey, 'Description', 0, winreg.REG_SZ,
-                                                              f"{dataSourceName} ODBC Driver")
-                                            winreg.SetValueEx(driverKey, 'Driver', 0, winreg.REG_SZ, inDriverDLLPath)
-                                            winreg.SetValueEx(driverKey, 'Setup', 0, winreg.REG_SZ, inDriverDLLPath)
-
-                                        with winreg.CreateKeyEx(odbcInstIniKey, 'ODBC Drivers', 0,
-                                                                winreg.KEY_ALL_ACCESS) as odbcDriversKey:
-                                            winreg.SetValueEx(odbcDriversKey, f"{dataSourceName} ODBC Driver",
-                                                              0, winreg.REG_SZ, 'Installed')
-
-                                    with winreg.OpenKey(odbcKey, 'ODBC.INI', 0, winreg.KEY_WRITE) as odbcIniKey:
-                                        with winreg.CreateKeyEx(odbcIniKey, 'ODBC Data Sources', 0,
-                                                                winreg.KEY_WRITE) as odbcDSkey:
-                                            winreg.SetValueEx(odbcDSkey, f"{dataSourceName}",
-                                                              0, winreg.REG_SZ, f"{dataSourceName} ODBC Driver")
-
-                                        if self.shouldWaitForUserToSetupDSN():
-                                            print(f"Provide Required Configurations for {dataSourceName} DSN")
-                                            if not runExecutable('odbcad32.exe'):
-                                                return False
-                                        else:
-                                            with winreg.CreateKeyEx(odbcIniKey, f"{dataSourceName}", 0,
-                                                                    winreg.KEY_WRITE) as driverKey:
-                                                for key, value in self.getDataSourceConfiguration().items():
-                                                    winreg.SetValueEx(driverKey, key, 0, winreg.REG_SZ, value)
-                    except Exception as error:
-                        print(f"Error: {error}")
+                    driverName = f"{dataSourceName} ODBC Driver"
+                    store = inConfigurationStore if inConfigurationStore is not None \
+                        else ConfigurationStore.getDefault()
+                    # Only the values differing from the current ones are written
+                    if not (store.setValues(f"{ConfigurationStore.ODBCInstIni}\\{driverName}",
+                                            {'Description': driverName, 'Driver': inDriverDLLPath,
+                                             'Setup': inDriverDLLPath}, driverBit) and
+                            store.setValues(ConfigurationStore.ODBCDrivers, {driverName: 'Installed'}, driverBit) and
+                            store.setValues(ConfigurationStore.ODBCDataSources, {dataSourceName: driverName},
+                                            driverBit)):
+                        return False
+
+                    if self.shouldWaitForUserToSetupDSN():
+                        print(f"Provide Required Configurations for {dataSourceName} DSN")
+                        if not runExecutable('odbcad32.exe'):
+                            return False
+                    elif not store.setValues(f"{ConfigurationStore.ODBCIni}\\{dataSourceName}",
+                                             self.getDataSourceConfiguration(), driverBit):
                         return False
 
                     return True
@@ -177,49 +277,80 @@ class Plugin(Package):
             print('Error: Invalid Arguments passed')
             return False
 
-    def setup(self, inCoreInfo: Core):
+    def overlay(self, inCoreInfo: Core):
         """
-        Sets up the Plugin package with required `ThirdParty` & `Core` Package files
-        and writes provided driver registry configurations\n
+        Places the required `ThirdParty` & `Core` Package files in the extracted Plugin package \n
         :param inCoreInfo: Core's information
         :return: True if succeeded else False
         """
-        if self.download() and inCoreInfo.download():
-            brand = self.getPluginBrand()
-            extractedPluginPath = self.getDestinationPath()
-            driverName = self.getPackageName()
+        brand = self.getPluginBrand()
+        extractedPluginPath = self.getDestinationPath()
+        driverName = self.getPackageName()
 
-            coreBranch = inCoreInfo.getBranch()
-            extractedCorePath = inCoreInfo.getDestinationPath()
-            pluginLibFolderPath = os.path.join(extractedPluginPath, 'lib')
+        coreBranch = inCoreInfo.getBranch()
+        extractedCorePath = inCoreInfo.getDestinationPath()
+        pluginLibFolderPath = os.path.join(extractedPluginPath, 'lib')
 
-            if not os.path.exists(os.path.join(extractedPluginPath, f"Branding\\{brand}")):
-                if os.path.exists(os.path.join(extractedPluginPath, f"Branding\\Simba")):
-                    brand = 'Simba'
-                else:
-                    print('Error: ' + os.path.join(extractedPluginPath, f"Branding\\Simba") + ' and ' +
-                          os.path.join(extractedPluginPath, f"Branding\\{brand}") + ' not found')
-                    return False
-            pluginDIDPath = os.path.join(extractedPluginPath, f"Branding\\{brand}\\{driverName}ODBC.did")
-            pluginINIPath = os.path.join(extractedPluginPath, f"lib\\CoreBranding\\Simba\\Setup\\rdf.rdfodbc.ini")
-            coreLibPath = os.path.join(extractedCorePath, f"Core\\{coreBranch}\\ODBC\\lib")
-            coreThirdPartyPath = os.path.join(extractedCorePath, f"Core\\{coreBranch}\\ODBC\\ThirdParty")
-            pluginINIFileInLib = os.path.join(pluginLibFolderPath, f"{brand}.{driverName}ODBC.ini")
-
-            if all(map(lambda filePath: os.path.exists(filePath),
-                       [pluginDIDPath, pluginINIPath, coreLibPath, coreThirdPartyPath])):
-                copy(pluginDIDPath, pluginLibFolderPath)
-                copy(pluginINIPath, pluginINIFileInLib)
-                copytree(coreLibPath, pluginLibFolderPath, dirs_exist_ok=True)
-                copytree(coreThirdPartyPath, pluginLibFolderPath, dirs_exist_ok=True)
-
-                with open(pluginINIFileInLib, 'a') as file:
-                    file.write('\n')
-                    file.write(f"ErrorMessagesPath={os.path.join(extractedPluginPath, 'ErrorMessages')}\n")
-
-                return self.__setRegistryConfigurations(os.path.join(pluginLibFolderPath, 'MPAPlugin.dll'))
+        if not os.path.exists(os.path.join(extractedPluginPath, 'Branding', brand)):
+            if os.path.exists(os.path.join(extractedPluginPath, 'Branding', 'Simba')):
+                brand = 'Simba'
             else:
-                print('Error: Core or Plugin is not correctly extracted')
+                print('Error: ' + os.path.join(extractedPluginPath, 'Branding', 'Simba') + ' and ' +
+                      os.path.join(extractedPluginPath, 'Branding', brand) + ' not found')
+                return False
+        pluginDIDPath = os.path.join(extractedPluginPath, 'Branding', brand, f"{driverName}ODBC.did")
+        pluginINIPath = os.path.join(extractedPluginPath, 'lib', 'CoreBranding', 'Simba', 'Setup', 'rdf.rdfodbc.ini')
+        coreLibPath = os.path.join(extractedCorePath, 'Core', coreBranch, 'ODBC', 'lib')
+        coreThirdPartyPath = os.path.join(extractedCorePath, 'Core', coreBranch, 'ODBC', 'ThirdParty')
+        pluginINIFileInLib = os.path.join(pluginLibFolderPath, f"{brand}.{driverName}ODBC.ini")
+
+        if all(map(lambda filePath: os.path.exists(filePath),
+                   [pluginDIDPath, pluginINIPath, coreLibPath, coreThirdPartyPath])):
+            # Read before the overlay as the Plugin's INI may be replaced by Core's one
+            with open(pluginINIPath, 'rb') as file:
+                pluginINIContent = file.read()
+            # Files in `lib` may be hard links to Core's files, so they are replaced instead of overwritten
+            pluginDIDFileInLib = os.path.join(pluginLibFolderPath, os.path.basename(pluginDIDPath))
+            if os.path.exists(pluginDIDFileInLib):
+                os.remove(pluginDIDFileInLib)
+            copy(pluginDIDPath, pluginDIDFileInLib)
+            # Only Core & ThirdParty files added or changed since the last setup are placed in `lib`.
+            # Files the Plugin ships are copied, as extracting the Plugin again writes them
+            shippedPaths = [memberName[len('lib/'):] for memberName in self.getExtractedMembers()
+                            if memberName.startswith('lib/') and not memberName.endswith('/')]
+            if OverlaySync.sync([coreLibPath, coreThirdPartyPath], pluginLibFolderPath, shippedPaths) is None:
+                print('Error: Core could not be overlaid on ' + pluginLibFolderPath)
                 return False
+
+            if os.path.exists(pluginINIFileInLib):
+                os.remove(pluginINIFileInLib)
+            with open(pluginINIFileInLib, 'wb') as file:
+                file.write(pluginINIContent)
+            with open(pluginINIFileInLib, 'a') as file:
+                file.write('\n')
+                file.write(f"ErrorMessagesPath={os.path.join(extractedPluginPath, 'ErrorMessages')}\n")
+
+            return True
         else:
+            print('Error: Core or Plugin is not correctly extracted')
             return False
+
+    def configureRegistry(self, inConfigurationStore: ConfigurationStore = None):
+        """
+        Writes provided driver registry configurations for the overlaid Plugin package \n
+        :param inConfigurationStore: Store to write to, the Registry if not given
+        :return: True if succeeded else False
+        """
+        return self.__setRegistryConfigurations(os.path.join(self.getDestinationPath(), 'lib', 'MPAPlugin.dll'),
+                                                inConfigurationStore)
+
+    def setup(self, inCoreInfo: Core, inCache: PackageCache = None):
+        """
+        Sets up the Plugin package with required `ThirdParty` & `Core` Package files
+        and writes provided driver registry configurations\n
+        :param inCoreInfo: Core's information
+        :param inCache: Local Package Cache to extract unchanged Packages from
+        :return: True if succeeded else False
+        """
+        return self.download(inCache) and inCoreInfo.download(inCache) and \
+            self.overlay(inCoreInfo) and self.configureRegistry()
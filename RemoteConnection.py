@@ -1,53 +1,35 @@
-import win32wnet
-from GenUtility import isNoneOrEmpty
+from SessionManager import SessionManager
 
 
 class RemoteConnection:
-    def __init__(self, in_HostAddress: str, in_UserName: str, in_Password):
+    def __init__(self, in_HostAddress: str, in_UserName: str, in_Password, in_SessionManager: SessionManager = None):
         self.__mHostAddress = in_HostAddress
         self.__mUserName = in_UserName
         self.__mPassword = in_Password
+        self.__mSessionManager = in_SessionManager if in_SessionManager is not None else SessionManager.getDefault()
+        self.__mIsConnected = False
 
     def connect(self):
         """
-        Connects to the given host via provided credentials \n
+        Connects to the given host via provided credentials, sharing the session of the other connections
+        to the same host \n
         :return: Returns True if successfully connected else False
         """
-        if not isNoneOrEmpty(self.__mHostAddress, self.__mUserName, self.__mPassword):
-            unc = ''.join(['\\\\', self.__mHostAddress])
-            netResource = win32wnet.NETRESOURCE()
-            netResource.lpRemoteName = unc
-            try:
-                win32wnet.WNetAddConnection2(netResource, self.__mPassword, self.__mUserName, 0)
-            except Exception as error:
-                if isinstance(error, win32wnet.error):
-                    if 1219 in error.args:
-                        # Disconnects from existing connection if any & tried to connect again
-                        win32wnet.WNetCancelConnection2(unc, 0, 0)
-                        return self.connect()
-                    elif 1326 in error.args:
-                        print('Error: Invalid Username or Password!')
-                        return False
-                    else:
-                        print(f"Error: {error}")
-                        return False
-                else:
-                    print(f"Error: {error}")
-                    return False
+        if self.__mIsConnected:
             return True
-        else:
-            print('Error: Invalid Input Parameters!')
-            return False
+        self.__mIsConnected = self.__mSessionManager.acquire(self.__mHostAddress, self.__mUserName, self.__mPassword)
+        return self.__mIsConnected
 
-    def disconnect(self):
+    def disconnect(self, in_Force: bool = False):
         """
-        Disconnects from the given host \n
+        Gives back the session to the given host, which stays open for the next connections \n
+        :param in_Force: If True, the session is closed unless other connections still use it
         :return: Returns True if successfully disconnected else False
         """
-        unc = ''.join(['\\\\', self.__mHostAddress])
-        try:
-            win32wnet.WNetCancelConnection2(unc, 0, 0)
-        except Exception as error:
-            print(f"Error: {error}")
+        if not self.__mIsConnected:
             return False
-        return True
+        self.__mIsConnected = False
+        status = self.__mSessionManager.release(self.__mHostAddress)
+        if in_Force:
+            status = self.__mSessionManager.close(self.__mHostAddress) and status
+        return status
@@ -0,0 +1,117 @@
+"""
+Persistent store of the passing test results of the Plugins
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from GenUtility import isNoneOrEmpty
+from Packages import Core, Plugin
+
+
+class ResultStore:
+
+    # Global Variables
+    DefaultFileName = 'TestResults.json'
+
+    # Test Kinds
+    MetaDataTest = 'MetaDataTest'
+    ScalabilityTest = 'ScalabilityTest'
+    INIFileTest = 'INIFileTest'
+
+    # Record Attributes
+    Fingerprint = 'Fingerprint'
+    Result = 'Result'
+    RecordedAt = 'RecordedAt'
+
+    def __init__(self, inFilePath: str):
+        """
+        :param inFilePath: Path to the file holding the results
+        """
+        if isNoneOrEmpty(inFilePath):
+            raise ValueError('Invalid Result Store file path')
+        self.__mFilePath = os.path.abspath(inFilePath)
+        self.__mLock = threading.Lock()
+        self.__mRecords = dict()
+        if os.path.exists(self.__mFilePath):
+            try:
+                with open(self.__mFilePath) as file:
+                    self.__mRecords = json.load(file)
+            except Exception as error:
+                # A lost store only costs running the tests again
+                print(f"Warning: Result Store {self.__mFilePath} is discarded as it could not be read. {error}")
+
+    @staticmethod
+    def getFileSignature(inFilePath: str):
+        """Returns the size & modification time of the file, which change whenever it is replaced, else None"""
+        try:
+            fileStat = os.stat(inFilePath)
+            return [fileStat.st_size, fileStat.st_mtime_ns]
+        except OSError:
+            return None
+
+    @staticmethod
+    def getPluginFingerprint(inTestKind: str, inPluginInfo: Plugin, inCoreInfo: Core, inMetaTesterDir: str,
+                             inExtraInputs: dict = None):
+        """
+        Fingerprints everything a Plugin's test result depends on: the Plugin & Core Packages,
+        the Data Source Configuration and the MetaTester of the Plugin's bitness \n
+        :param inTestKind: Kind of the test
+        :param inPluginInfo: Plugin's information
+        :param inCoreInfo: Core's information
+        :param inMetaTesterDir: Path to MetaTester Directory
+        :param inExtraInputs: Other inputs of the test in Key Value pair, values must be JSON serializable
+        :return: Fingerprint, None if the Data Source is set up by the user as its configuration is unknown
+        """
+        if inPluginInfo.shouldWaitForUserToSetupDSN():
+            return None
+        inputs = {
+            'TestKind': inTestKind,
+            'Plugin': [os.path.abspath(inPluginInfo.getSourcePath()),
+                       ResultStore.getFileSignature(inPluginInfo.getSourcePath())],
+            'Core': [os.path.abspath(inCoreInfo.getSourcePath()), ResultStore.getFileSignature(inCoreInfo.getSourcePath()),
+                     inCoreInfo.getBranch()],
+            'DataSourceName': inPluginInfo.getDataSourceName(),
+            'DataSourceConfiguration': inPluginInfo.getDataSourceConfiguration(),
+            'MetaTester': ResultStore.getFileSignature(
+                os.path.join(inMetaTesterDir, f"MetaTester{inPluginInfo.getPackageBitCount()}.exe")),
+            'Extra': inExtraInputs if inExtraInputs is not None else dict()
+        }
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+    @staticmethod
+    def __getRecordKey(inTestKind: str, inSourcePath: str, inDataSourceName: str):
+        # Entries of the same Package differ by their DSN & its configuration
+        return f"{inTestKind}:{os.path.abspath(inSourcePath)}:{inDataSourceName}"
+
+    def lookup(self, inTestKind: str, inSourcePath: str, inDataSourceName: str, inFingerprint: str):
+        """
+        Returns the result recorded for the Plugin's DSN if it was recorded with the same fingerprint else None
+        """
+        if inFingerprint is None:
+            return None
+        with self.__mLock:
+            record = self.__mRecords.get(ResultStore.__getRecordKey(inTestKind, inSourcePath, inDataSourceName))
+        if record is not None and record[ResultStore.Fingerprint] == inFingerprint:
+            return record[ResultStore.Result]
+        return None
+
+    def record(self, inTestKind: str, inSourcePath: str, inDataSourceName: str, inFingerprint: str, inResult):
+        """
+        Records the passing result of the Plugin's DSN, replacing the previous one \n
+        :param inResult: Result of the test, must be JSON serializable
+        """
+        if inFingerprint is None:
+            return
+        with self.__mLock:
+            self.__mRecords[ResultStore.__getRecordKey(inTestKind, inSourcePath, inDataSourceName)] = {
+                ResultStore.Fingerprint: inFingerprint, ResultStore.Result: inResult,
+                ResultStore.RecordedAt: time.strftime('%Y-%m-%d %H:%M:%S')}
+            # Written to a temporary file first so that an interrupted run never leaves a partial store behind
+            temporaryFilePath = self.__mFilePath + '.tmp'
+            with open(temporaryFilePath, 'w') as file:
+                json.dump(self.__mRecords, file)
+            os.replace(temporaryFilePath, self.__mFilePath)
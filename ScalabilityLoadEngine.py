@@ -0,0 +1,185 @@
+"""
+Native generation of the Scalability Test load over any DB-API connection
+"""
+
+import csv
+import functools
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from GenUtility import isNoneOrEmpty, createDir
+
+
+def _runThread(inConnectionFactory, inQueryId: int, inQuery: str, inOriginNs: int, inDeadlineNs: int,
+               inMaxExecutions: int, inThreadFilePath: str, inStopEvent):
+    """
+    Executes the query repeatedly on its own connection until the deadline or until stopped, recording every
+    execution. Defined at module level so that it can be run by a process pool \n
+    :return: Tuple of the number of executions and the number of failed executions
+    """
+    executions = failures = 0
+    nextStopCheckNs = 0
+    connection = inConnectionFactory()
+    try:
+        with open(inThreadFilePath, 'w', newline='') as threadFile:
+            writer = csv.writer(threadFile)
+            writer.writerow(ScalabilityLoadEngine.ThreadFileHeader)
+            # Rows are flushed at least every interval, as the monitor judges the progress by the file's size
+            threadFile.flush()
+            nextFlushNs = time.perf_counter_ns() + ScalabilityLoadEngine.FlushIntervalNs
+            while time.perf_counter_ns() < inDeadlineNs and \
+                    (inMaxExecutions is None or executions < inMaxExecutions):
+                # The stop event of a process pool lives in another process, it is checked only periodically
+                if time.perf_counter_ns() >= nextStopCheckNs:
+                    if inStopEvent.is_set():
+                        break
+                    nextStopCheckNs = time.perf_counter_ns() + ScalabilityLoadEngine.StopCheckIntervalNs
+                rowCount = 0
+                errorCode = 0
+                startNs = time.perf_counter_ns()
+                try:
+                    cursor = connection.cursor()
+                    cursor.execute(inQuery)
+                    # Rows are fetched in batches so that large results are timed end to end without being held
+                    while True:
+                        rows = cursor.fetchmany(ScalabilityLoadEngine.FetchSize)
+                        if len(rows) == 0:
+                            break
+                        rowCount += len(rows)
+                    cursor.close()
+                except Exception:
+                    errorCode = 1
+                    failures += 1
+                endNs = time.perf_counter_ns()
+                executions += 1
+                writer.writerow([inQueryId, round((startNs - inOriginNs) / 1e6, 3),
+                                 round((endNs - startNs) / 1e6, 3), rowCount, errorCode])
+                if endNs >= nextFlushNs:
+                    threadFile.flush()
+                    nextFlushNs = endNs + ScalabilityLoadEngine.FlushIntervalNs
+    finally:
+        connection.close()
+    return executions, failures
+
+
+class ScalabilityLoadEngine:
+
+    # Global Variables
+    ThreadPool = 'Thread'
+    ProcessPool = 'Process'
+    ThreadFileHeader = ['QueryId', 'StartTime', 'LatencyMs', 'RowCount', 'ErrorCode']
+    QueriesFileName = 'Queries.csv'
+    FetchSize = 1000
+    StopCheckIntervalNs = 100 * 1000 * 1000
+    FlushIntervalNs = 1000 * 1000 * 1000
+
+    def __init__(self, inConnectionFactory, inThreadCount: int, inTestTimeInSeconds: float,
+                 inPoolKind: str = ThreadPool, inMaxExecutionsPerThread: int = None):
+        """
+        :param inConnectionFactory: Callable without arguments returning a new DB-API connection,
+                                    it must be picklable (e.g. `functools.partial`) for a process pool
+        :param inThreadCount: Number of concurrent connections executing the query
+        :param inTestTimeInSeconds: Duration of every cycle
+        :param inPoolKind: `ScalabilityLoadEngine.ThreadPool` or `ScalabilityLoadEngine.ProcessPool`
+        :param inMaxExecutionsPerThread: Number of executions after which a thread stops before the cycle's end,
+                                         unlimited if None
+        """
+        if inConnectionFactory is None or inThreadCount is None or inThreadCount < 1 or \
+                inTestTimeInSeconds is None or inTestTimeInSeconds <= 0 or \
+                inPoolKind not in [ScalabilityLoadEngine.ThreadPool, ScalabilityLoadEngine.ProcessPool]:
+            raise ValueError('Invalid Scalability Load Engine parameters')
+        self.__mConnectionFactory = inConnectionFactory
+        self.__mThreadCount = inThreadCount
+        self.__mTestTimeInSeconds = inTestTimeInSeconds
+        self.__mPoolKind = inPoolKind
+        self.__mMaxExecutionsPerThread = inMaxExecutionsPerThread
+        self.__mStopEvent = threading.Event()
+        self.__mWorkerStopEvent = self.__mStopEvent
+
+    @staticmethod
+    def getODBCConnectionFactory(inConnectionString: str):
+        """
+        Returns a picklable factory of ODBC connections through `pyodbc` \n
+        :param inConnectionString: ODBC connection string. i.e `dsn=Simba Dremio`
+        :return: Connection factory if `pyodbc` is installed else None
+        """
+        try:
+            import pyodbc
+        except ImportError:
+            print('Error: `pyodbc` must be installed to run the native Scalability Test engine')
+            return None
+        return functools.partial(pyodbc.connect, inConnectionString, autocommit=True)
+
+    @staticmethod
+    def getCycleDir(inOutputDir: str, inCycleNumber: int):
+        # Cycle folders are named like the ones of ScalabilityTester.exe
+        return inOutputDir + str(inCycleNumber)
+
+    def __runCycle(self, inExecutor, inStopEvent, inQueryId: int, inQuery: str, inCycleDir: str):
+        createDir(inCycleDir)
+        originNs = time.perf_counter_ns()
+        deadlineNs = originNs + int(self.__mTestTimeInSeconds * 1e9)
+        futures = [inExecutor.submit(_runThread, self.__mConnectionFactory, inQueryId, inQuery, originNs, deadlineNs,
+                                     self.__mMaxExecutionsPerThread,
+                                     os.path.join(inCycleDir, f"Thread_{threadNumber}.csv"), inStopEvent)
+                   for threadNumber in range(1, self.__mThreadCount + 1)]
+        executions = failures = 0
+        for future in futures:
+            threadExecutions, threadFailures = future.result()
+            executions += threadExecutions
+            failures += threadFailures
+        return {'Query': inQueryId, 'Executions': executions, 'Failures': failures,
+                'Duration': round((time.perf_counter_ns() - originNs) / 1e9, 3)}
+
+    def run(self, inQueries: list, inOutputDir: str):
+        """
+        Runs one cycle per query, each with `inThreadCount` connections executing the query for the test time,
+        and writes the per-thread results to `<inOutputDir><cycle>/Thread_<N>.csv` and the queries to `Queries.csv` \n
+        :param inQueries: Queries to execute
+        :param inOutputDir: Prefix of the cycle folders
+        :return: List of the summary of every cycle if succeeded else None
+        """
+        if isNoneOrEmpty(inQueries, inOutputDir):
+            print('Error: Invalid Parameters')
+            return None
+        try:
+            queriesFileDir = os.path.dirname(inOutputDir + ScalabilityLoadEngine.QueriesFileName)
+            if not isNoneOrEmpty(queriesFileDir):
+                createDir(queriesFileDir)
+            with open(inOutputDir + ScalabilityLoadEngine.QueriesFileName, 'w', newline='') as queriesFile:
+                writer = csv.writer(queriesFile)
+                writer.writerow(['QueryId', 'SQL'])
+                writer.writerows(enumerate(inQueries))
+
+            if self.__mPoolKind == ScalabilityLoadEngine.ThreadPool:
+                return self.__runCycles(ThreadPoolExecutor, inQueries, inOutputDir)
+            # Workers of a process pool observe the stop through an event shared by a manager process
+            with multiprocessing.Manager() as manager:
+                self.__mWorkerStopEvent = manager.Event()
+                if self.__mStopEvent.is_set():
+                    self.__mWorkerStopEvent.set()
+                try:
+                    return self.__runCycles(ProcessPoolExecutor, inQueries, inOutputDir)
+                finally:
+                    self.__mWorkerStopEvent = self.__mStopEvent
+        except Exception as error:
+            print(f"Error: {error}")
+            return None
+
+    def __runCycles(self, inPoolType, inQueries: list, inOutputDir: str):
+        cycles = list()
+        with inPoolType(max_workers=self.__mThreadCount) as executor:
+            for queryId, query in enumerate(inQueries):
+                if self.__mStopEvent.is_set():
+                    break
+                cycles.append(self.__runCycle(executor, self.__mWorkerStopEvent, queryId, query,
+                                              ScalabilityLoadEngine.getCycleDir(inOutputDir, queryId)))
+        return cycles
+
+    def stop(self):
+        """Stops the running cycle and the remaining ones, safe to call from any thread"""
+        self.__mStopEvent.set()
+        self.__mWorkerStopEvent.set()
@@ -0,0 +1,167 @@
+"""
+Live monitoring of the Thread Files of a running Scalability Test
+"""
+
+import os
+import threading
+import time
+
+from GenUtility import isNoneOrEmpty
+from ScalabilityLoadEngine import ScalabilityLoadEngine
+
+
+class ScalabilityMonitor:
+
+    # Global Variables
+    DefaultPollIntervalInSeconds = 30
+    DefaultStallTimeOutInSeconds = 600
+    DefaultErrorRateThreshold = 0.5
+    DefaultMinimumRowCount = 100
+
+    def __init__(self, inOutputDir: str, inCycleCount: int, inThreadCount: int, inOnAbort,
+                 inPollIntervalInSeconds: float = DefaultPollIntervalInSeconds,
+                 inStallTimeOutInSeconds: float = DefaultStallTimeOutInSeconds,
+                 inErrorRateThreshold: float = DefaultErrorRateThreshold,
+                 inMinimumRowCount: int = DefaultMinimumRowCount):
+        """
+        :param inOutputDir: Prefix of the cycle folders, as given to the Scalability Test
+        :param inCycleCount: Maximum number of cycles to look for
+        :param inThreadCount: Number of Thread Files expected in every cycle
+        :param inOnAbort: Callable receiving the abort reason, it must stop the Scalability Test
+        :param inPollIntervalInSeconds: Time between two inspections of the Thread Files
+        :param inStallTimeOutInSeconds: Time after which a Thread File which is absent or does not grow is stalled
+        :param inErrorRateThreshold: Ratio of failed executions of a cycle above which the test is aborted
+        :param inMinimumRowCount: Number of executions of a cycle required before its error rate is considered
+        """
+        if isNoneOrEmpty(inOutputDir) or inCycleCount is None or inCycleCount < 1 or inThreadCount is None or \
+                inThreadCount < 1 or inOnAbort is None or inPollIntervalInSeconds is None or \
+                inPollIntervalInSeconds <= 0 or inStallTimeOutInSeconds is None or inStallTimeOutInSeconds <= 0:
+            raise ValueError('Invalid Scalability Monitor parameters')
+        self.__mOutputDir = inOutputDir
+        self.__mCycleCount = inCycleCount
+        self.__mThreadCount = inThreadCount
+        self.__mOnAbort = inOnAbort
+        self.__mPollInterval = inPollIntervalInSeconds
+        self.__mStallTimeOut = inStallTimeOutInSeconds
+        self.__mErrorRateThreshold = inErrorRateThreshold
+        self.__mMinimumRowCount = inMinimumRowCount
+        self.__mStopEvent = threading.Event()
+        self.__mThread = None
+        self.__mAbortReason = None
+        self.__mStartTime = None
+        self.__mCycleNumber = None
+        self.__mCycleStartTime = None
+        self.__mThreadFiles = dict()
+
+    def __getLatestCycle(self):
+        """Returns the number of the latest cycle started, cycles being run one after another, else None"""
+        for cycleNumber in reversed(range(self.__mCycleCount)):
+            if os.path.isdir(ScalabilityLoadEngine.getCycleDir(self.__mOutputDir, cycleNumber)):
+                return cycleNumber
+        return None
+
+    @staticmethod
+    def _tail(inThreadFilePath: str, inThreadFile: dict):
+        """Counts the executions and the failed ones among the complete rows appended since the last read"""
+        with open(inThreadFilePath, 'rb') as threadFile:
+            threadFile.seek(inThreadFile['Offset'])
+            appended = threadFile.read()
+        # A partially written row is read again once complete
+        appended = appended[:appended.rfind(b'\n') + 1]
+        if len(appended) == 0:
+            return
+        inThreadFile['Offset'] += len(appended)
+        if inThreadFile['IsNative'] is None:
+            header, _, appended = appended.partition(b'\n')
+            inThreadFile['IsNative'] = header.strip() == ','.join(ScalabilityLoadEngine.ThreadFileHeader).encode()
+        rowCount = appended.count(b'\n')
+        inThreadFile['Rows'] += rowCount
+        # Error Codes of the native engine end the rows, executions which did not fail end with `,0`
+        if inThreadFile['IsNative']:
+            inThreadFile['Errors'] += rowCount - appended.count(b',0\n') - appended.count(b',0\r\n')
+
+    def _poll(self, inNow: float):
+        """
+        Inspects the Thread Files of the latest cycle \n
+        :param inNow: Current time in seconds of `time.monotonic`
+        :return: Reason to abort the Scalability Test if it must be aborted else None
+        """
+        if self.__mStartTime is None:
+            self.__mStartTime = inNow
+        cycleNumber = self.__getLatestCycle()
+        if cycleNumber is None:
+            if inNow - self.__mStartTime > self.__mStallTimeOut:
+                return f"No cycle started within {self.__mStallTimeOut} seconds"
+            return None
+        if cycleNumber != self.__mCycleNumber:
+            self.__mCycleNumber = cycleNumber
+            self.__mCycleStartTime = inNow
+            self.__mThreadFiles = dict()
+
+        cycleDir = ScalabilityLoadEngine.getCycleDir(self.__mOutputDir, cycleNumber)
+        stalledThreads = list()
+        for threadNumber in range(1, self.__mThreadCount + 1):
+            threadFilePath = os.path.join(cycleDir, f"Thread_{threadNumber}.csv")
+            if not os.path.isfile(threadFilePath):
+                if inNow - self.__mCycleStartTime > self.__mStallTimeOut:
+                    stalledThreads.append(threadNumber)
+                continue
+            size = os.path.getsize(threadFilePath)
+            threadFile = self.__mThreadFiles.setdefault(threadNumber, {
+                'Size': 0, 'GrowthRate': 0.0, 'LastPoll': self.__mCycleStartTime, 'LastGrowth': self.__mCycleStartTime,
+                'Offset': 0, 'IsNative': None, 'Rows': 0, 'Errors': 0})
+            if size > threadFile['Size']:
+                elapsedTime = inNow - threadFile['LastPoll']
+                threadFile['GrowthRate'] = (size - threadFile['Size']) / elapsedTime if elapsedTime > 0 else 0.0
+                threadFile['Size'] = size
+                threadFile['LastGrowth'] = inNow
+                ScalabilityMonitor._tail(threadFilePath, threadFile)
+            else:
+                threadFile['GrowthRate'] = 0.0
+                if inNow - threadFile['LastGrowth'] > self.__mStallTimeOut:
+                    stalledThreads.append(threadNumber)
+            threadFile['LastPoll'] = inNow
+
+        if len(stalledThreads) > 0:
+            return f"Threads {stalledThreads} of cycle {cycleNumber} did not progress for {self.__mStallTimeOut} seconds"
+        rowCount = sum(threadFile['Rows'] for threadFile in self.__mThreadFiles.values())
+        errorCount = sum(threadFile['Errors'] for threadFile in self.__mThreadFiles.values())
+        if rowCount >= self.__mMinimumRowCount and errorCount / rowCount > self.__mErrorRateThreshold:
+            return f"{errorCount} of {rowCount} executions of cycle {cycleNumber} failed"
+        return None
+
+    def __monitor(self):
+        while not self.__mStopEvent.wait(self.__mPollInterval):
+            try:
+                abortReason = self._poll(time.monotonic())
+            except Exception as error:
+                # The Thread Files may be replaced under the monitor, they are inspected again on the next poll
+                print(f"Warning: Scalability Test could not be monitored. {error}")
+                continue
+            if abortReason is not None:
+                self.__mAbortReason = abortReason
+                print(f"Error: Scalability Test is aborted. {abortReason}")
+                self.__mOnAbort(abortReason)
+                return
+
+    def start(self):
+        """Starts monitoring the Thread Files in the background"""
+        self.__mStopEvent.clear()
+        self.__mStartTime = None
+        self.__mThread = threading.Thread(target=self.__monitor, daemon=True, name='ScalabilityMonitor')
+        self.__mThread.start()
+
+    def stop(self):
+        """Stops monitoring once the Scalability Test is over"""
+        self.__mStopEvent.set()
+        if self.__mThread is not None and self.__mThread is not threading.current_thread():
+            self.__mThread.join()
+
+    def getAbortReason(self):
+        """Returns the reason the Scalability Test was aborted for if it was else None"""
+        return self.__mAbortReason
+
+    def getThreadStatistics(self):
+        """Returns the Size, GrowthRate in Bytes per second, Rows & Errors of the latest cycle's Thread Files"""
+        return {threadNumber: {key: threadFile[key] for key in ['Size', 'GrowthRate', 'Rows', 'Errors']}
+                for threadNumber, threadFile in self.__mThreadFiles.items()}
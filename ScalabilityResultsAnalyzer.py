@@ -0,0 +1,177 @@
+"""
+Analysis of the per-thread results of the Scalability Test
+"""
+
+import json
+import os
+import sys
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from GenUtility import isNoneOrEmpty
+from ScalabilityLoadEngine import ScalabilityLoadEngine
+
+# Columns of the Thread Files
+QueryIdColumn, StartTimeColumn, LatencyColumn, RowCountColumn, ErrorCodeColumn = range(5)
+
+
+class ScalabilityResultsAnalyzer:
+
+    # Global Variables
+    ReportFileName = 'ScalabilityReport.json'
+    DefaultWorkerCount = min(8, os.cpu_count() or 1)
+    Percentiles = [50, 95, 99]
+
+    def __init__(self, inOutputDir: str, inCycleCount: int, inThreadCount: int,
+                 inWorkerCount: int = DefaultWorkerCount):
+        """
+        :param inOutputDir: Prefix of the cycle folders, as given to the Scalability Test
+        :param inCycleCount: Maximum number of cycles to look for
+        :param inThreadCount: Maximum number of Thread Files to look for in a cycle
+        :param inWorkerCount: Number of Thread Files loaded concurrently
+        """
+        if isNoneOrEmpty(inOutputDir) or inCycleCount is None or inCycleCount < 1 or \
+                inThreadCount is None or inThreadCount < 1 or inWorkerCount is None or inWorkerCount < 1:
+            raise ValueError('Invalid Scalability Results Analyzer parameters')
+        self.__mOutputDir = inOutputDir
+        self.__mCycleCount = inCycleCount
+        self.__mThreadCount = inThreadCount
+        self.__mWorkerCount = inWorkerCount
+
+    @staticmethod
+    def _loadThreadFile(inThreadFilePath: str):
+        """
+        Loads the Thread File into an array of one row per execution \n
+        :return: Array of shape (executions, 5) if the file has the layout of the native engine else None
+        """
+        with open(inThreadFilePath) as threadFile:
+            if threadFile.readline().strip() != ','.join(ScalabilityLoadEngine.ThreadFileHeader):
+                return None
+        with warnings.catch_warnings():
+            # A thread which did not complete any execution leaves a file with the header only
+            warnings.simplefilter('ignore', UserWarning)
+            results = np.loadtxt(inThreadFilePath, delimiter=',', skiprows=1, ndmin=2)
+        return results.reshape(-1, len(ScalabilityLoadEngine.ThreadFileHeader))
+
+    @staticmethod
+    def _getDuration(inResults: np.ndarray):
+        """Returns the time in seconds from the first start to the last completion of the executions"""
+        if len(inResults) == 0:
+            return 0.0
+        return float((inResults[:, StartTimeColumn] + inResults[:, LatencyColumn]).max() -
+                     inResults[:, StartTimeColumn].min()) / 1000
+
+    @staticmethod
+    def _getFairness(inThroughputs: np.ndarray):
+        """Returns Jain's fairness index of the throughputs, 1 when all the threads got the same share"""
+        squaresSum = float(np.square(inThroughputs).sum())
+        if len(inThroughputs) == 0 or squaresSum == 0:
+            return None
+        return round(float(inThroughputs.sum()) ** 2 / (len(inThroughputs) * squaresSum), 4)
+
+    @staticmethod
+    def _summarize(inResults: np.ndarray, inDuration: float):
+        """Returns the execution counts, error rate, throughput & latency percentiles of the executions"""
+        # Only the latency column of the succeeded executions is copied
+        latencies = inResults[inResults[:, ErrorCodeColumn] == 0, LatencyColumn]
+        executions = len(inResults)
+        summary = {'Executions': executions, 'Errors': executions - len(latencies),
+                   'ErrorRate': round((executions - len(latencies)) / executions, 4) if executions > 0 else None,
+                   'ThroughputPerSecond': round(len(latencies) / inDuration, 3) if inDuration > 0 else None}
+        if len(latencies) > 0:
+            percentiles = np.percentile(latencies, ScalabilityResultsAnalyzer.Percentiles)
+            summary['LatencyMs'] = {f"P{percentile}": round(float(latency), 3) for percentile, latency
+                                    in zip(ScalabilityResultsAnalyzer.Percentiles, percentiles)}
+            summary['LatencyMs']['Mean'] = round(float(latencies.mean()), 3)
+        return summary
+
+    def __loadCycles(self):
+        """Returns the results of every Thread File found, keyed by cycle number & thread number"""
+        threadFiles = [(cycleNumber, threadNumber,
+                        os.path.join(ScalabilityLoadEngine.getCycleDir(self.__mOutputDir, cycleNumber),
+                                     f"Thread_{threadNumber}.csv"))
+                       for cycleNumber in range(self.__mCycleCount)
+                       for threadNumber in range(1, self.__mThreadCount + 1)]
+        threadFiles = [threadFile for threadFile in threadFiles if os.path.isfile(threadFile[2])]
+        with ThreadPoolExecutor(max_workers=self.__mWorkerCount) as executor:
+            loadedFiles = executor.map(lambda threadFile: ScalabilityResultsAnalyzer._loadThreadFile(threadFile[2]),
+                                       threadFiles)
+            cycles = dict()
+            for (cycleNumber, threadNumber, threadFilePath), results in zip(threadFiles, loadedFiles):
+                if results is None:
+                    print(f"Warning: {threadFilePath} is skipped as it is not written by the native engine")
+                    continue
+                cycles.setdefault(cycleNumber, dict())[threadNumber] = results
+        return cycles
+
+    def analyze(self):
+        """
+        Computes the throughput, latency percentiles, error rate & fairness across threads of every cycle,
+        query & thread \n
+        :return: Report if succeeded else None
+        """
+        try:
+            cycles = self.__loadCycles()
+        except Exception as error:
+            print(f"Error: Scalability Test results could not be loaded. {error}")
+            return None
+
+        report = {'Cycles': dict(), 'Queries': dict(), 'Threads': dict()}
+        queryResults, queryDurations = dict(), dict()
+        threadResults, threadDurations = dict(), dict()
+        allResults, totalDuration = list(), 0.0
+        for cycleNumber, threads in sorted(cycles.items()):
+            cycleResults = np.concatenate(list(threads.values()))
+            cycleDuration = ScalabilityResultsAnalyzer._getDuration(cycleResults)
+            threadThroughputs = np.array([
+                np.count_nonzero(results[:, ErrorCodeColumn] == 0) / cycleDuration if cycleDuration > 0 else 0.0
+                for results in threads.values()])
+            cycleSummary = ScalabilityResultsAnalyzer._summarize(cycleResults, cycleDuration)
+            cycleSummary['Threads'] = len(threads)
+            cycleSummary['Fairness'] = ScalabilityResultsAnalyzer._getFairness(threadThroughputs)
+            report['Cycles'][str(cycleNumber)] = cycleSummary
+
+            for queryId in np.unique(cycleResults[:, QueryIdColumn]).astype(int):
+                queryResults.setdefault(queryId, list()).append(
+                    cycleResults[cycleResults[:, QueryIdColumn] == queryId])
+                queryDurations[queryId] = queryDurations.get(queryId, 0.0) + cycleDuration
+            for threadNumber, results in threads.items():
+                threadResults.setdefault(threadNumber, list()).append(results)
+                threadDurations[threadNumber] = threadDurations.get(threadNumber, 0.0) + cycleDuration
+            allResults.append(cycleResults)
+            totalDuration += cycleDuration
+
+        for queryId, results in sorted(queryResults.items()):
+            report['Queries'][str(queryId)] = ScalabilityResultsAnalyzer._summarize(np.concatenate(results),
+                                                                                   queryDurations[queryId])
+        for threadNumber, results in sorted(threadResults.items()):
+            report['Threads'][str(threadNumber)] = ScalabilityResultsAnalyzer._summarize(
+                np.concatenate(results), threadDurations[threadNumber])
+        if len(allResults) > 0:
+            report['Overall'] = ScalabilityResultsAnalyzer._summarize(np.concatenate(allResults), totalDuration)
+            report['Overall']['Fairness'] = ScalabilityResultsAnalyzer._getFairness(np.array(
+                [summary['ThroughputPerSecond'] or 0.0 for summary in report['Threads'].values()]))
+        return report
+
+    def writeReport(self, inReportFilePath: str = None):
+        """
+        Analyzes the results and writes the report \n
+        :param inReportFilePath: Path to the report, `<inOutputDir>ScalabilityReport.json` if not given
+        :return: Path to the report if succeeded else None
+        """
+        report = self.analyze()
+        if report is None:
+            return None
+        reportFilePath = inReportFilePath if inReportFilePath is not None \
+            else self.__mOutputDir + ScalabilityResultsAnalyzer.ReportFileName
+        with open(reportFilePath, 'w') as file:
+            json.dump(report, file, indent=1)
+        return reportFilePath
+
+
+if __name__ == '__main__':
+    # i.e python ScalabilityResultsAnalyzer.py C:fakepath\DriverLogs\Simba_Dremio\ 20 30
+    print(ScalabilityResultsAnalyzer(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 20,
+                                     int(sys.argv[3]) if len(sys.argv) > 3 else 30).writeReport())
@@ -1,40 +1,116 @@
 import os
 import math
 import subprocess
-import xml.etree.ElementTree as ET
+
+from GenUtility import killProcessTree
+from Tracer import Tracer
+
+# The load engine, monitor, analyzer (numpy) & Test Set parsing are imported when a Scalability Test runs,
+# so that reading the Input File does not pay for them
 
 
 class ScalabilityTestRunner:
-    def __init__(self, scalabilityTesterPath, packageLocation, outputDir, dsn):
+
+    # Engines generating the load
+    ScalabilityTesterEngine = 'ScalabilityTester'
+    NativeThreadPoolEngine = 'NativeThreadPool'
+    NativeProcessPoolEngine = 'NativeProcessPool'
+    Engines = [ScalabilityTesterEngine, NativeThreadPoolEngine, NativeProcessPoolEngine]
+    # Only the Thread Files of the native engines are analyzed by ScalabilityResultsAnalyzer
+    DefaultEngine = NativeThreadPoolEngine
+
+    THREAD_COUNT = 30
+    CYCLE_COUNT = 20
+    TEST_TIME_IN_SECONDS = 3400
+
+    def __init__(self, scalabilityTesterPath, packageLocation, outputDir, dsn, engine=DefaultEngine):
         self.scalabilityTesterPath = scalabilityTesterPath
         self.packageLocation = packageLocation
         self.outputDir = outputDir
         self.dsn = dsn
+        self.engine = engine
+        self.abortReason = None
 
     def start(self, inBasePath: str):
+        """Runs the Scalability Test, returns True if the Thread Files are complete, False if not or aborted"""
+        self.abortReason = None
+        if self.engine != ScalabilityTestRunner.ScalabilityTesterEngine:
+            return self.startNativeEngine()
+
         # Prepare a batch script
-        script = self.prepareBatchScript(self.getSelectQueries(1))
+        with Tracer.getDefault().span('SelectQueries'):
+            script = self.prepareBatchScript(self.getSelectQueries(1))
 
-        # Create the Batch file
-        exampleBatFile = open(os.path.join(inBasePath, 'ExampleBatchFileForST.bat'), 'w+')
+        # Create the Batch file, named after the DSN so that concurrent runs do not share it
+        batchFilePath = os.path.join(inBasePath, self.getBatchFileName())
+        exampleBatFile = open(batchFilePath, 'w+')
         exampleBatFile.write(script)
         exampleBatFile.close()
 
-        p = subprocess.run([os.path.join(inBasePath, 'ExampleBatchFileForST.bat')], capture_output=True)
+        p = subprocess.Popen([batchFilePath], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        # The Thread Files are watched while the test runs so that a hung or failing Driver ends the run early
+        monitor = self.createMonitor(lambda reason: killProcessTree(p))
+        monitor.start()
+        with Tracer.getDefault().span('ScalabilityLoad', Engine=self.engine):
+            p.wait()
+        monitor.stop()
+        return self.checkCompletion(monitor)
+
+    def startNativeEngine(self):
+        from ScalabilityLoadEngine import ScalabilityLoadEngine
+        from ScalabilityResultsAnalyzer import ScalabilityResultsAnalyzer
+        # The same queries are run for the same time as by ScalabilityTester.exe, but by the Python engine
+        connectionFactory = ScalabilityLoadEngine.getODBCConnectionFactory(self.dsn)
+        if connectionFactory is None:
+            return False
+        poolKind = ScalabilityLoadEngine.ThreadPool \
+            if self.engine == ScalabilityTestRunner.NativeThreadPoolEngine else ScalabilityLoadEngine.ProcessPool
+        engine = ScalabilityLoadEngine(connectionFactory, ScalabilityTestRunner.THREAD_COUNT,
+                                       ScalabilityTestRunner.TEST_TIME_IN_SECONDS, poolKind)
+        with Tracer.getDefault().span('SelectQueries'):
+            selectQueries = self.getSelectQueries(1)
+        monitor = self.createMonitor(lambda reason: engine.stop())
+        monitor.start()
+        with Tracer.getDefault().span('ScalabilityLoad', Engine=self.engine):
+            hasRun = engine.run(selectQueries, self.outputDir) is not None
+        monitor.stop()
+        status = self.checkCompletion(monitor) and hasRun
+        # Throughput, latency & fairness of the run are reported next to the Thread Files
+        with Tracer.getDefault().span('ScalabilityAnalysis'):
+            reportFilePath = ScalabilityResultsAnalyzer(self.outputDir, ScalabilityTestRunner.CYCLE_COUNT,
+                                                        ScalabilityTestRunner.THREAD_COUNT).writeReport()
+        if reportFilePath is not None:
+            print(f"Scalability Report: {reportFilePath}")
+        return status
+
+    def createMonitor(self, onAbort):
+        from ScalabilityMonitor import ScalabilityMonitor
+        return ScalabilityMonitor(self.outputDir, ScalabilityTestRunner.CYCLE_COUNT, ScalabilityTestRunner.THREAD_COUNT,
+                                  onAbort)
 
+    def checkCompletion(self, monitor):
+        self.abortReason = monitor.getAbortReason()
+        if self.abortReason is not None:
+            print(f"Scalability Test aborted: {self.abortReason}")
+            return False
         # Check the status of the Thread Files (Excel Files)
-        if self.checkStatusOfThreadsFiles(20, 30):
+        if self.checkStatusOfThreadsFiles(ScalabilityTestRunner.CYCLE_COUNT, ScalabilityTestRunner.THREAD_COUNT):
             print('Done')
-        else:
-            print('Check the Thread Files generated')
+            return True
+        print('Check the Thread Files generated')
+        return False
+
+    def getBatchFileName(self):
+        dsnName = self.dsn.split('=', 1)[-1]
+        return 'ExampleBatchFileForST_' + ''.join(c if c.isalnum() else '_' for c in dsnName) + '.bat'
 
     def prepareBatchScript(self, selectQueries):
         SCALABILITY_TESTER_PATH = self.scalabilityTesterPath
         TestNo = 0
-        TEST_TIME_IN_SECONDS = 3400
+        TEST_TIME_IN_SECONDS = ScalabilityTestRunner.TEST_TIME_IN_SECONDS
         DSN = self.dsn
         OUTPUT_DIRECTORY = self.outputDir
-        THREAD_COUNT = 30
+        THREAD_COUNT = ScalabilityTestRunner.THREAD_COUNT
 
         script = "@echo off\n"
         script += "cls\n\n"
@@ -85,16 +161,18 @@ class ScalabilityTestRunner:
         return status
 
     def getSelectQueries(self, n_queries):
-        # Get required test sets from the package location
-        SQL_TestSets = self.getSQLTestSets()
+        from TestSetIndex import TestSetIndex
+        # Queries are read from the index of the test sets, re-indexing only the test set files changed since
+        # the last run, instead of parsing all of them
+        selectQueries = TestSetIndex(self.getSQLTestSetsDir()).getSelectQueries(n_queries)
+        return selectQueries if selectQueries is not None else []
 
-        # Get the required amount of the test sets from the test sets
-        selectQueries = self.getQueries(SQL_TestSets, n_queries)
-
-        return selectQueries
+    def getSQLTestSetsDir(self):
+        return self.packageLocation + "\\Touchstone\\specific\\TestDefinitions\\SQL\\TestSets"
 
     def getSQLTestSets(self):
-        testSets_Dir = self.packageLocation + "\\Touchstone\\specific\\TestDefinitions\\SQL\\TestSets"
+        import xml.etree.ElementTree as ET
+        testSets_Dir = self.getSQLTestSetsDir()
 
         SQL_TestSets = []  # The Test Sets such as AND_OR, JOIN, LIKE, PASSDOWN, SELECT_TOP, GROUP_BY, ORDER_BY
 
@@ -128,4 +206,26 @@ class ScalabilityTestRunner:
             if no_of_queries >= n_queries: break
             querynumber += 1
 
-        return selectQueries
\ No newline at end of file
+        return selectQueries
+
+
+def _runScalabilityTest(inPluginInfo: 'Plugin', inBasePath: str):
+    """
+    Performs Scalability Test on the given set up Plugin \n
+    :param inPluginInfo: Plugin's information
+    :param inBasePath: Current Working Directory Path
+    :return: Summary of the test
+    """
+    testSummary = dict()
+    # Named after the DSN instead of the Package, so that the entries of one Package never share their output
+    scalabilityOutputDir = os.path.join(inPluginInfo.getLogsPath(),
+                                        inPluginInfo.getDataSourceName().replace(' ', '_')) + '\\'
+    scalabilityTestRunner = ScalabilityTestRunner(os.path.join(inBasePath, 'ScalabilityTester.exe'),
+                                                  inPluginInfo.getDestinationPath(),
+                                                  scalabilityOutputDir,
+                                                  'dsn=' + inPluginInfo.getDataSourceName(),
+                                                  inPluginInfo.getScalabilityEngine())
+    testSummary['ScalabilityTest'] = 'Succeed' if scalabilityTestRunner.start(inBasePath) else 'Failed'
+    if scalabilityTestRunner.abortReason is not None:
+        testSummary['ScalabilityTestAbortReason'] = scalabilityTestRunner.abortReason
+    return testSummary
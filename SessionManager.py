@@ -0,0 +1,316 @@
+"""
+Pooled sessions to the network shares of the Remote Machines
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from GenUtility import isNoneOrEmpty
+
+try:
+    import win32wnet
+except ImportError:
+    # Remote Machines can be connected only on Windows, the local transport stands in elsewhere
+    win32wnet = None
+
+
+class TransportError(Exception):
+    """Failure of a transport, carrying the Windows error code if any"""
+
+    def __init__(self, inErrorCode, inMessage: str):
+        super().__init__(inMessage)
+        self.errorCode = inErrorCode
+
+
+class ShareTransport(ABC):
+    """Connects & disconnects the sessions to the shares of a host, i.e `\\\\host`"""
+
+    # Error Codes
+    BadNetworkPath = 53
+    NetworkNameDeleted = 64
+    BadNetworkName = 67
+    SessionCredentialConflict = 1219
+    NetworkUnreachable = 1231
+    LogonFailure = 1326
+
+    # Errors which may go away by trying again
+    TransientErrorCodes = [BadNetworkPath, NetworkNameDeleted, BadNetworkName, NetworkUnreachable]
+
+    @abstractmethod
+    def connect(self, inUNC: str, inUserName: str, inPassword: str):
+        """Opens a session to the host, raises `TransportError` if failed"""
+        pass
+
+    @abstractmethod
+    def disconnect(self, inUNC: str):
+        """Closes the session to the host, raises `TransportError` if failed"""
+        pass
+
+    @abstractmethod
+    def isAlive(self, inUNC: str):
+        """Returns True if the session to the host is still usable"""
+        pass
+
+
+class WNetTransport(ShareTransport):
+
+    def connect(self, inUNC: str, inUserName: str, inPassword: str):
+        if win32wnet is None:
+            raise TransportError(None, '`pywin32` is required to connect to the Remote Machine')
+        netResource = win32wnet.NETRESOURCE()
+        netResource.lpRemoteName = inUNC
+        try:
+            win32wnet.WNetAddConnection2(netResource, inPassword, inUserName, 0)
+        except win32wnet.error as error:
+            raise TransportError(error.args[0] if len(error.args) > 0 else None, str(error))
+
+    def disconnect(self, inUNC: str):
+        if win32wnet is None:
+            raise TransportError(None, '`pywin32` is required to disconnect from the Remote Machine')
+        try:
+            win32wnet.WNetCancelConnection2(inUNC, 0, 0)
+        except win32wnet.error as error:
+            raise TransportError(error.args[0] if len(error.args) > 0 else None, str(error))
+
+    def isAlive(self, inUNC: str):
+        if win32wnet is None:
+            return False
+        netResource = win32wnet.NETRESOURCE()
+        netResource.lpRemoteName = inUNC
+        try:
+            win32wnet.WNetGetResourceInformation(netResource)
+            return True
+        except win32wnet.error:
+            return False
+
+
+class LocalTransport(ShareTransport):
+    """Stand-in of the network keeping the sessions in memory, failing as it is told to"""
+
+    def __init__(self):
+        self.__mLock = threading.Lock()
+        self.__mSessions = dict()
+        self.__mFailures = dict()
+        self.__mDeadHosts = set()
+        self.__mStatistics = {'Connects': 0, 'Disconnects': 0, 'HealthChecks': 0}
+
+    def failNextConnects(self, inUNC: str, inErrorCodes: list):
+        """Makes the next connects to the host fail with the given error codes, one each"""
+        with self.__mLock:
+            self.__mFailures.setdefault(inUNC, list()).extend(inErrorCodes)
+
+    def dropSession(self, inUNC: str):
+        """Makes the session to the host unusable as if the network went down"""
+        with self.__mLock:
+            self.__mDeadHosts.add(inUNC)
+
+    def connect(self, inUNC: str, inUserName: str, inPassword: str):
+        with self.__mLock:
+            self.__mStatistics['Connects'] += 1
+            if len(self.__mFailures.get(inUNC, list())) > 0:
+                raise TransportError(self.__mFailures[inUNC].pop(0), f"Failed to connect to {inUNC}")
+            if inUNC in self.__mSessions and self.__mSessions[inUNC] != inUserName:
+                raise TransportError(ShareTransport.SessionCredentialConflict,
+                                     f"{inUNC} is connected with other credentials")
+            self.__mSessions[inUNC] = inUserName
+            self.__mDeadHosts.discard(inUNC)
+
+    def disconnect(self, inUNC: str):
+        with self.__mLock:
+            self.__mStatistics['Disconnects'] += 1
+            if self.__mSessions.pop(inUNC, None) is None:
+                raise TransportError(2250, f"{inUNC} is not connected")
+
+    def isAlive(self, inUNC: str):
+        with self.__mLock:
+            self.__mStatistics['HealthChecks'] += 1
+            return inUNC in self.__mSessions and inUNC not in self.__mDeadHosts
+
+    def getSessions(self):
+        """Returns the User Name of every open session by host"""
+        with self.__mLock:
+            return dict(self.__mSessions)
+
+    def getStatistics(self):
+        with self.__mLock:
+            return dict(self.__mStatistics)
+
+
+class SessionManager:
+    """
+    Keeps one session per host open for all the jobs of the process, counting the users of every session.
+    A session left without users stays open for the next job, it is checked before being used again
+    if it was not checked recently
+    """
+
+    # Global Variables
+    DefaultMaxAttempts = 5
+    DefaultBaseDelayInSeconds = 0.5
+    DefaultMaxDelayInSeconds = 8
+    DefaultHealthCheckIntervalInSeconds = 60
+    __mDefault = None
+    __mDefaultLock = threading.Lock()
+
+    def __init__(self, inTransport: ShareTransport = None, inMaxAttempts: int = DefaultMaxAttempts,
+                 inBaseDelayInSeconds: float = DefaultBaseDelayInSeconds,
+                 inMaxDelayInSeconds: float = DefaultMaxDelayInSeconds,
+                 inHealthCheckIntervalInSeconds: float = DefaultHealthCheckIntervalInSeconds):
+        """
+        :param inTransport: Transport opening the sessions, WNet if not given
+        :param inMaxAttempts: Number of connects tried before giving up on a host
+        :param inBaseDelayInSeconds: Wait after the first failed connect, doubled after every next one
+        :param inMaxDelayInSeconds: Longest wait between two connects
+        :param inHealthCheckIntervalInSeconds: Time after which a session is checked before being used again
+        """
+        if inMaxAttempts is None or inMaxAttempts < 1 or inBaseDelayInSeconds is None or inBaseDelayInSeconds < 0 or \
+                inMaxDelayInSeconds is None or inMaxDelayInSeconds < inBaseDelayInSeconds or \
+                inHealthCheckIntervalInSeconds is None or inHealthCheckIntervalInSeconds < 0:
+            raise ValueError('Invalid Session Manager parameters')
+        self.__mTransport = inTransport if inTransport is not None else WNetTransport()
+        self.__mMaxAttempts = inMaxAttempts
+        self.__mBaseDelay = inBaseDelayInSeconds
+        self.__mMaxDelay = inMaxDelayInSeconds
+        self.__mHealthCheckInterval = inHealthCheckIntervalInSeconds
+        self.__mLock = threading.Lock()
+        self.__mSessions = dict()
+        self.__mStatistics = {'Connects': 0, 'Reuses': 0, 'Retries': 0, 'HealthCheckFailures': 0}
+
+    @staticmethod
+    def getUNC(inHostAddress: str):
+        return ''.join(['\\\\', inHostAddress])
+
+    def __getSession(self, inUNC: str):
+        with self.__mLock:
+            return self.__mSessions.setdefault(inUNC, {'Lock': threading.Lock(), 'UserName': None, 'Users': 0,
+                                                       'CheckedAt': None})
+
+    def __connect(self, inUNC: str, inUserName: str, inPassword: str):
+        """
+        Connects to the host, waiting longer after every transient failure \n
+        :return: True if connected else False
+        """
+        for attempt in range(self.__mMaxAttempts):
+            if attempt > 0:
+                with self.__mLock:
+                    self.__mStatistics['Retries'] += 1
+                time.sleep(min(self.__mBaseDelay * 2 ** (attempt - 1), self.__mMaxDelay))
+            try:
+                self.__mTransport.connect(inUNC, inUserName, inPassword)
+                with self.__mLock:
+                    self.__mStatistics['Connects'] += 1
+                return True
+            except TransportError as error:
+                if error.errorCode == ShareTransport.LogonFailure:
+                    print('Error: Invalid Username or Password!')
+                    return False
+                elif error.errorCode == ShareTransport.SessionCredentialConflict:
+                    # A session left by another program is closed before trying again
+                    self.__disconnect(inUNC)
+                elif error.errorCode not in ShareTransport.TransientErrorCodes:
+                    print(f"Error: {error}")
+                    return False
+                print(f"Warning: Connecting to {inUNC} failed, attempt {attempt + 1} of {self.__mMaxAttempts}. "
+                      f"{error}")
+        print(f"Error: Could not connect to {inUNC} in {self.__mMaxAttempts} attempts")
+        return False
+
+    def __disconnect(self, inUNC: str):
+        try:
+            self.__mTransport.disconnect(inUNC)
+            return True
+        except TransportError as error:
+            print(f"Error: {error}")
+            return False
+
+    def acquire(self, inHostAddress: str, inUserName: str, inPassword: str):
+        """
+        Returns a session to the host for the job, opening it unless an open & healthy one can be shared.
+        Every acquired session must be released \n
+        :return: True if the session is usable else False
+        """
+        if isNoneOrEmpty(inHostAddress, inUserName, inPassword):
+            print('Error: Invalid Input Parameters!')
+            return False
+        unc = SessionManager.getUNC(inHostAddress)
+        session = self.__getSession(unc)
+        with session['Lock']:
+            if session['UserName'] is not None:
+                if session['UserName'] != inUserName:
+                    if session['Users'] > 0:
+                        print(f"Error: {unc} is in use with the credentials of {session['UserName']}")
+                        return False
+                    # Windows allows one set of credentials per host
+                    self.__disconnect(unc)
+                    session['UserName'] = None
+                elif session['CheckedAt'] is not None and \
+                        time.monotonic() - session['CheckedAt'] < self.__mHealthCheckInterval:
+                    self.__reuse(session)
+                    return True
+                elif self.__mTransport.isAlive(unc):
+                    session['CheckedAt'] = time.monotonic()
+                    self.__reuse(session)
+                    return True
+                else:
+                    with self.__mLock:
+                        self.__mStatistics['HealthCheckFailures'] += 1
+                    print(f"Warning: Session to {unc} is lost, connecting again")
+                    self.__disconnect(unc)
+                    session['UserName'] = None
+            if not self.__connect(unc, inUserName, inPassword):
+                return False
+            session['UserName'] = inUserName
+            session['CheckedAt'] = time.monotonic()
+            session['Users'] += 1
+            return True
+
+    def __reuse(self, inSession: dict):
+        inSession['Users'] += 1
+        with self.__mLock:
+            self.__mStatistics['Reuses'] += 1
+
+    def release(self, inHostAddress: str):
+        """Gives back a session acquired by a job, it stays open for the next jobs"""
+        with self.__mLock:
+            session = self.__mSessions.get(SessionManager.getUNC(inHostAddress))
+        if session is None:
+            return False
+        with session['Lock']:
+            if session['Users'] == 0:
+                return False
+            session['Users'] -= 1
+            return True
+
+    def close(self, inHostAddress: str = None):
+        """
+        Disconnects the unused sessions to the given host or to every host \n
+        :return: True if every unused session was disconnected else False
+        """
+        with self.__mLock:
+            uncs = list(self.__mSessions) if inHostAddress is None else [SessionManager.getUNC(inHostAddress)]
+        status = True
+        for unc in uncs:
+            session = self.__getSession(unc)
+            with session['Lock']:
+                if session['UserName'] is None or session['Users'] > 0:
+                    continue
+                status = self.__disconnect(unc) and status
+                session['UserName'] = None
+                session['CheckedAt'] = None
+        return status
+
+    def getStatistics(self):
+        """Returns the counts of `Connects`, `Reuses`, `Retries` & `HealthCheckFailures` and the users by host"""
+        with self.__mLock:
+            statistics = dict(self.__mStatistics)
+            statistics['Sessions'] = {unc: session['Users'] for unc, session in self.__mSessions.items()
+                                      if session['UserName'] is not None}
+            return statistics
+
+    @staticmethod
+    def getDefault():
+        """Returns the manager shared by all the jobs of the process"""
+        with SessionManager.__mDefaultLock:
+            if SessionManager.__mDefault is None:
+                SessionManager.__mDefault = SessionManager()
+            return SessionManager.__mDefault
@@ -0,0 +1,178 @@
+"""
+Dependency graph scheduling of the set-up stages
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from GenUtility import isNoneOrEmpty
+from PackageCache import PackageCache
+from Packages import Core, Plugin
+from Tracer import Tracer
+
+
+class TaskScheduler:
+
+    # Global Variables
+    DefaultWorkerCount = 4
+    # Returned by a Task's function when its work was already done
+    UpToDate = 'UpToDate'
+
+    # Task Statuses
+    Pending = 'Pending'
+    Executed = 'Executed'
+    Cached = 'Cached'
+    Failed = 'Failed'
+    Skipped = 'Skipped'
+
+    def __init__(self, inWorkerCount: int = DefaultWorkerCount):
+        if inWorkerCount is None or inWorkerCount < 1:
+            raise ValueError('Worker count must be at least 1')
+        self.__mWorkerCount = inWorkerCount
+        self.__mLock = threading.Lock()
+        self.__mTasks = dict()
+
+    def addTask(self, inName: str, inFunction, inDependencies: list = None):
+        """
+        Adds a Task to the graph unless a Task of the same name was already added, so that every Task
+        runs at most once however many times it is required \n
+        :param inName: Unique name of the Task
+        :param inFunction: Callable without arguments returning True if succeeded, False if failed
+                           or `TaskScheduler.UpToDate` if there was nothing to do
+        :param inDependencies: Names of the Tasks that must succeed before this one
+        :return: Name of the Task
+        """
+        if isNoneOrEmpty(inName) or inFunction is None:
+            raise ValueError('Task must contain a name and a function')
+        with self.__mLock:
+            if inName in self.__mTasks:
+                self.__mTasks[inName]['Requests'] += 1
+                return inName
+            for dependency in inDependencies or list():
+                if dependency not in self.__mTasks:
+                    raise ValueError(f"Task {inName} depends on the unknown Task {dependency}")
+            self.__mTasks[inName] = {'Function': inFunction, 'Dependencies': list(inDependencies or list()),
+                                     'Status': TaskScheduler.Pending, 'Duration': 0.0, 'Requests': 1}
+        return inName
+
+    def __runTask(self, inName: str):
+        task = self.__mTasks[inName]
+        startTime = time.perf_counter()
+        try:
+            result = task['Function']()
+        except Exception as error:
+            print(f"Error: Task {inName} failed. {error}")
+            result = False
+        task['Duration'] = time.perf_counter() - startTime
+        if result == TaskScheduler.UpToDate:
+            task['Status'] = TaskScheduler.Cached
+        else:
+            task['Status'] = TaskScheduler.Executed if result else TaskScheduler.Failed
+
+    def run(self):
+        """
+        Runs the pending Tasks, each as soon as its dependencies succeeded and concurrently with the
+        Tasks independent of it. Tasks whose dependencies did not succeed are skipped \n
+        :return: True if all the Tasks succeeded else False
+        """
+        running = dict()
+        with ThreadPoolExecutor(max_workers=self.__mWorkerCount) as executor:
+            while True:
+                for name, task in self.__mTasks.items():
+                    if task['Status'] != TaskScheduler.Pending or name in running.values():
+                        continue
+                    dependencyStatuses = [self.__mTasks[dependency]['Status'] for dependency in task['Dependencies']]
+                    if any(status in [TaskScheduler.Failed, TaskScheduler.Skipped] for status in dependencyStatuses):
+                        task['Status'] = TaskScheduler.Skipped
+                    elif all(status in [TaskScheduler.Executed, TaskScheduler.Cached]
+                             for status in dependencyStatuses):
+                        running[executor.submit(self.__runTask, name)] = name
+                if len(running) == 0:
+                    break
+                completed, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    del running[future]
+        return all(self.succeeded(name) for name in self.__mTasks)
+
+    def succeeded(self, inName: str):
+        return inName in self.__mTasks and \
+            self.__mTasks[inName]['Status'] in [TaskScheduler.Executed, TaskScheduler.Cached]
+
+    def getReport(self):
+        """Returns the Status, Duration in seconds & number of Requests of every Task"""
+        return {name: {'Status': task['Status'], 'Duration': round(task['Duration'], 3),
+                       'Requests': task['Requests']}
+                for name, task in self.__mTasks.items()}
+
+
+def _traced(inSpanName: str, inTraceTags: dict, inFunction):
+    """Wraps the function of a Task in a span of the default Tracer, tagged with the Task's outcome"""
+    def run():
+        with Tracer.getDefault().span(inSpanName, **inTraceTags) as span:
+            result = inFunction()
+            span.setTag('Status', TaskScheduler.Cached if result == TaskScheduler.UpToDate
+                        else TaskScheduler.Executed if result else TaskScheduler.Failed)
+            return result
+    return run
+
+
+def _scheduleDownload(inScheduler: TaskScheduler, inPackage, inName: str, inCache: PackageCache,
+                      inTraceTags: dict):
+    """Adds the fetch & extract Tasks of the given Package and returns the name of the extract Task"""
+    fetchedArchive = dict()
+
+    def fetch():
+        if not os.path.exists(inPackage.getSourcePath()):
+            print(f"Error: Given Path {inPackage.getSourcePath()} is Invalid!")
+            return False
+        if not inPackage.needsDownload():
+            return TaskScheduler.UpToDate
+        fetchedArchive['Path'] = inPackage.fetch(inCache)
+        return fetchedArchive['Path'] is not None
+
+    def extract():
+        if 'Path' not in fetchedArchive:
+            return TaskScheduler.UpToDate
+        try:
+            return inPackage.extract(fetchedArchive['Path'])
+        finally:
+            inPackage.releaseArchive(fetchedArchive['Path'], inCache)
+
+    fetchTask = inScheduler.addTask(f"{inName}:Fetch", _traced('Fetch', inTraceTags, fetch))
+    return inScheduler.addTask(f"{inName}:Extract", _traced('Extract', inTraceTags, extract), [fetchTask])
+
+
+def getTraceTags(inPluginInfo: Plugin):
+    """Returns the tags identifying the Plugin in the spans of its stages"""
+    return {'Package': os.path.abspath(inPluginInfo.getSourcePath()), 'DSN': inPluginInfo.getDataSourceName(),
+            'Bit': inPluginInfo.getPackageBitCount()}
+
+
+def scheduleCoreSetup(inScheduler: TaskScheduler, inCoreInfo: Core, inCache: PackageCache = None):
+    """
+    Adds the Tasks setting up the Core \n
+    :return: Name of the last Task of the Core's set-up
+    """
+    return _scheduleDownload(inScheduler, inCoreInfo, 'Core', inCache,
+                             {'Package': os.path.abspath(inCoreInfo.getSourcePath())})
+
+
+def schedulePluginSetup(inScheduler: TaskScheduler, inPluginInfo: Plugin, inCoreInfo: Core,
+                        inCache: PackageCache = None):
+    """
+    Adds the Tasks setting up the Plugin, sharing the Core's Tasks with every other Plugin and the Plugin's
+    download & overlay with the entries of the same Package at the same Destination Path \n
+    :return: Name of the last Task of the Plugin's set-up
+    """
+    coreTask = scheduleCoreSetup(inScheduler, inCoreInfo, inCache)
+    pluginName = f"{inPluginInfo.getFileName()}@{inPluginInfo.getDestinationPath()}"
+    traceTags = getTraceTags(inPluginInfo)
+    extractTask = _scheduleDownload(inScheduler, inPluginInfo, pluginName, inCache, traceTags)
+    overlayTask = inScheduler.addTask(f"{pluginName}:Overlay",
+                                      _traced('Overlay', traceTags, lambda: inPluginInfo.overlay(inCoreInfo)),
+                                      [coreTask, extractTask])
+    # Entries of the same Package differ by their DSN & its configuration, so each one writes its own
+    return inScheduler.addTask(f"{pluginName}:Registry:{inPluginInfo.getDataSourceName()}",
+                               _traced('Registry', traceTags, inPluginInfo.configureRegistry), [overlayTask])
@@ -0,0 +1,79 @@
+"""
+Single command line of the runners, importing a kind of test only when its subcommand runs
+"""
+
+import argparse
+import os
+import sys
+
+# Kinds of tests by subcommand, as named by `TestOrchestrator.TestKind`
+SubcommandTestKinds = {
+    'metadata': ['MetaDataTest'],
+    'scalability': ['ScalabilityTest'],
+    'ini': ['INIFileTest'],
+    'all': ['MetaDataTest', 'ScalabilityTest', 'INIFileTest'],
+}
+# Time `--help` & `validate` may take above the start of a bare interpreter, checked by `Benchmark.py`
+StartupBudgetsInSeconds = {'Help': 0.1, 'Validate': 0.25}
+
+
+def _createParser():
+    parser = argparse.ArgumentParser(prog='TestCLI.py', description=__doc__)
+    subparsers = parser.add_subparsers(dest='subcommand', required=True)
+    for subcommand, testKinds in SubcommandTestKinds.items():
+        subparser = subparsers.add_parser(subcommand, help=f"Runs {' & '.join(testKinds)} on every Plugin")
+        subparser.add_argument('username', help='Simba/MagSW Username')
+        subparser.add_argument('password', help='Simba/MagSW Password')
+        subparser.add_argument('basePath', help='Current Working Directory Path')
+        subparser.add_argument('inputFileName', help='Name of the Input File in the Base Path')
+        subparser.add_argument('--workers', type=int, default=1, help='Number of Plugins tested at once')
+        subparser.add_argument('--force', action='store_true',
+                               help='Runs every test again even if it passed with the same inputs before')
+        subparser.add_argument('--trace', action='store_true', help='Traces the stages to `Trace.json`')
+        subparser.add_argument('--archive', action='store_true',
+                               help='Compresses the Logs of every test into the `LogArchive` of the Base Path')
+    subparser = subparsers.add_parser('validate', help='Checks the Input File without connecting or testing')
+    subparser.add_argument('basePath', help='Current Working Directory Path')
+    subparser.add_argument('inputFileName', help='Name of the Input File in the Base Path')
+    return parser
+
+
+def validate(inBasePath: str, inputFileName: str):
+    """
+    Reads the Input File or manifest entry by entry as a run would, reporting every invalid entry \n
+    :return: True if every entry is valid else False
+    """
+    from Input import ManifestReader, validateEntry
+    inputFilePath = os.path.join(inBasePath, inputFileName)
+    validCount = 0
+    invalidCount = 0
+    for entry in ManifestReader(inputFilePath).iterEntries():
+        validateEntry(entry)
+        if len(entry['Errors']) == 0:
+            validCount += 1
+            continue
+        invalidCount += 1
+        for error in entry['Errors']:
+            print(f"Error: {entry['Entry']}: {error}")
+    print(f"{inputFilePath}: {validCount} valid & {invalidCount} invalid Plugin entries")
+    return invalidCount == 0 and validCount > 0
+
+
+def main(inArguments: list):
+    arguments = _createParser().parse_args(inArguments)
+    if arguments.subcommand == 'validate':
+        return 0 if validate(arguments.basePath, arguments.inputFileName) else 1
+    if arguments.workers < 1:
+        print('Error: Worker count must be at least 1')
+        return 1
+    import TestOrchestrator
+    summary = TestOrchestrator.main(arguments.username, arguments.password, arguments.basePath,
+                                    arguments.inputFileName, SubcommandTestKinds[arguments.subcommand],
+                                    arguments.workers, arguments.force, arguments.trace, arguments.archive)
+    return 0 if summary is not None and 'Plugins' in summary else 1
+
+
+if __name__ == '__main__':
+    # i.e python TestCLI.py metadata username password C:fakepath input.json --workers 4
+    #     python TestCLI.py validate C:fakepath input.json
+    sys.exit(main(sys.argv[1:]))
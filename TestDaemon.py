@@ -0,0 +1,256 @@
+"""
+Long-running test service accepting jobs over a local HTTP API, keeping the imports, Share sessions,
+Configuration Store, Mismatch Rules & Test Set queries of the process warm between jobs
+"""
+
+import collections
+import itertools
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from GenUtility import isNoneOrEmpty, createDir
+from Input import InputReader, ManifestReader
+
+
+class TestDaemon:
+    """Runs the submitted jobs one after the other, each job testing its Plugins through the orchestrator"""
+
+    # Job Statuses
+    Queued = 'Queued'
+    Running = 'Running'
+    Completed = 'Completed'
+    Failed = 'Failed'
+
+    # Global Variables
+    DefaultPort = 8766
+    JobsDirName = 'DaemonJobs'
+    MaxKeptJobs = 1000
+
+    def __init__(self, inUserName: str, inPassword: str, inBasePath: str, inWorkerCount: int = 1,
+                 inJobRunner=None):
+        """
+        :param inUserName: Simba/MagSW Username
+        :param inPassword: Simba/MagSW Password
+        :param inBasePath: Current Working Directory Path of the jobs
+        :param inWorkerCount: Number of Plugins of a job tested at once
+        :param inJobRunner: Callable receiving the Input File Name relative to the Base Path, the test kinds
+                            & whether to force the run, returning the summary; the orchestrator if not given
+        """
+        if isNoneOrEmpty(inUserName, inPassword, inBasePath) or not os.path.isdir(inBasePath) or \
+                inWorkerCount is None or inWorkerCount < 1:
+            raise ValueError('Invalid Test Daemon parameters')
+        self.__mUserName = inUserName
+        self.__mPassword = inPassword
+        self.__mBasePath = inBasePath
+        self.__mWorkerCount = inWorkerCount
+        self.__mJobRunner = inJobRunner if inJobRunner is not None else self.__orchestrate
+        self.__mLock = threading.Lock()
+        self.__mJobs = collections.OrderedDict()
+        self.__mJobIds = itertools.count(1)
+        self.__mQueue = queue.Queue()
+        self.__mStartedAt = time.time()
+        self.__mRunnerThread = None
+
+    def __orchestrate(self, inputFileName: str, inTestKinds: list, inForceRun: bool):
+        from TestOrchestrator import orchestrate
+        return orchestrate(self.__mUserName, self.__mPassword, self.__mBasePath, inputFileName, inTestKinds,
+                           self.__mWorkerCount, inForceRun)
+
+    @staticmethod
+    def warmUp():
+        """Imports the runners and loads what every job shares before the first job arrives"""
+        from ConfigurationStore import ConfigurationStore
+        from MismatchClassifier import MismatchClassifier
+        from SessionManager import SessionManager
+        # The orchestrator imports the runner of every kind of test only when it runs, jobs of any kind may come
+        import FailureStore
+        import INIFileTestRunner
+        import MetaTestRunner
+        import ScalabilityTestRunner
+        import TestOrchestrator
+        MismatchClassifier.getDefault()
+        ConfigurationStore.getDefault()
+        SessionManager.getDefault()
+
+    def start(self):
+        """Starts running the submitted jobs"""
+        self.__mRunnerThread = threading.Thread(target=self.__runJobs, daemon=True, name='TestDaemon')
+        self.__mRunnerThread.start()
+
+    def stop(self):
+        """Stops once the running job completed, the queued jobs are not run"""
+        self.__mQueue.put(None)
+        if self.__mRunnerThread is not None:
+            self.__mRunnerThread.join()
+
+    def submit(self, inJob: dict):
+        """
+        Queues a job \n
+        :param inJob: `Input` as in an Input File or `InputFileName` of an Input File or manifest relative to
+                      the Base Path, optionally the `Plugins` to test by Source Path, the `TestKinds` & `ForceRun`
+        :return: Id of the job if valid else None
+        """
+        from TestOrchestrator import TestKind
+        if not isinstance(inJob, dict):
+            print('Error: Job must be a JSON object')
+            return None
+        testKinds = inJob.get('TestKinds', TestKind.All)
+        if not isinstance(testKinds, list) or any(testKind not in TestKind.All for testKind in testKinds):
+            print(f"Error: Test kinds must be among {TestKind.All}")
+            return None
+        if isinstance(inJob.get('Input'), dict):
+            entries = ManifestReader.iterInputEntries(inJob['Input'], 'Input')
+        elif not isNoneOrEmpty(inJob.get('InputFileName')):
+            entries = ManifestReader(os.path.join(self.__mBasePath, inJob['InputFileName'])).iterEntries()
+        else:
+            print('Error: Job must contain `Input` or `InputFileName`')
+            return None
+        # Only the given Plugins of the Input File are tested
+        sourcePaths = [os.path.abspath(sourcePath) for sourcePath in inJob['Plugins']] \
+            if inJob.get('Plugins') is not None else None
+        pluginCount = [0]
+
+        def iterPluginEntries():
+            for entry in entries:
+                if len(entry['Errors']) > 0:
+                    for error in entry['Errors']:
+                        print(f"Error: {entry['Entry']}: {error}")
+                elif sourcePaths is None or \
+                        os.path.abspath(str(entry[InputReader.Plugin].get(InputReader.SourcePath, ''))) in sourcePaths:
+                    pluginCount[0] += 1
+                    yield entry
+
+        # Entries are written to the job's manifest as they are read instead of being kept until the job runs
+        jobsDirPath = os.path.join(self.__mBasePath, TestDaemon.JobsDirName)
+        createDir(jobsDirPath)
+        pendingFilePath = os.path.join(jobsDirPath, f"Pending_{threading.get_ident()}_{time.time_ns()}"
+                                                    f"{ManifestReader.ManifestFileExtension}")
+        ManifestReader.write(iterPluginEntries(), pendingFilePath)
+        if pluginCount[0] == 0:
+            os.remove(pendingFilePath)
+            print('Error: Job has no Plugin to test')
+            return None
+
+        with self.__mLock:
+            jobId = f"Job{next(self.__mJobIds)}"
+            self.__mJobs[jobId] = {'Status': TestDaemon.Queued, 'TestKinds': testKinds,
+                                   'SubmittedAt': time.time(), 'StartedAt': None, 'FinishedAt': None,
+                                   'Summary': None}
+            # The oldest completed jobs are forgotten
+            while len(self.__mJobs) > TestDaemon.MaxKeptJobs:
+                oldestJobId = next(iter(self.__mJobs))
+                if self.__mJobs[oldestJobId]['Status'] in [TestDaemon.Queued, TestDaemon.Running]:
+                    break
+                del self.__mJobs[oldestJobId]
+        os.replace(pendingFilePath, os.path.join(self.__mBasePath, TestDaemon.__getInputFileName(jobId)))
+        self.__mQueue.put((jobId, testKinds, bool(inJob.get('ForceRun', False))))
+        return jobId
+
+    @staticmethod
+    def __getInputFileName(inJobId: str):
+        """Returns the name of the job's manifest relative to the Base Path"""
+        return os.path.join(TestDaemon.JobsDirName, f"{inJobId}{ManifestReader.ManifestFileExtension}")
+
+    def __runJobs(self):
+        while True:
+            job = self.__mQueue.get()
+            if job is None:
+                return
+            jobId, testKinds, forceRun = job
+            with self.__mLock:
+                self.__mJobs[jobId].update({'Status': TestDaemon.Running, 'StartedAt': time.time()})
+            try:
+                summary = self.__mJobRunner(TestDaemon.__getInputFileName(jobId), testKinds, forceRun)
+            except Exception as error:
+                print(f"Error: {jobId} failed. {error}")
+                summary = None
+            with self.__mLock:
+                self.__mJobs[jobId].update({'Status': TestDaemon.Completed if summary is not None
+                                            else TestDaemon.Failed, 'FinishedAt': time.time(),
+                                            'Summary': summary})
+
+    def getJob(self, inJobId: str):
+        """Returns the status, times & summary of the job, None if unknown"""
+        with self.__mLock:
+            return dict(self.__mJobs[inJobId]) if inJobId in self.__mJobs else None
+
+    def getStatus(self):
+        """Returns the status of every job without their summaries and the state kept warm"""
+        from SessionManager import SessionManager
+        with self.__mLock:
+            jobs = {jobId: {name: value for name, value in job.items() if name != 'Summary'}
+                    for jobId, job in self.__mJobs.items()}
+        return {'UpTime': round(time.time() - self.__mStartedAt, 3), 'Jobs': jobs,
+                'Sessions': SessionManager.getDefault().getStatistics()}
+
+
+def _createHandler(inDaemon: TestDaemon):
+    class Handler(BaseHTTPRequestHandler):
+        def __reply(self, inCode: int, inBody: dict):
+            body = json.dumps(inBody).encode()
+            self.send_response(inCode)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path in ['/', '/jobs']:
+                self.__reply(200, inDaemon.getStatus())
+            elif self.path.startswith('/jobs/'):
+                job = inDaemon.getJob(self.path[len('/jobs/'):])
+                self.__reply(200 if job is not None else 404, job if job is not None else {'Error': 'Unknown job'})
+            else:
+                self.__reply(404, {'Error': f"Unknown path {self.path}"})
+
+        def do_POST(self):
+            if self.path == '/jobs':
+                try:
+                    job = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'null')
+                except ValueError:
+                    job = None
+                jobId = inDaemon.submit(job)
+                self.__reply(202 if jobId is not None else 400,
+                             {'JobId': jobId} if jobId is not None else {'Error': 'Invalid job'})
+            elif self.path == '/shutdown':
+                self.__reply(200, {})
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+            else:
+                self.__reply(404, {'Error': f"Unknown path {self.path}"})
+
+        def log_message(self, inFormat, *args):
+            pass
+
+    return Handler
+
+
+def serve(inDaemon: TestDaemon, inPort: int = TestDaemon.DefaultPort, inOnReady=None):
+    """
+    Serves the daemon's API on this machine only until `/shutdown` is posted \n
+    :param inOnReady: Callable receiving the port once the API accepts jobs
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', inPort), _createHandler(inDaemon))
+    inDaemon.start()
+    try:
+        if inOnReady is not None:
+            inOnReady(server.server_address[1])
+        server.serve_forever()
+    finally:
+        server.server_close()
+        inDaemon.stop()
+
+
+if __name__ == '__main__':
+    # i.e python TestDaemon.py username password C:fakepath 8766 4
+    if len(sys.argv) < 4:
+        print('Error: Username, Password & Base Path are required')
+        sys.exit(1)
+    TestDaemon.warmUp()
+    serve(TestDaemon(sys.argv[1], sys.argv[2], sys.argv[3], int(sys.argv[5]) if len(sys.argv) > 5 else 1),
+          int(sys.argv[4]) if len(sys.argv) > 4 else TestDaemon.DefaultPort,
+          lambda port: print(f"Accepting jobs on http://127.0.0.1:{port}/jobs"))
@@ -0,0 +1,457 @@
+"""
+Single entry point setting up every Plugin once and running all the requested kinds of tests on it
+"""
+
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from AsyncMetaTester import AsyncMetaTesterExecutor
+from GenUtility import isNoneOrEmpty
+from Input import InputReader, ManifestReader, getPackageCache, validateEntry
+from Packages import Core, Plugin
+from RemoteConnection import RemoteConnection
+from ResultStore import ResultStore
+from SetupScheduler import TaskScheduler, getTraceTags, scheduleCoreSetup, schedulePluginSetup
+from Tracer import Tracer
+
+
+class TestKind:
+    MetaData = ResultStore.MetaDataTest
+    Scalability = ResultStore.ScalabilityTest
+    INIFile = ResultStore.INIFileTest
+    # Order in which the tests run on a Plugin, the INI File Test alters the DSN last and restores it
+    All = [MetaData, Scalability, INIFile]
+    # Names accepted on the command line
+    Aliases = {'metadata': [MetaData], 'scalability': [Scalability], 'ini': [INIFile], 'all': All}
+
+
+SummaryFileName = 'TestSummary.json'
+# Number of entries read ahead of their tests, the memory of a run does not grow with the number of entries
+BatchSize = 64
+
+
+def _getFingerprint(inTestKind: str, inPluginInfo: Plugin, inCoreInfo: Core, inBasePath: str):
+    """Fingerprints the inputs of the given kind of test of the Plugin"""
+    extraInputs = dict()
+    if inTestKind == TestKind.MetaData:
+        from MetaTestRunner import MismatchRulesFileName
+        extraInputs = {'MismatchRules': ResultStore.getFileSignature(os.path.join(inBasePath, MismatchRulesFileName)),
+                       'MetaTesterTimeOut': inPluginInfo.getMetaTesterTimeOut()}
+    elif inTestKind == TestKind.Scalability:
+        extraInputs = {'ScalabilityEngine': inPluginInfo.getScalabilityEngine(),
+                       'ScalabilityTester': ResultStore.getFileSignature(os.path.join(inBasePath,
+                                                                                      'ScalabilityTester.exe'))}
+    elif inTestKind == TestKind.INIFile:
+        extraInputs = {'MetaTesterTimeOut': inPluginInfo.getMetaTesterTimeOut()}
+    return ResultStore.getPluginFingerprint(inTestKind, inPluginInfo, inCoreInfo,
+                                            os.path.join(inBasePath, AsyncMetaTesterExecutor.MetaTesterDirName),
+                                            extraInputs)
+
+
+def _getPluginKey(inPluginInfo: Plugin):
+    """Returns the Source Path & DSN identifying the entry, as entries of the same Package differ by their DSN"""
+    return os.path.abspath(inPluginInfo.getSourcePath()), inPluginInfo.getDataSourceName()
+
+
+def _runPipeline(inPluginInfo: Plugin, inTestKinds: list, inIsSetUp: bool, inBasePath: str,
+                 inClassifier: 'MismatchClassifier', inExecutor: AsyncMetaTesterExecutor, inResultStore: ResultStore,
+                 inFingerprints: dict, inLogArchive: 'LogArchive' = None, inArchiveRunId: int = None,
+                 inFailureStore: 'FailureStore' = None, inFailureRunId: int = None):
+    """
+    Runs the given kinds of tests one after another on the set up Plugin, recording the passing ones.
+    Every kind of test imports its runner only when it runs \n
+    :param inLogArchive: Archive keeping the Logs of every test, the Logs are not archived if not given
+    :param inArchiveRunId: Id of the run in the archive
+    :param inFailureStore: Store recording the column checks of the MetaData Test, not recorded if not given
+    :param inFailureRunId: Id of the run in the Failure Store
+    :return: Summary of the Plugin
+    """
+    if not inIsSetUp:
+        return 'Failed'
+    sourceFilePath, dataSourceName = _getPluginKey(inPluginInfo)
+    pluginSummary = dict()
+    pluginSummary['Setup'] = 'Succeed'
+    # Spans of the tests inherit the tags identifying the Plugin
+    with Tracer.getDefault().span('Plugin', **getTraceTags(inPluginInfo)):
+        for testKind in inTestKinds:
+            with Tracer.getDefault().span(testKind) as span:
+                if testKind == TestKind.MetaData:
+                    from MetaTestRunner import _runMetaDataTest
+                    testSummary = _runMetaDataTest(inPluginInfo, inBasePath, inClassifier, inExecutor, inFailureStore,
+                                                   inFailureRunId)
+                elif testKind == TestKind.Scalability:
+                    from ScalabilityTestRunner import _runScalabilityTest
+                    testSummary = _runScalabilityTest(inPluginInfo, inBasePath)
+                else:
+                    from INIFileTestRunner import _runINIFileTest
+                    testSummary = _runINIFileTest(inPluginInfo, inBasePath, inExecutor)
+                span.setTag('Status', testSummary.get(testKind))
+            pluginSummary.update(testSummary)
+            if testSummary.get(testKind) == 'Succeed':
+                inResultStore.record(testKind, sourceFilePath, dataSourceName, inFingerprints[testKind], testSummary)
+            if inLogArchive is not None:
+                with Tracer.getDefault().span('Archive'):
+                    _archiveLogs(inPluginInfo, testSummary, inLogArchive, inArchiveRunId, pluginSummary)
+    return pluginSummary
+
+
+def _archiveLogs(inPluginInfo: Plugin, inTestSummary: dict, inLogArchive: 'LogArchive', inArchiveRunId: int,
+                 outPluginSummary: dict):
+    """Archives every Log File of the test, adding the Ids of the archived Logs to the Plugin's summary"""
+    for kind, logFilePath in inTestSummary.items():
+        if kind.endswith('Logs') and isinstance(logFilePath, str) and os.path.isfile(logFilePath):
+            logId = inLogArchive.archive(logFilePath, inArchiveRunId, os.path.abspath(inPluginInfo.getSourcePath()),
+                                         inPluginInfo.getDataSourceName(), kind)
+            if logId is not None:
+                outPluginSummary.setdefault('ArchivedLogs', dict())[kind] = logId
+
+
+def orchestrate(inUserName: str, inPassword: str, inBasePath: str, inputFileName: str, inTestKinds: list,
+                inWorkerCount: int = 1, inForceRun: bool = False, inTraceFilePath: str = None,
+                inArchiveLogs: bool = False):
+    """
+    Sets up every Core & Plugin once, then runs each set up Plugin through the given kinds of tests.
+    Entries are read `BatchSize` at a time, those of a batch sharing a Remote Machine, Core & Package Cache
+    being set up & tested together. Plugins are tested concurrently by the workers, each one going through its
+    tests as soon as a worker is free.
+    When traced, the time spent in every stage is added to the summary as `StageDurations` \n
+    :param inUserName: Simba/MagSW Username
+    :param inPassword: Simba/MagSW Password
+    :param inBasePath: Current Working Directory Path
+    :param inputFileName: Name of the Input File
+    :param inTestKinds: Kinds of tests among `TestKind.All`
+    :param inWorkerCount: Number of Plugins tested at once
+    :param inForceRun: If True, every test is run again even if it passed with the same inputs before
+    :param inTraceFilePath: Path to write the Chrome trace of the stages to, the stages are not traced if not given
+    :param inArchiveLogs: If True, the Logs of every test are compressed into the `LogArchive` of the Base Path
+    :return: Combined summary of all the tests if the Remote Machines were connected else None
+    """
+    if isNoneOrEmpty(inUserName, inPassword, inBasePath, inputFileName, inTestKinds):
+        print('Error: Invalid Parameter')
+        return None
+    elif not os.path.exists(inBasePath):
+        print(f"Error: Invalid Path {inBasePath}")
+        return None
+    elif inWorkerCount is None or inWorkerCount < 1:
+        print('Error: Worker count must be at least 1')
+        return None
+    elif any(testKind not in TestKind.All for testKind in inTestKinds):
+        print(f"Error: Test kinds must be among {TestKind.All}")
+        return None
+    testKinds = [testKind for testKind in TestKind.All if testKind in inTestKinds]
+
+    tracer = Tracer(inTraceFilePath is not None)
+    Tracer.setDefault(tracer)
+    try:
+        summary = _orchestrate(inUserName, inPassword, inBasePath, inputFileName, testKinds, inWorkerCount,
+                               inForceRun, inArchiveLogs)
+    finally:
+        Tracer.setDefault(None)
+    if tracer.isEnabled():
+        if summary is not None:
+            summary['StageDurations'] = tracer.getStageDurations()
+        if tracer.exportChromeTrace(inTraceFilePath):
+            print(f"Trace: {inTraceFilePath}")
+    return summary
+
+
+def _iterBatches(inEntries, inBatchSize: int, outErrors: list):
+    """
+    Groups the valid entries into batches as they are read, reporting the invalid ones \n
+    :param inEntries: Entries read by `ManifestReader`
+    :param inBatchSize: Maximum number of entries of a batch
+    :param outErrors: List the errors of every invalid entry are added to
+    :return: Batches of entries with their Core & Plugin
+    """
+    batch = list()
+    for entry in inEntries:
+        coreInfo, pluginInfo = validateEntry(entry)
+        for error in entry['Errors']:
+            outErrors.append(f"Error: {entry['Entry']}: {error}")
+            print(outErrors[-1])
+        if len(entry['Errors']) > 0:
+            continue
+        batch.append((entry, coreInfo, pluginInfo))
+        if len(batch) == inBatchSize:
+            yield batch
+            batch = list()
+    if len(batch) > 0:
+        yield batch
+
+
+def _mergeSetupReport(outReport: dict, inReport: dict):
+    """Adds the report of a batch's Tasks to the run's, adding up the Tasks of the same name"""
+    for name, task in inReport.items():
+        if name not in outReport:
+            outReport[name] = dict(task)
+            continue
+        outReport[name]['Duration'] = round(outReport[name]['Duration'] + task['Duration'], 3)
+        outReport[name]['Requests'] += task['Requests']
+        if outReport[name]['Status'] not in [TaskScheduler.Failed, TaskScheduler.Skipped]:
+            outReport[name]['Status'] = task['Status']
+
+
+class _Run:
+    """
+    State shared by the batches of entries of a run: Remote Machines are connected, and Package Caches & stores
+    created, when the first entry needing them is reached. Every Core is set up once for all its entries
+    """
+
+    def __init__(self, inUserName: str, inPassword: str, inBasePath: str, inputFileName: str, inTestKinds: list,
+                 inForceRun: bool, inArchiveLogs: bool, inClassifier: 'MismatchClassifier',
+                 inMetaTesterExecutor: AsyncMetaTesterExecutor, inExecutor: ThreadPoolExecutor):
+        self.__mUserName = inUserName
+        self.__mPassword = inPassword
+        self.__mBasePath = inBasePath
+        self.__mInputFileName = inputFileName
+        self.__mTestKinds = inTestKinds
+        self.__mForceRun = inForceRun
+        self.__mArchiveLogs = inArchiveLogs
+        self.__mClassifier = inClassifier
+        self.__mMetaTesterExecutor = inMetaTesterExecutor
+        self.__mExecutor = inExecutor
+        self.__mResultStore = ResultStore(os.path.join(inBasePath, ResultStore.DefaultFileName))
+        self.__mConnections = dict()
+        self.__mPackageCaches = dict()
+        # Core to set up for the next entries & whether it was set up, by `Core` entry
+        self.__mCores = dict()
+        # Number of Plugins of every DSN, so that entries of different batches never share one
+        self.__mDataSourceNames = dict()
+        self.__mLogArchive = None
+        self.__mArchiveRunId = None
+        self.__mFailureStore = None
+        self.__mFailureRunId = None
+        self.__mSummary = {'TestKinds': inTestKinds, 'SetupTasks': dict(), 'Plugins': dict()}
+
+    def __connect(self, inRemoteMachineAddress: str):
+        """Returns True once connected to the Remote Machine"""
+        if inRemoteMachineAddress not in self.__mConnections:
+            remoteConnection = RemoteConnection(inRemoteMachineAddress, self.__mUserName, self.__mPassword)
+            with Tracer.getDefault().span('Connect'):
+                isConnected = remoteConnection.connect()
+            if not isConnected:
+                return False
+            self.__mConnections[inRemoteMachineAddress] = remoteConnection
+        return True
+
+    def disconnect(self):
+        for remoteConnection in self.__mConnections.values():
+            remoteConnection.disconnect()
+
+    def __getPackageCache(self, inPackageCacheInfo: dict):
+        if inPackageCacheInfo is None:
+            return None
+        cacheKey = json.dumps(inPackageCacheInfo, sort_keys=True)
+        if cacheKey not in self.__mPackageCaches:
+            self.__mPackageCaches[cacheKey] = getPackageCache(inPackageCacheInfo, self.__mBasePath)
+        return self.__mPackageCaches[cacheKey]
+
+    def __beginStores(self, inHasPluginsToTest: bool):
+        """Begins the run in the Log Archive & Failure Store the first time they are needed"""
+        if self.__mArchiveLogs and self.__mLogArchive is None:
+            from LogArchive import LogArchive
+            self.__mLogArchive = LogArchive(os.path.join(self.__mBasePath, LogArchive.DefaultDirName))
+            self.__mArchiveRunId = self.__mLogArchive.beginRun(self.__mInputFileName)
+            self.__mSummary['ArchiveRunId'] = self.__mArchiveRunId
+        # Column checks of every MetaData Test are kept across runs to be queried without reading the Logs
+        if TestKind.MetaData in self.__mTestKinds and inHasPluginsToTest and self.__mFailureStore is None:
+            from FailureStore import FailureStore
+            self.__mFailureStore = FailureStore(os.path.join(self.__mBasePath, FailureStore.DefaultFileName))
+            self.__mFailureRunId = self.__mFailureStore.beginRun(self.__mInputFileName)
+            self.__mSummary['FailureStoreRunId'] = self.__mFailureRunId
+
+    def runBatch(self, inBatch: list):
+        """
+        Tests the entries of the batch, those sharing a Remote Machine, Core & Package Cache together \n
+        :param inBatch: Entries read by `ManifestReader` with their Core & Plugin
+        :return: False if a Remote Machine could not be connected else True
+        """
+        # Entries sharing a DSN would overwrite each other's configuration even when tested one after another
+        Plugin.assignUniqueDataSourceNames([pluginInfo for _, _, pluginInfo in inBatch], self.__mDataSourceNames)
+        groups = dict()
+        for entry, coreInfo, pluginInfo in inBatch:
+            settings = json.dumps([entry[key] for key in ManifestReader.SettingKeys], sort_keys=True)
+            groups.setdefault(settings, list()).append((entry, coreInfo, pluginInfo))
+        pluginSummaries = dict()
+        for group in groups.values():
+            if not self.__runGroup(group, pluginSummaries):
+                return False
+
+        # Results are collected in the order of the entries irrespective of their group & completion order.
+        # Entries of a Package listed more than once are told apart by their DSN
+        for _, _, pluginInfo in inBatch:
+            sourceFilePath, dataSourceName = _getPluginKey(pluginInfo)
+            self.__mSummary['Plugins'][sourceFilePath if sourceFilePath not in self.__mSummary['Plugins']
+                                       else f"{sourceFilePath}@{dataSourceName}"] = \
+                pluginSummaries[(sourceFilePath, dataSourceName)]
+        return True
+
+    def __runGroup(self, inGroup: list, outPluginSummaries: dict):
+        """Sets up the Core & Plugins of entries sharing their settings, then runs each set up Plugin's tests"""
+        entry, coreInfo, _ = inGroup[0]
+        if not self.__connect(entry[InputReader.RemoteMachineAddress]):
+            return False
+        packageCache = self.__getPackageCache(entry[InputReader.PackageCache])
+        coreKey = json.dumps(entry[InputReader.Core], sort_keys=True)
+        coreInfo, isCoreSetUp = self.__mCores.get(coreKey, (coreInfo, None))
+        plugins = [pluginInfo for _, _, pluginInfo in inGroup]
+        if isCoreSetUp is False:
+            for pluginInfo in plugins:
+                outPluginSummaries[_getPluginKey(pluginInfo)] = 'Failed'
+            return True
+
+        # Tests which passed with the same Packages, configurations & MetaTester are not run again,
+        # Plugins left without any test to run are not even set up
+        fingerprints = dict()
+        reusedSummaries = dict()
+        pendingTestKinds = dict()
+        for pluginInfo in plugins:
+            pluginKey = _getPluginKey(pluginInfo)
+            fingerprints[pluginKey] = {testKind: _getFingerprint(testKind, pluginInfo, coreInfo, self.__mBasePath)
+                                       for testKind in self.__mTestKinds}
+            reusedSummaries[pluginKey] = dict()
+            pendingTestKinds[pluginKey] = list()
+            for testKind in self.__mTestKinds:
+                storedSummary = None if self.__mForceRun else \
+                    self.__mResultStore.lookup(testKind, *pluginKey, fingerprints[pluginKey][testKind])
+                if storedSummary is not None:
+                    reusedSummaries[pluginKey][testKind] = storedSummary
+                else:
+                    pendingTestKinds[pluginKey].append(testKind)
+            if len(reusedSummaries[pluginKey]) > 0:
+                print(f"{pluginKey[0]} ({pluginKey[1]}): Results of the last passing "
+                      f"{list(reusedSummaries[pluginKey])} are reused")
+        pluginsToTest = [pluginInfo for pluginInfo in plugins if len(pendingTestKinds[_getPluginKey(pluginInfo)]) > 0]
+        self.__beginStores(len(pluginsToTest) > 0)
+
+        # Core & the Plugins are set up through one graph of Tasks,
+        # so that Core is fetched & extracted only once and independent stages overlap
+        scheduler = TaskScheduler()
+        coreSetupTask = scheduleCoreSetup(scheduler, coreInfo, packageCache)
+        pluginSetupTasks = [schedulePluginSetup(scheduler, pluginInfo, coreInfo, packageCache)
+                            for pluginInfo in pluginsToTest]
+        with Tracer.getDefault().span('Setup'):
+            scheduler.run()
+        _mergeSetupReport(self.__mSummary['SetupTasks'], scheduler.getReport())
+        isCoreSetUp = scheduler.succeeded(coreSetupTask)
+        # A Core forced to update is downloaded again only for the first entries of the run
+        self.__mCores[coreKey] = (Core(coreInfo.getSourcePath(), coreInfo.getDestinationPath(), coreInfo.getBranch())
+                                  if isCoreSetUp else coreInfo, isCoreSetUp)
+        if not isCoreSetUp:
+            for pluginInfo in plugins:
+                outPluginSummaries[_getPluginKey(pluginInfo)] = 'Failed'
+            return True
+
+        testedSummaries = dict()
+        pluginSummaries = self.__mExecutor.map(
+            lambda pluginInfo, setupTask: _runPipeline(
+                pluginInfo, pendingTestKinds[_getPluginKey(pluginInfo)], scheduler.succeeded(setupTask),
+                self.__mBasePath, self.__mClassifier, self.__mMetaTesterExecutor, self.__mResultStore,
+                fingerprints[_getPluginKey(pluginInfo)], self.__mLogArchive, self.__mArchiveRunId,
+                self.__mFailureStore, self.__mFailureRunId),
+            pluginsToTest, pluginSetupTasks)
+        for pluginInfo, pluginSummary in zip(pluginsToTest, pluginSummaries):
+            testedSummaries[_getPluginKey(pluginInfo)] = pluginSummary
+        for pluginInfo in plugins:
+            pluginKey = _getPluginKey(pluginInfo)
+            pluginSummary = testedSummaries.get(pluginKey, dict())
+            if isinstance(pluginSummary, dict) and len(reusedSummaries[pluginKey]) > 0:
+                for storedSummary in reusedSummaries[pluginKey].values():
+                    pluginSummary.update(storedSummary)
+                pluginSummary['ReusedTests'] = list(reusedSummaries[pluginKey])
+            if isinstance(pluginSummary, dict) and Tracer.getDefault().isEnabled():
+                pluginSummary['StageDurations'] = Tracer.getDefault().getStageDurations(Package=pluginKey[0],
+                                                                                        DSN=pluginKey[1])
+            outPluginSummaries[pluginKey] = pluginSummary
+        return True
+
+    def getSummary(self):
+        """
+        Returns the combined summary of the batches run. `CoreSetup` failed if any Core could not be set up,
+        and `Plugins` is left out if none could
+        """
+        coreSetups = [isCoreSetUp for _, isCoreSetUp in self.__mCores.values()]
+        self.__mSummary['CoreSetup'] = 'Succeed' if all(coreSetups) else 'Failed'
+        if not any(coreSetups):
+            del self.__mSummary['Plugins']
+        if len(self.__mPackageCaches) > 0:
+            statistics = dict()
+            for packageCache in self.__mPackageCaches.values():
+                for name, value in packageCache.getStatistics().items():
+                    statistics[name] = statistics.get(name, 0) + value
+            self.__mSummary['PackageCache'] = statistics
+        return self.__mSummary
+
+
+def _orchestrate(inUserName: str, inPassword: str, inBasePath: str, inputFileName: str, inTestKinds: list,
+                 inWorkerCount: int, inForceRun: bool, inArchiveLogs: bool):
+    classifier = None
+    if TestKind.MetaData in inTestKinds:
+        from MetaTestRunner import MismatchRulesFileName
+        from MismatchClassifier import MismatchClassifier
+        # Ignorable mismatch kinds can be added through the Rules file without any code change
+        classifier = MismatchClassifier.getDefault()
+        rulesFilePath = os.path.join(inBasePath, MismatchRulesFileName)
+        if os.path.exists(rulesFilePath):
+            classifier = MismatchClassifier.fromFile(rulesFilePath)
+            if classifier is None:
+                return None
+    inputErrors = list()
+    hasEntries = False
+    # Entries are read & tested a batch at a time, so that memory does not grow with the number of entries.
+    # MetaTesters of both bitnesses run on one event loop, at most one per worker at once
+    with AsyncMetaTesterExecutor(inWorkerCount) as metaTesterExecutor, \
+            ThreadPoolExecutor(max_workers=inWorkerCount) as executor:
+        run = _Run(inUserName, inPassword, inBasePath, inputFileName, inTestKinds, inForceRun, inArchiveLogs,
+                   classifier, metaTesterExecutor, executor)
+        try:
+            for batch in _iterBatches(ManifestReader(os.path.join(inBasePath, inputFileName)).iterEntries(),
+                                      BatchSize, inputErrors):
+                hasEntries = True
+                if not run.runBatch(batch):
+                    return None
+        finally:
+            run.disconnect()
+    if not hasEntries:
+        if len(inputErrors) == 0:
+            print(f"Error: Invalid Attribute: `{InputReader.Plugin}` or `{InputReader.Compile}`")
+        return None
+    summary = run.getSummary()
+    if len(inputErrors) > 0:
+        # Invalid entries are reported while the valid ones are tested
+        summary['InputErrors'] = inputErrors
+    return summary
+
+
+def main(inUserName: str, inPassword: str, inBasePath: str, inputFileName: str, inTestKinds: list,
+         inWorkerCount: int = 1, inForceRun: bool = False, inTrace: bool = False, inArchiveLogs: bool = False):
+    """
+    Runs the given kinds of tests on all the Plugins of the Input File and writes their combined summary \n
+    :param inTestKinds: Kinds of tests among `TestKind.All`
+    :param inWorkerCount: Number of Plugins tested at once
+    :param inForceRun: If True, every test is run again even if it passed with the same inputs before
+    :param inTrace: If True, the stages are traced to `Trace.json`
+    :param inArchiveLogs: If True, the Logs of every test are compressed into the `LogArchive` of the Base Path
+    """
+    summary = orchestrate(inUserName, inPassword, inBasePath, inputFileName, inTestKinds, inWorkerCount, inForceRun,
+                          os.path.join(inBasePath, Tracer.DefaultFileName) if inTrace else None, inArchiveLogs)
+    if summary is not None and 'Plugins' in summary:
+        with open(os.path.join(inBasePath, SummaryFileName), 'w') as file:
+            json.dump(summary, file)
+    return summary
+
+
+if __name__ == '__main__':
+    # i.e python TestOrchestrator.py username password C:fakepath input.json metadata,ini 4 --force --trace --archive
+    arguments = [argument for argument in sys.argv[1:] if argument not in ['--force', '--trace', '--archive']]
+    testKinds = list()
+    for alias in arguments[4].lower().split(',') if len(arguments) > 4 else ['all']:
+        if alias not in TestKind.Aliases:
+            print(f"Error: Unknown test kind {alias}, it must be one of {list(TestKind.Aliases)}")
+            sys.exit(1)
+        testKinds.extend(TestKind.Aliases[alias])
+    main(arguments[0], arguments[1], arguments[2], arguments[3], testKinds,
+         int(arguments[5]) if len(arguments) > 5 else 1, '--force' in sys.argv[1:], '--trace' in sys.argv[1:],
+         '--archive' in sys.argv[1:])
@@ -0,0 +1,158 @@
+"""
+On-disk index of the queries of the Touchstone SQL Test Sets
+"""
+
+import os
+import sqlite3
+import threading
+import xml.etree.ElementTree as ET
+
+from GenUtility import isNoneOrEmpty
+
+
+class TestSetIndex:
+
+    # Global Variables
+    IndexFileName = 'TestSetIndex.db'
+    TestSetFilePrefix = 'SQL_'
+    TestSetFileExtension = '.xml'
+    SchemaVersion = 1
+    __mQueryCache = dict()
+    __mQueryCacheLock = threading.Lock()
+
+    def __init__(self, inTestSetsDir: str, inIndexPath: str = None):
+        """
+        :param inTestSetsDir: Path to the directory of Touchstone's SQL Test Set files
+        :param inIndexPath: Path to the index, placed in the Test Sets directory if not given
+        """
+        if isNoneOrEmpty(inTestSetsDir):
+            raise ValueError('Invalid Test Sets directory')
+        self.__mTestSetsDir = inTestSetsDir
+        self.__mIndexPath = inIndexPath if inIndexPath is not None \
+            else os.path.join(inTestSetsDir, TestSetIndex.IndexFileName)
+
+    def __connect(self):
+        connection = sqlite3.connect(self.__mIndexPath)
+        # An index of another schema is rebuilt from scratch
+        if connection.execute('PRAGMA user_version').fetchone()[0] != TestSetIndex.SchemaVersion:
+            connection.executescript(f"""
+                DROP TABLE IF EXISTS Files;
+                DROP TABLE IF EXISTS Cases;
+                CREATE TABLE Files (FileName TEXT PRIMARY KEY, MTime INTEGER, Size INTEGER);
+                CREATE TABLE Cases (FileName TEXT, TestSet TEXT, Ordinal INTEGER, Kind TEXT, SQL TEXT);
+                CREATE INDEX CasesByOrdinal ON Cases (Ordinal, FileName);
+                PRAGMA user_version = {TestSetIndex.SchemaVersion};
+            """)
+        return connection
+
+    @staticmethod
+    def _getStatementKind(inSQL: str):
+        """Returns the leading keyword of the statement in upper case. i.e `SELECT`"""
+        words = inSQL.split(None, 1)
+        return words[0].upper() if len(words) > 0 else ''
+
+    @staticmethod
+    def _parseTestSet(inTestSetFilePath: str):
+        """
+        Streams the Test Set file yielding the Test Set name, the position of every test case among the children
+        of `<TestSet>` and the text of its `<SQL>`, without keeping the parsed elements in memory
+        """
+        depth = 0
+        root = None
+        testSetName = None
+        ordinal = 0
+        for event, element in ET.iterparse(inTestSetFilePath, events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                if depth == 1:
+                    root = element
+                    fileName = os.path.basename(inTestSetFilePath)
+                    testSetName = element.get('Name', os.path.splitext(fileName)[0])
+                continue
+            depth -= 1
+            if depth == 1:
+                ordinal += 1
+                sqlElement = element.find('SQL')
+                if sqlElement is not None and sqlElement.text is not None:
+                    yield testSetName, ordinal, sqlElement.text
+                # The test case is dropped from the tree once its query is extracted
+                root.remove(element)
+
+    def refresh(self):
+        """
+        Re-indexes the Test Set files added or changed since they were indexed,
+        detected by their modification time & size, and forgets the removed ones \n
+        :return: Number of re-indexed files if succeeded else None
+        """
+        try:
+            return self.__refresh(self.__scan())
+        except Exception as error:
+            print(f"Error: Test Sets of {self.__mTestSetsDir} could not be indexed. {error}")
+            return None
+
+    def __scan(self):
+        """Returns the modification time & size of every Test Set file by name"""
+        testSetFiles = dict()
+        with os.scandir(self.__mTestSetsDir) as entries:
+            for entry in entries:
+                if entry.name.startswith(TestSetIndex.TestSetFilePrefix) and \
+                        entry.name.endswith(TestSetIndex.TestSetFileExtension) and entry.is_file():
+                    stat = entry.stat()
+                    testSetFiles[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return testSetFiles
+
+    def __refresh(self, testSetFiles: dict):
+        reindexedCount = 0
+        connection = self.__connect()
+        try:
+            with connection:
+                indexedFiles = {fileName: (mTime, size) for fileName, mTime, size
+                                in connection.execute('SELECT FileName, MTime, Size FROM Files')}
+                for fileName in [name for name in indexedFiles if name not in testSetFiles]:
+                    connection.execute('DELETE FROM Cases WHERE FileName = ?', (fileName,))
+                    connection.execute('DELETE FROM Files WHERE FileName = ?', (fileName,))
+                for fileName, fileInfo in testSetFiles.items():
+                    if indexedFiles.get(fileName) == fileInfo:
+                        continue
+                    connection.execute('DELETE FROM Cases WHERE FileName = ?', (fileName,))
+                    connection.executemany(
+                        'INSERT INTO Cases VALUES (?, ?, ?, ?, ?)',
+                        ((fileName, testSetName, ordinal, TestSetIndex._getStatementKind(sql), sql)
+                         for testSetName, ordinal, sql in
+                         TestSetIndex._parseTestSet(os.path.join(self.__mTestSetsDir, fileName))))
+                    connection.execute('INSERT OR REPLACE INTO Files VALUES (?, ?, ?)', (fileName, *fileInfo))
+                    reindexedCount += 1
+        finally:
+            connection.close()
+        return reindexedCount
+
+    def getSelectQueries(self, inQueryCount: int):
+        """
+        Picks the queries containing `select` taking the first test case of every Test Set,
+        then the second ones and so on \n
+        :param inQueryCount: Number of queries required
+        :return: List of at most `inQueryCount` queries if succeeded else None
+        """
+        try:
+            testSetFiles = self.__scan()
+            cacheKey = (os.path.abspath(self.__mTestSetsDir), inQueryCount)
+            with TestSetIndex.__mQueryCacheLock:
+                cachedQueries = TestSetIndex.__mQueryCache.get(cacheKey)
+            # Queries picked earlier in the process are reused while no Test Set file changed
+            if cachedQueries is not None and cachedQueries[0] == testSetFiles:
+                return list(cachedQueries[1])
+            self.__refresh(testSetFiles)
+        except Exception as error:
+            print(f"Error: Test Sets of {self.__mTestSetsDir} could not be indexed. {error}")
+            return None
+        connection = self.__connect()
+        try:
+            # LIKE is case insensitive as the `select` check of the Test Set files
+            selectQueries = [sql for sql, in connection.execute(
+                "SELECT SQL FROM Cases WHERE SQL LIKE '%select%' ORDER BY Ordinal, FileName LIMIT ?",
+                (inQueryCount,))]
+        finally:
+            connection.close()
+        with TestSetIndex.__mQueryCacheLock:
+            TestSetIndex.__mQueryCache[cacheKey] = (testSetFiles, selectQueries)
+        return list(selectQueries)
@@ -0,0 +1,173 @@
+"""
+Nested timed spans around the stages of a run, exported as a Chrome / Perfetto trace
+"""
+
+import json
+import os
+import threading
+import time
+
+from GenUtility import isNoneOrEmpty, createDir
+
+
+class _NoOpSpan:
+    """Span of a disabled Tracer, shared by all the stages so that tracing off costs one call"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, inExcType, inExcValue, inTraceback):
+        return False
+
+    def setTag(self, inKey: str, inValue):
+        pass
+
+
+class _Span:
+
+    def __init__(self, inTracer, inName: str, inTags: dict):
+        self.__mTracer = inTracer
+        self.__mName = inName
+        self.__mTags = inTags
+        self.__mStartNs = None
+
+    def __enter__(self):
+        # Tags of the enclosing span on the same thread, i.e the Plugin, are inherited
+        parent = self.__mTracer._getCurrentSpan()
+        if parent is not None:
+            self.__mTags = dict(parent.getTags(), **self.__mTags)
+        self.__mTracer._pushSpan(self)
+        self.__mStartNs = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, inExcType, inExcValue, inTraceback):
+        durationNs = time.perf_counter_ns() - self.__mStartNs
+        self.__mTracer._popSpan()
+        if inExcType is not None:
+            self.__mTags['Error'] = repr(inExcValue)
+        self.__mTracer._record(self.__mName, self.__mStartNs, durationNs, self.__mTags)
+        return False
+
+    def getTags(self):
+        return self.__mTags
+
+    def setTag(self, inKey: str, inValue):
+        """Tags the span with an outcome known only once the stage ran, i.e its Status"""
+        self.__mTags[inKey] = inValue
+
+
+class Tracer:
+
+    # Global Variables
+    DefaultFileName = 'Trace.json'
+    __mNoOpSpan = _NoOpSpan()
+    __mDefault = None
+    __mDefaultLock = threading.Lock()
+
+    def __init__(self, inEnabled: bool = True):
+        """
+        :param inEnabled: If False, spans are neither timed nor recorded
+        """
+        self.__mEnabled = inEnabled
+        self.__mLock = threading.Lock()
+        self.__mLocal = threading.local()
+        self.__mSpans = list()
+        self.__mThreadNames = dict()
+
+    def isEnabled(self):
+        return self.__mEnabled
+
+    def span(self, inName: str, **inTags):
+        """
+        Returns a context manager timing the stage it encloses. i.e
+        `with Tracer.getDefault().span('Extract', Package=path): ...` \n
+        :param inName: Name of the stage
+        :param inTags: Tags of the span in Key Value pair, i.e Package, DSN & Bit
+        """
+        if not self.__mEnabled:
+            return Tracer.__mNoOpSpan
+        return _Span(self, inName, inTags)
+
+    def _getCurrentSpan(self):
+        stack = getattr(self.__mLocal, 'stack', None)
+        return stack[-1] if stack else None
+
+    def _pushSpan(self, inSpan: _Span):
+        if not hasattr(self.__mLocal, 'stack'):
+            self.__mLocal.stack = list()
+        self.__mLocal.stack.append(inSpan)
+
+    def _popSpan(self):
+        self.__mLocal.stack.pop()
+
+    def _record(self, inName: str, inStartNs: int, inDurationNs: int, inTags: dict):
+        thread = threading.current_thread()
+        with self.__mLock:
+            self.__mThreadNames[thread.ident] = thread.name
+            self.__mSpans.append({'Name': inName, 'StartNs': inStartNs, 'DurationNs': inDurationNs,
+                                  'ThreadId': thread.ident, 'Tags': dict(inTags)})
+
+    def getSpans(self):
+        """Returns the completed spans in order of completion"""
+        with self.__mLock:
+            return list(self.__mSpans)
+
+    def getStageDurations(self, **inTags):
+        """
+        Sums the durations of the spans of every stage carrying all the given tags \n
+        :param inTags: Tags to filter the spans with, i.e `Package=path`
+        :return: Duration in seconds of every stage in Key Value pair
+        """
+        durations = dict()
+        for span in self.getSpans():
+            if all(span['Tags'].get(key) == value for key, value in inTags.items()):
+                durations[span['Name']] = durations.get(span['Name'], 0) + span['DurationNs']
+        return {name: round(durationNs / 1e9, 3) for name, durationNs in durations.items()}
+
+    def exportChromeTrace(self, inTraceFilePath: str):
+        """
+        Writes the spans in the Trace Event Format, to be opened in `chrome://tracing` or `ui.perfetto.dev` \n
+        :param inTraceFilePath: Path to the trace
+        :return: True if succeeded else False
+        """
+        if isNoneOrEmpty(inTraceFilePath):
+            print('Error: Invalid Parameter')
+            return False
+        processId = os.getpid()
+        spans = self.getSpans()
+        with self.__mLock:
+            threadNames = dict(self.__mThreadNames)
+        originNs = min((span['StartNs'] for span in spans), default=0)
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': processId, 'tid': threadId, 'args': {'name': threadName}}
+                  for threadId, threadName in threadNames.items()]
+        # Complete events nest by their time ranges on every thread
+        events.extend({'name': span['Name'], 'cat': 'Stage', 'ph': 'X', 'pid': processId, 'tid': span['ThreadId'],
+                       'ts': (span['StartNs'] - originNs) / 1000, 'dur': span['DurationNs'] / 1000,
+                       'args': {key: str(value) for key, value in span['Tags'].items()}}
+                      for span in spans)
+        try:
+            traceFileDir = os.path.dirname(os.path.abspath(inTraceFilePath))
+            createDir(traceFileDir)
+            with open(inTraceFilePath, 'w') as file:
+                json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)
+            return True
+        except Exception as error:
+            print(f"Error: {error}")
+            return False
+
+    @staticmethod
+    def getDefault():
+        """Returns the Tracer shared by all the stages of the process, disabled unless one was set"""
+        with Tracer.__mDefaultLock:
+            if Tracer.__mDefault is None:
+                Tracer.__mDefault = Tracer(False)
+            return Tracer.__mDefault
+
+    @staticmethod
+    def setDefault(inTracer):
+        """
+        Sets the Tracer shared by all the stages of the process \n
+        :param inTracer: Tracer to share, a disabled one if None
+        """
+        with Tracer.__mDefaultLock:
+            Tracer.__mDefault = inTracer if inTracer is not None else Tracer(False)
@@ -0,0 +1,92 @@
+"""
+Parallel extraction of Zip archives
+"""
+
+import os
+import shutil
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from GenUtility import isNoneOrEmpty, createDir
+
+
+class ZipExtractor:
+
+    # Global Variables
+    DefaultWorkerCount = min(8, os.cpu_count() or 1)
+    CopyChunkSize = 1024 * 1024
+
+    @staticmethod
+    def _getTargetPath(inMemberName: str, inDestination: str):
+        """Returns the path to extract the member at, ignoring drive letters, `.` and `..` components"""
+        memberName = inMemberName.replace('/', os.path.sep)
+        if os.path.altsep:
+            memberName = memberName.replace(os.path.altsep, os.path.sep)
+        memberName = os.path.splitdrive(memberName)[1]
+        invalidPathParts = ('', os.path.curdir, os.path.pardir)
+        memberName = os.path.sep.join(part for part in memberName.split(os.path.sep) if part not in invalidPathParts)
+        return os.path.join(inDestination, memberName)
+
+    @staticmethod
+    def _extractMembers(inArchivePath: str, inMembers: list, inDestination: str):
+        # Every worker reads the archive through its own handle so that reads never wait on each other
+        with zipfile.ZipFile(inArchivePath) as archive:
+            for member in inMembers:
+                targetPath = ZipExtractor._getTargetPath(member.filename, inDestination)
+                # Removed first so that a file hard linked by an overlay is replaced instead of written through,
+                # which would change the linked Core file & every other Plugin's copy of it
+                if os.path.lexists(targetPath):
+                    os.remove(targetPath)
+                # ZipExtFile verifies the CRC-32 of the member once it is read to the end
+                # and raises `BadZipFile` on mismatch
+                with archive.open(member) as memberFile, open(targetPath, 'wb') as targetFile:
+                    shutil.copyfileobj(memberFile, targetFile, ZipExtractor.CopyChunkSize)
+                # Keeps the archived modification time so that re-extracting an unchanged archive
+                # does not make the extracted files look changed
+                modifiedTime = time.mktime(member.date_time + (0, 0, -1))
+                os.utime(targetPath, (modifiedTime, modifiedTime))
+
+    @staticmethod
+    def extract(inArchivePath: str, inDestination: str, inWorkerCount: int = DefaultWorkerCount):
+        """
+        Extracts the archive straight from its location, decompressing its members on a pool of workers \n
+        :param inArchivePath: Path to the Zip archive, local or on a share
+        :param inDestination: Path to extract the archive at
+        :param inWorkerCount: Number of members decompressed concurrently
+        :return: True if succeeded else False
+        """
+        if isNoneOrEmpty(inArchivePath, inDestination) or inWorkerCount is None or inWorkerCount < 1:
+            print('Error: Invalid Parameters')
+            return False
+        try:
+            # Only the central directory is read here
+            with zipfile.ZipFile(inArchivePath) as archive:
+                members = archive.infolist()
+
+            # Directories are created upfront so that workers never race on creating them
+            directories = {inDestination}
+            for member in members:
+                targetPath = ZipExtractor._getTargetPath(member.filename, inDestination)
+                directories.add(targetPath if member.is_dir() else os.path.dirname(targetPath))
+            for directory in sorted(directories):
+                createDir(directory)
+
+            # Members are spread across the workers balancing their uncompressed sizes
+            batches = [list() for _ in range(min(inWorkerCount, max(len(members), 1)))]
+            batchSizes = [0] * len(batches)
+            for member in sorted((member for member in members if not member.is_dir()),
+                                 key=lambda info: info.file_size, reverse=True):
+                batchIndex = batchSizes.index(min(batchSizes))
+                batches[batchIndex].append(member)
+                batchSizes[batchIndex] += member.file_size
+
+            with ThreadPoolExecutor(max_workers=len(batches)) as executor:
+                futures = [executor.submit(ZipExtractor._extractMembers, inArchivePath, batch, inDestination)
+                           for batch in batches if len(batch) > 0]
+                for future in futures:
+                    future.result()
+            return True
+        except Exception as error:
+            print(f"Error: {inArchivePath} could not be extracted. {error}")
+            return False
@@ -0,0 +1,46 @@
+import json
+
+from ConfigurationStore import ConfigurationStore, FileConfigurationStore
+
+DataSourceKeyPath = f"{ConfigurationStore.ODBCIni}\\Simba Benchmark"
+
+
+def test_only_changed_values_are_written(tmp_path):
+    store = FileConfigurationStore(str(tmp_path / 'Store' / ConfigurationStore.DefaultFileName))
+
+    assert store.setValues(DataSourceKeyPath, {'Host': 'localhost', 'Port': '9047'}, 64)
+    assert store.setValues(DataSourceKeyPath, {'Host': 'localhost', 'Port': '9048'}, 64)
+    assert store.setValues(DataSourceKeyPath, {'Host': 'localhost'}, 64)
+
+    assert store.getValues(DataSourceKeyPath, 64) == {'Host': 'localhost', 'Port': '9048'}
+    assert store.getStatistics() == {'Reads': 4, 'Writes': 3, 'Batches': 2, 'Unchanged': 2}
+
+
+def test_names_are_case_insensitive_and_views_are_apart(tmp_path):
+    store = FileConfigurationStore(str(tmp_path / ConfigurationStore.DefaultFileName))
+    assert store.setValues(DataSourceKeyPath, {'Host': 'localhost'}, 64)
+
+    assert store.setValues(DataSourceKeyPath.upper(), {'HOST': 'remote'}, 64)
+    assert store.getValues(DataSourceKeyPath, 64) == {'HOST': 'remote'}
+    # The 32-bit view holds the values of the 32-bit Drivers only
+    assert store.getValues(DataSourceKeyPath, 32) == dict()
+    assert store.setValues(DataSourceKeyPath, {'Host': 'localhost'}, 32)
+    assert store.getValues(DataSourceKeyPath, 64) == {'HOST': 'remote'}
+
+
+def test_values_are_kept_in_the_file(tmp_path):
+    filePath = tmp_path / ConfigurationStore.DefaultFileName
+    assert FileConfigurationStore(str(filePath)).setValues(DataSourceKeyPath, {'Host': 'localhost'}, 64)
+
+    assert json.loads(filePath.read_text()) == {'64': {DataSourceKeyPath.lower(): {'Host': 'localhost'}}}
+    assert not (tmp_path / f"{ConfigurationStore.DefaultFileName}.tmp").exists()
+    assert FileConfigurationStore(str(filePath)).getValues(DataSourceKeyPath, 64) == {'Host': 'localhost'}
+
+
+def test_invalid_arguments_are_refused(tmp_path):
+    store = FileConfigurationStore(str(tmp_path / ConfigurationStore.DefaultFileName))
+
+    assert not store.setValues(DataSourceKeyPath, {'Host': 'localhost'}, 16)
+    assert not store.setValues(DataSourceKeyPath, dict(), 64)
+    assert store.getStatistics()['Reads'] == 0
+    assert not (tmp_path / ConfigurationStore.DefaultFileName).exists()
@@ -0,0 +1,54 @@
+import json
+import os
+
+from DistributedRunner import Coordinator, runLocal, simulateJob
+from Input import InputReader
+
+
+def _writeInputFile(inDir, inPluginCount: int):
+    inputFilePath = os.path.join(inDir, 'input.json')
+    with open(inputFilePath, 'w') as file:
+        json.dump({InputReader.RemoteMachineAddress: 'localhost',
+                   InputReader.Core: {InputReader.SourcePath: os.path.join(inDir, 'Core_64.zip'),
+                                      InputReader.DestPath: os.path.join(inDir, 'Core'),
+                                      InputReader.Branch: 'master', InputReader.ForceUpdate: False},
+                   InputReader.Plugin: {InputReader.Compile: [
+                       {InputReader.SourcePath: os.path.join(inDir, f"Plugin{index}_64.zip"),
+                        InputReader.DestPath: os.path.join(inDir, f"Plugin{index}"), InputReader.Brand: 'Simba',
+                        InputReader.DataSourceConfiguration: {'Host': 'localhost'},
+                        InputReader.WaitForUserToSetupDSN: False, InputReader.ForceUpdate: False}
+                       for index in range(inPluginCount)]}}, file)
+    return inputFilePath
+
+
+def _dieOnFirstAttempt(inJob: dict, inBasePath: str):
+    # The worker process is killed while running the first job, dropping its connection
+    if inJob['JobId'] == 'Job0' and inJob['Attempt'] == 1:
+        os._exit(1)
+    return simulateJob(inJob, inBasePath)
+
+
+def test_job_of_a_killed_worker_is_run_by_another_worker(tmp_path):
+    inputFilePath = _writeInputFile(str(tmp_path), 3)
+
+    summary = runLocal(inputFilePath, str(tmp_path / 'Output'), 2, _dieOnFirstAttempt)
+
+    assert summary['RequeuedJobs'] == 1
+    assert summary['Jobs']['Job0']['Attempts'] == 2
+    assert all(job['Summary']['MetaDataTest'] == 'Succeed' for job in summary['Jobs'].values())
+    # The streamed Logs of every job are written by the coordinator
+    assert all(os.path.isfile(job['Summary']['MetaDataTestLogs']) for job in summary['Jobs'].values())
+    assert sum(worker['Jobs'] for worker in summary['Workers'].values()) == 3
+
+
+def test_workers_without_the_token_are_rejected(tmp_path):
+    coordinator = Coordinator(_writeInputFile(str(tmp_path), 1), str(tmp_path / 'Output'), inToken='secret')
+
+    assert coordinator.getAddress()[0] == '127.0.0.1'
+    assert coordinator._handleMessage('Worker', {'Type': Coordinator.Request})['Type'] == Coordinator.Rejected
+    assert coordinator._handleMessage('Worker', {'Type': Coordinator.Register})['Type'] == Coordinator.Rejected
+    assert coordinator._handleMessage('Worker', {'Type': Coordinator.Register, 'Token': 'guess'})['Type'] == \
+        Coordinator.Rejected
+    assert coordinator._handleMessage('Worker', {'Type': Coordinator.Register, 'Token': 'secret'})['Type'] == \
+        Coordinator.Ack
+    assert coordinator._handleMessage('Worker', {'Type': Coordinator.Request})['Type'] == Coordinator.Job
@@ -0,0 +1,38 @@
+import time
+
+from FailureStore import FailureStore
+from MismatchClassifier import MismatchVerdict
+
+Plugin = 'Z:\\Dremio\\Dremio_64.zip'
+
+
+def _getTable(inTableName: str, inVerdicts: list):
+    return inTableName, [{'ColumnNumber': number, 'ColumnName': f"COLUMN_{number}", 'TypeName': 'VARCHAR',
+                          'MismatchKind': 'ColumnSize', 'Rule': None, 'FirstApi': 'SQLColumns',
+                          'SecondApi': 'SQLDescribeCol', 'Verdict': verdict, 'Line': 'Column size mismatch'}
+                         for number, verdict in enumerate(inVerdicts, 1)]
+
+
+def test_regressions_are_found_per_dsn(tmp_path):
+    failureStore = FailureStore(str(tmp_path / FailureStore.DefaultFileName))
+    # Both entries of the Package pass, then the second one alone fails
+    runId = failureStore.beginRun()
+    for dataSourceName in ['Simba Dremio_64', 'Simba Dremio_64 2']:
+        failureStore.record(runId, Plugin, 'Simba', dataSourceName, [_getTable('SCHEMA.TABLE_1', []),
+                                                                     _getTable('SCHEMA.TABLE_2', [])])
+    since = time.time()
+    failingRunId = failureStore.beginRun()
+    failureStore.record(failingRunId, Plugin, 'Simba', 'Simba Dremio_64 2',
+                        [_getTable('SCHEMA.TABLE_1', [MismatchVerdict.Critical, MismatchVerdict.Checked]),
+                         _getTable('SCHEMA.TABLE_2', [MismatchVerdict.Checked])])
+    # The first entry passing again later does not hide the regression of the second one
+    failureStore.record(failureStore.beginRun(), Plugin, 'Simba', 'Simba Dremio_64', [_getTable('SCHEMA.TABLE_1', [])])
+    # A DSN which never passed before has not regressed
+    failureStore.record(failingRunId, Plugin, 'Simba', 'Simba Dremio_64 3',
+                        [_getTable('SCHEMA.TABLE_1', [MismatchVerdict.Critical])])
+
+    assert failureStore.getRegressedTables(since) == [
+        {'Plugin': Plugin, 'Brand': 'Simba', 'DSN': 'Simba Dremio_64 2', 'TableName': 'SCHEMA.TABLE_1',
+         'RunId': failingRunId, 'CriticalCount': 1, 'PassedRunId': runId}]
+    assert failureStore.getRegressedTables(since, 'Magnitude') == []
+    assert failureStore.getRegressedTables(time.time() + 60) == []
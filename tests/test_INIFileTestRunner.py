@@ -0,0 +1,18 @@
+from INIFileTestRunner import INIFileTester, _runINIFileTest
+from Packages import Plugin
+
+
+def test_probe_is_given_the_plugin_time_out(tmp_path, monkeypatch):
+    probeTimeOuts = list()
+    monkeypatch.setattr(INIFileTester, '_setupDriverConfigurationsInRegistry', lambda *arguments: True)
+    monkeypatch.setattr(INIFileTester, 'probe', lambda inDSN, inDriverBit, inMetaTesterDir, inLogsPath,
+                        inTimeOut, inExecutor=None: probeTimeOuts.append(inTimeOut) is None)
+    pluginInfo = Plugin(str(tmp_path / 'Bench_64.zip'), str(tmp_path / 'Plugin'), 'Simba', {'Host': 'localhost'},
+                        False, False, 42)
+    # The Plugin is not set up here, only the arguments given to MetaTester are checked
+    pluginInfo.getLogFilePath = lambda inLogName: str(tmp_path / f"{inLogName}.txt")
+
+    testSummary = _runINIFileTest(pluginInfo, str(tmp_path))
+
+    assert testSummary['INIFileTest'] == 'Succeed'
+    assert probeTimeOuts == [42]
@@ -0,0 +1,22 @@
+from Input import InputReader, expandMatrix
+
+
+def test_only_axis_placeholders_are_replaced():
+    matrixEntry = {
+        InputReader.Matrix: {'Bit': [32, 64], 'Plugin': ['Dremio']},
+        InputReader.Plugin: {InputReader.SourcePath: 'Z:\\{Plugin}\\{Plugin}_{Bit}.zip',
+                             InputReader.DataSourceConfiguration: {'Driver': '{ODBC Driver {Bit}}',
+                                                                   'PWD': 'p{a}ss}{', 'Filter': '{{Bit}}'}},
+        InputReader.Core: {InputReader.DestPath: 'C:\\Core_{Bit}'}
+    }
+
+    combinations = list(expandMatrix(matrixEntry))
+
+    assert [error for _, _, _, error in combinations] == [None, None]
+    values, pluginEntry, coreEntry, _ = combinations[1]
+    assert values == {'Bit': 64, 'Plugin': 'Dremio'}
+    assert pluginEntry[InputReader.SourcePath] == 'Z:\\Dremio\\Dremio_64.zip'
+    # Braces of the values which are not placeholders of an axis are kept as they are
+    assert pluginEntry[InputReader.DataSourceConfiguration] == {'Driver': '{ODBC Driver 64}', 'PWD': 'p{a}ss}{',
+                                                                'Filter': '{64}'}
+    assert coreEntry == {InputReader.DestPath: 'C:\\Core_64'}
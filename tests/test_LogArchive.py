@@ -0,0 +1,76 @@
+import os
+import sqlite3
+
+from LogArchive import LogArchive
+
+
+def _writeLog(inDir: str, inTables: dict):
+    logFilePath = os.path.join(inDir, 'MetaTesterLogs.txt')
+    with open(logFilePath, 'w') as logFile:
+        for tableName, lines in inTables.items():
+            logFile.write(f"{LogArchive.TableLinePrefix}{tableName}\n")
+            logFile.writelines(f"{line}\n" for line in lines)
+    return logFilePath
+
+
+def _archive(inDir: str, inTables: dict, inMonkeyPatch):
+    # Small blocks so that a few hundred lines span several of them
+    inMonkeyPatch.setattr(LogArchive, 'BlockSize', 256)
+    inMonkeyPatch.setattr(LogArchive, 'MaxBlockSize', 1024)
+    logArchive = LogArchive(os.path.join(inDir, LogArchive.DefaultDirName))
+    logId = logArchive.archive(_writeLog(inDir, inTables), logArchive.beginRun(), 'Bench_64.zip', 'Simba Bench_64',
+                               'MetaTesterLogs')
+    return logArchive, logId
+
+
+def _getBlockCount(inDir: str, inLogId: int):
+    connection = sqlite3.connect(os.path.join(inDir, LogArchive.DefaultDirName, LogArchive.IndexFileName))
+    try:
+        return connection.execute('SELECT COUNT(*) FROM Blocks WHERE LogId = ?', (inLogId,)).fetchone()[0]
+    finally:
+        connection.close()
+
+
+def test_table_split_over_several_blocks_is_read_whole(tmp_path, monkeypatch):
+    tables = {'SCHEMA.SMALL': ['Column ID matches'],
+              'SCHEMA.LARGE': [f"Column COLUMN_{index} matches" for index in range(200)],
+              'SCHEMA.LAST': ['Column NAME matches']}
+    logArchive, logId = _archive(str(tmp_path), tables, monkeypatch)
+
+    # The large table alone is past `MaxBlockSize`, so it is cut within the table
+    assert _getBlockCount(str(tmp_path), logId) > 3
+    assert logArchive.getTableLog(logId, 'SCHEMA.LARGE') == \
+        [f"{LogArchive.TableLinePrefix}SCHEMA.LARGE"] + tables['SCHEMA.LARGE']
+    assert logArchive.getTableLog(logId, 'SCHEMA.LAST') == [f"{LogArchive.TableLinePrefix}SCHEMA.LAST"] + \
+        tables['SCHEMA.LAST']
+    assert logArchive.getTableLog(logId, 'SCHEMA.MISSING') is None
+
+
+def test_blocks_ruled_out_by_their_bloom_filter_are_not_read(tmp_path, monkeypatch):
+    tables = {f"SCHEMA.TABLE_{tableIndex}": [f"Column COLUMN_{index} matches" for index in range(20)]
+              for tableIndex in range(10)}
+    tables['SCHEMA.TABLE_7'][3] = 'Column COLUMN_3 size mismatch: expected 10 got 12'
+    logArchive, logId = _archive(str(tmp_path), tables, monkeypatch)
+
+    matches = list(logArchive.grep('SIZE MISMATCH', True))
+
+    assert [(match['LogId'], match['Text']) for match in matches] == \
+        [(logId, 'Column COLUMN_3 size mismatch: expected 10 got 12')]
+    # Table 7 is the 8th of 21 lines each, its 4th line following its title
+    assert matches[0]['Line'] == 7 * 21 + 5
+    statistics = logArchive.getStatistics()
+    assert statistics['BlocksScanned'] + statistics['BlocksSkipped'] == _getBlockCount(str(tmp_path), logId)
+    assert statistics['BlocksSkipped'] > statistics['BlocksScanned']
+
+
+def test_patterns_shorter_than_a_trigram_search_every_block(tmp_path, monkeypatch):
+    tables = {f"SCHEMA.TABLE_{tableIndex}": [f"Column COLUMN_{index} matches" for index in range(20)]
+              for tableIndex in range(10)}
+    tables['SCHEMA.TABLE_9'][0] = 'Column COLUMN_0 is Qz'
+    logArchive, logId = _archive(str(tmp_path), tables, monkeypatch)
+
+    assert [match['Text'] for match in logArchive.grep('Qz')] == ['Column COLUMN_0 is Qz']
+    assert [match['Text'] for match in logArchive.grep('z', True)] == ['Column COLUMN_0 is Qz']
+    statistics = logArchive.getStatistics()
+    assert statistics['BlocksSkipped'] == 0
+    assert statistics['BlocksScanned'] == 2 * _getBlockCount(str(tmp_path), logId)
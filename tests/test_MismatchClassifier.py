@@ -0,0 +1,59 @@
+import json
+import os
+
+from MismatchClassifier import MismatchClassifier, MismatchVerdict
+
+
+def test_equals_rule_matches_only_if_its_other_conditions_hold():
+    classifier = MismatchClassifier.fromConfig({
+        MismatchClassifier.DefaultVerdict: MismatchVerdict.Critical,
+        MismatchClassifier.Rules: [
+            {MismatchClassifier.Name: 'EqualsAndContains', MismatchClassifier.Equals: 'Verifying SQLPreare',
+             MismatchClassifier.Contains: ['SQLColumns'], MismatchClassifier.Verdict: MismatchVerdict.Checked},
+            {MismatchClassifier.Name: 'EqualsAndPattern', MismatchClassifier.Equals: 'Verifying SQLPreare',
+             MismatchClassifier.Pattern: '^Skipped', MismatchClassifier.Verdict: MismatchVerdict.Checked},
+            {MismatchClassifier.Name: 'EqualsOnly', MismatchClassifier.Equals: 'Done validating',
+             MismatchClassifier.Contains: [['validating', 'checking']], MismatchClassifier.Pattern: '^Done'},
+        ]
+    })
+
+    # Neither Rule's `Contains` nor `Pattern` holds for the line, so it gets the Default Verdict
+    rule, verdict, _ = classifier.classify('Verifying SQLPreare', '')
+    assert rule is None and verdict == MismatchVerdict.Critical
+    rule, verdict, _ = classifier.classify('Done validating', '')
+    assert rule.getName() == 'EqualsOnly' and verdict is None
+    rule, _, _ = classifier.classify('Done validating columns', '')
+    assert rule is None
+
+
+def test_first_matching_rule_decides_the_verdict():
+    classifier = MismatchClassifier.getDefault()
+
+    assert classifier.classify('Verifying SQLPreare', '')[0].getName() == 'PrepareMarker'
+    assert classifier.classify('Column: 3 Name: Modified Type Name: TIMESTAMP', '')[2] == 'TIMESTAMP'
+    assert classifier.classify('Type name mismatch: SQLColumns: TIMESTAMP SQLGetTypeInfo: TIMESTAMP',
+                               'TIMESTAMP')[1] == MismatchVerdict.Checked
+    assert classifier.classify('Type name mismatch: SQLColumns: VARCHAR SQLGetTypeInfo: WVARCHAR',
+                               'TIMESTAMP')[1] == MismatchVerdict.Critical
+    assert classifier.classify('Unsigned mismatch: SQLColumns: 1 SQLColAttribute: 0', '')[1] == \
+        MismatchVerdict.Checked
+    assert classifier.classify('Column size mismatch: SQLColumns: 255', '') == (None, MismatchVerdict.Critical, '')
+
+
+def test_rules_file_is_compiled_again_only_once_modified(tmp_path):
+    rulesFilePath = tmp_path / 'MismatchRules.json'
+    rulesFilePath.write_text(json.dumps({MismatchClassifier.Rules: [
+        {MismatchClassifier.Name: 'Unsigned', MismatchClassifier.Contains: ['Unsigned mismatch']}]}))
+
+    classifier = MismatchClassifier.fromFile(str(rulesFilePath))
+    assert MismatchClassifier.fromFile(str(rulesFilePath)) is classifier
+
+    rulesFilePath.write_text(json.dumps({MismatchClassifier.Rules: [
+        {MismatchClassifier.Name: 'Size', MismatchClassifier.Contains: ['Column size mismatch']}]}))
+    os.utime(rulesFilePath, ns=(0, os.stat(rulesFilePath).st_mtime_ns + 1))
+    modifiedClassifier = MismatchClassifier.fromFile(str(rulesFilePath))
+    assert modifiedClassifier is not classifier
+    assert modifiedClassifier.classify('Column size mismatch: SQLColumns: 255', '')[0].getName() == 'Size'
+
+    rulesFilePath.write_text('{')
+    assert MismatchClassifier.fromFile(str(rulesFilePath)) is None
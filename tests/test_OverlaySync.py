@@ -0,0 +1,59 @@
+import os
+
+from Benchmark import CoreBranch, PluginName, _writeZip
+from Packages import Core, Plugin
+
+CoreODBCPath = f"Core/{CoreBranch}/ODBC"
+INIPath = 'lib/CoreBranding/Simba/Setup/rdf.rdfodbc.ini'
+
+
+def _setUp(inDir):
+    _writeZip(os.path.join(inDir, 'Source', 'Core.zip'),
+              {f"{CoreODBCPath}/{INIPath}": b'CORE-INI', f"{CoreODBCPath}/lib/core.dll": b'CORE',
+               f"{CoreODBCPath}/ThirdParty/thirdparty.dll": b'THIRDPARTY'}, 0, 0)
+    _writeZip(os.path.join(inDir, 'Source', f"{PluginName}_64.zip"),
+              {f"Branding/Simba/{PluginName}ODBC.did": b'<DID/>', INIPath: b'PLUGIN-INI', 'lib/plugin.dll': b'PLUGIN'},
+              0, 1)
+    coreInfo = Core(os.path.join(inDir, 'Source', 'Core.zip'), os.path.join(inDir, 'Core'), CoreBranch, True)
+    pluginInfo = Plugin(os.path.join(inDir, 'Source', f"{PluginName}_64.zip"), os.path.join(inDir, 'Plugin'),
+                        'Simba', {'Host': 'localhost'}, False, True)
+    assert coreInfo.download() and pluginInfo.download() and pluginInfo.overlay(coreInfo)
+    return coreInfo, pluginInfo
+
+
+def _read(inPath):
+    with open(inPath, 'rb') as file:
+        return file.read()
+
+
+def test_shipped_files_are_copied_and_the_others_linked(tmp_path):
+    coreInfo, pluginInfo = _setUp(str(tmp_path))
+    coreLibPath = os.path.join(coreInfo.getDestinationPath(), CoreODBCPath, 'lib')
+    pluginLibPath = os.path.join(pluginInfo.getDestinationPath(), 'lib')
+    assert not os.path.samefile(os.path.join(coreLibPath, 'CoreBranding', 'Simba', 'Setup', 'rdf.rdfodbc.ini'),
+                                os.path.join(pluginLibPath, 'CoreBranding', 'Simba', 'Setup', 'rdf.rdfodbc.ini'))
+    assert os.path.samefile(os.path.join(coreLibPath, 'core.dll'), os.path.join(pluginLibPath, 'core.dll'))
+
+
+def test_extracting_again_leaves_core_unchanged(tmp_path):
+    coreInfo, pluginInfo = _setUp(str(tmp_path))
+    coreINIPath = os.path.join(coreInfo.getDestinationPath(), CoreODBCPath, INIPath)
+    pluginINIPath = os.path.join(pluginInfo.getDestinationPath(), INIPath)
+    # Forced updates extract the Plugin again over its overlaid files
+    assert pluginInfo.download()
+    assert _read(coreINIPath) == b'CORE-INI'
+    assert _read(pluginINIPath) == b'PLUGIN-INI'
+    assert pluginInfo.overlay(coreInfo)
+    assert _read(pluginINIPath) == b'CORE-INI'
+    assert _read(coreINIPath) == b'CORE-INI'
+
+
+def test_extracting_again_replaces_linked_files(tmp_path):
+    coreInfo, pluginInfo = _setUp(str(tmp_path))
+    coreDLLPath = os.path.join(coreInfo.getDestinationPath(), CoreODBCPath, 'lib', 'core.dll')
+    pluginDLLPath = os.path.join(pluginInfo.getDestinationPath(), 'lib', 'core.dll')
+    assert os.path.samefile(coreDLLPath, pluginDLLPath)
+    # A Core extracted again over its linked files must not write through to the Plugin's links either
+    assert coreInfo.download()
+    assert not os.path.samefile(coreDLLPath, pluginDLLPath)
+    assert _read(pluginDLLPath) == b'CORE'
@@ -0,0 +1,31 @@
+import os
+
+from Benchmark import CoreBranch, generateCore, generatePlugin
+from PackageCache import PackageCache
+from Packages import Core, Plugin
+
+
+def test_fetched_archives_are_not_evicted_before_they_are_extracted(tmp_path):
+    corePath = generateCore(str(tmp_path / 'Source'), 2, 1024)
+    pluginPath = generatePlugin(str(tmp_path / 'Source'), 2, 1024)
+    coreInfo = Core(corePath, str(tmp_path / 'Core'), CoreBranch)
+    pluginInfo = Plugin(pluginPath, str(tmp_path / 'Plugin'), 'Simba', {'Host': 'localhost'})
+    # The quota holds only one of both archives
+    packageCache = PackageCache(str(tmp_path / 'Cache'), max(os.path.getsize(corePath), os.path.getsize(pluginPath)))
+
+    coreArchivePath = coreInfo.fetch(packageCache)
+    pluginArchivePath = pluginInfo.fetch(packageCache)
+
+    assert os.path.exists(coreArchivePath) and os.path.exists(pluginArchivePath)
+    assert coreInfo.extract(coreArchivePath) and pluginInfo.extract(pluginArchivePath)
+    assert packageCache.getStatistics()['Evictions'] == 0
+    coreInfo.releaseArchive(coreArchivePath, packageCache)
+    pluginInfo.releaseArchive(pluginArchivePath, packageCache)
+
+    # Once released, the least recently used archive is evicted by the next miss
+    otherPluginPath = generatePlugin(str(tmp_path / 'Other'), 2, 1024, inSeed=2)
+    otherArchivePath = packageCache.fetch(otherPluginPath)
+    assert os.path.exists(otherArchivePath)
+    assert not os.path.exists(coreArchivePath)
+    assert packageCache.getStatistics()['Evictions'] >= 1
+    packageCache.release(otherArchivePath)
@@ -0,0 +1,46 @@
+import os
+
+from Benchmark import CoreBranch, generateCore, generatePlugin
+from Packages import Core, Plugin
+from ResultStore import ResultStore
+
+
+def _createPlugins(inDir: str):
+    coreInfo = Core(generateCore(os.path.join(inDir, 'Source'), 2, 16), os.path.join(inDir, 'Core'), CoreBranch)
+    pluginPath = generatePlugin(os.path.join(inDir, 'Source'), 2, 16)
+    plugins = [Plugin(pluginPath, os.path.join(inDir, 'Plugin'), 'Simba', {'Host': host}) for host in ['good', 'bad']]
+    Plugin.assignUniqueDataSourceNames(plugins)
+    return coreInfo, plugins
+
+
+def test_entries_of_one_package_are_recorded_apart(tmp_path):
+    coreInfo, plugins = _createPlugins(str(tmp_path))
+    resultStore = ResultStore(str(tmp_path / ResultStore.DefaultFileName))
+    fingerprints = [ResultStore.getPluginFingerprint(ResultStore.MetaDataTest, pluginInfo, coreInfo, str(tmp_path))
+                    for pluginInfo in plugins]
+    assert fingerprints[0] != fingerprints[1]
+
+    goodPlugin, badPlugin = plugins
+    resultStore.record(ResultStore.MetaDataTest, goodPlugin.getSourcePath(), goodPlugin.getDataSourceName(),
+                       fingerprints[0], {'MetaDataTest': 'Succeed'})
+    assert resultStore.lookup(ResultStore.MetaDataTest, badPlugin.getSourcePath(), badPlugin.getDataSourceName(),
+                              fingerprints[1]) is None
+    # The store read again keeps the first entry's result
+    reloadedStore = ResultStore(str(tmp_path / ResultStore.DefaultFileName))
+    assert reloadedStore.lookup(ResultStore.MetaDataTest, goodPlugin.getSourcePath(), goodPlugin.getDataSourceName(),
+                                fingerprints[0]) == {'MetaDataTest': 'Succeed'}
+
+
+def test_changed_configuration_is_not_reused(tmp_path):
+    coreInfo, plugins = _createPlugins(str(tmp_path))
+    resultStore = ResultStore(str(tmp_path / ResultStore.DefaultFileName))
+    pluginInfo = plugins[0]
+    fingerprint = ResultStore.getPluginFingerprint(ResultStore.MetaDataTest, pluginInfo, coreInfo, str(tmp_path))
+    resultStore.record(ResultStore.MetaDataTest, pluginInfo.getSourcePath(), pluginInfo.getDataSourceName(),
+                       fingerprint, {'MetaDataTest': 'Succeed'})
+    changedPlugin = Plugin(pluginInfo.getSourcePath(), str(tmp_path / 'Plugin'), 'Simba', {'Host': 'changed'})
+    assert changedPlugin.getDataSourceName() == pluginInfo.getDataSourceName()
+    changedFingerprint = ResultStore.getPluginFingerprint(ResultStore.MetaDataTest, changedPlugin, coreInfo,
+                                                          str(tmp_path))
+    assert resultStore.lookup(ResultStore.MetaDataTest, changedPlugin.getSourcePath(),
+                              changedPlugin.getDataSourceName(), changedFingerprint) is None
@@ -0,0 +1,83 @@
+import csv
+import functools
+import os
+import sqlite3
+import threading
+import time
+
+from ScalabilityLoadEngine import ScalabilityLoadEngine
+
+
+def _connectSlowly(inDelayInSeconds: float):
+    connection = sqlite3.connect(':memory:', check_same_thread=False)
+    connection.create_function('pause', 0, lambda: time.sleep(inDelayInSeconds) or 1)
+    return connection
+
+
+def _readRows(inThreadFilePath: str):
+    with open(inThreadFilePath, newline='') as threadFile:
+        return list(csv.reader(threadFile))
+
+
+def test_thread_files_grow_while_slow_queries_run(tmp_path):
+    outputDir = str(tmp_path) + os.sep
+    engine = ScalabilityLoadEngine(lambda: _connectSlowly(0.5), 1, 3)
+    runner = threading.Thread(target=engine.run, args=(['SELECT pause()'], outputDir))
+    runner.start()
+    try:
+        threadFilePath = os.path.join(ScalabilityLoadEngine.getCycleDir(outputDir, 0), 'Thread_1.csv')
+        time.sleep(0.3)
+        # The header is on disk before the first execution completes
+        assert _readRows(threadFilePath) == [ScalabilityLoadEngine.ThreadFileHeader]
+        time.sleep(1.5)
+        assert len(_readRows(threadFilePath)) > 1
+    finally:
+        engine.stop()
+        runner.join()
+
+
+def _createDatabase(inFilePath: str, inRowCount: int):
+    connection = sqlite3.connect(inFilePath)
+    with connection:
+        connection.execute('CREATE TABLE Numbers (Value INTEGER)')
+        connection.executemany('INSERT INTO Numbers VALUES (?)', ((value,) for value in range(inRowCount)))
+    connection.close()
+    return functools.partial(sqlite3.connect, inFilePath, check_same_thread=False)
+
+
+def test_every_execution_is_recorded_per_thread(tmp_path):
+    outputDir = str(tmp_path / 'Cycle')
+    connectionFactory = _createDatabase(str(tmp_path / 'Benchmark.db'), 2500)
+    engine = ScalabilityLoadEngine(connectionFactory, 2, 30, inMaxExecutionsPerThread=3)
+
+    cycles = engine.run(['SELECT * FROM Numbers', 'SELECT * FROM Missing'], outputDir)
+
+    assert [(cycle['Query'], cycle['Executions'], cycle['Failures']) for cycle in cycles] == [(0, 6, 0), (1, 6, 6)]
+    for queryId, rowCount, errorCode in [(0, 2500, 0), (1, 0, 1)]:
+        for threadNumber in [1, 2]:
+            rows = _readRows(os.path.join(ScalabilityLoadEngine.getCycleDir(outputDir, queryId),
+                                          f"Thread_{threadNumber}.csv"))
+            assert rows[0] == ScalabilityLoadEngine.ThreadFileHeader
+            assert [(int(row[0]), int(row[3]), int(row[4])) for row in rows[1:]] == \
+                   [(queryId, rowCount, errorCode)] * 3
+    assert _readRows(outputDir + ScalabilityLoadEngine.QueriesFileName) == \
+           [['QueryId', 'SQL'], ['0', 'SELECT * FROM Numbers'], ['1', 'SELECT * FROM Missing']]
+
+
+def test_process_pool_runs_picklable_connection_factories(tmp_path):
+    outputDir = str(tmp_path / 'Cycle')
+    connectionFactory = _createDatabase(str(tmp_path / 'Benchmark.db'), 10)
+    engine = ScalabilityLoadEngine(connectionFactory, 2, 30, ScalabilityLoadEngine.ProcessPool, 2)
+
+    cycles = engine.run(['SELECT COUNT(*) FROM Numbers'], outputDir)
+
+    assert [(cycle['Executions'], cycle['Failures']) for cycle in cycles] == [(4, 0)]
+
+
+def test_stopped_engine_runs_no_cycle(tmp_path):
+    engine = ScalabilityLoadEngine(_createDatabase(str(tmp_path / 'Benchmark.db'), 10), 1, 30)
+
+    engine.stop()
+
+    assert engine.run(['SELECT * FROM Numbers'], str(tmp_path / 'Cycle')) == list()
+    assert not os.path.exists(ScalabilityLoadEngine.getCycleDir(str(tmp_path / 'Cycle'), 0))
@@ -0,0 +1,27 @@
+import csv
+import os
+
+from Packages import Plugin
+from ScalabilityLoadEngine import ScalabilityLoadEngine
+from ScalabilityResultsAnalyzer import ScalabilityResultsAnalyzer
+from ScalabilityTestRunner import ScalabilityTestRunner
+
+
+def _writeThreadFile(inOutputDir: str, inThreadNumber: int, inRows: list):
+    cycleDir = ScalabilityLoadEngine.getCycleDir(inOutputDir, 0)
+    os.makedirs(cycleDir, exist_ok=True)
+    with open(os.path.join(cycleDir, f"Thread_{inThreadNumber}.csv"), 'w', newline='') as threadFile:
+        csv.writer(threadFile).writerows(inRows)
+
+
+def test_plugins_run_the_engine_whose_thread_files_are_analyzed(tmp_path):
+    pluginInfo = Plugin(str(tmp_path / 'Bench_64.zip'), str(tmp_path / 'Plugin'), 'Simba', {'Host': 'localhost'})
+    outputDir = str(tmp_path / 'Simba_Bench_64') + os.sep
+    _writeThreadFile(outputDir, 1, [ScalabilityLoadEngine.ThreadFileHeader, [0, 0, 10, 1, 0], [0, 10, 30, 1, 0]])
+    # Thread Files of ScalabilityTester.exe have a layout of their own
+    _writeThreadFile(outputDir, 2, [['Query', 'Elapsed'], ['SELECT 1', 12]])
+
+    report = ScalabilityResultsAnalyzer(outputDir, 1, 2).analyze()
+
+    assert pluginInfo.getScalabilityEngine() == ScalabilityTestRunner.NativeThreadPoolEngine
+    assert report['Cycles']['0']['Threads'] == 1 and report['Overall']['Executions'] == 2
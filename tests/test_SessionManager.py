@@ -0,0 +1,102 @@
+import SessionManager as SessionManagerModule
+from SessionManager import LocalTransport, SessionManager, ShareTransport
+
+HostAddress = 'remote-host'
+UNC = SessionManager.getUNC(HostAddress)
+
+
+def _noSleep(inMonkeyPatch):
+    delays = list()
+    inMonkeyPatch.setattr(SessionManagerModule.time, 'sleep', delays.append)
+    return delays
+
+
+def test_jobs_share_one_session_until_it_is_closed():
+    transport = LocalTransport()
+    sessionManager = SessionManager(transport)
+
+    assert sessionManager.acquire(HostAddress, 'user', 'password')
+    assert sessionManager.acquire(HostAddress, 'user', 'password')
+    assert transport.getStatistics()['Connects'] == 1
+    assert sessionManager.getStatistics()['Reuses'] == 1
+    assert sessionManager.getStatistics()['Sessions'] == {UNC: 2}
+
+    assert sessionManager.release(HostAddress)
+    # A session in use is not closed
+    assert sessionManager.close(HostAddress)
+    assert transport.getSessions() == {UNC: 'user'}
+    assert sessionManager.release(HostAddress)
+    assert not sessionManager.release(HostAddress)
+    # A session left without users stays open for the next job
+    assert sessionManager.getStatistics()['Sessions'] == {UNC: 0}
+    assert sessionManager.close()
+    assert transport.getSessions() == dict()
+
+
+def test_session_in_use_is_not_taken_over_by_other_credentials():
+    transport = LocalTransport()
+    sessionManager = SessionManager(transport)
+    assert sessionManager.acquire(HostAddress, 'user', 'password')
+
+    assert not sessionManager.acquire(HostAddress, 'other', 'password')
+    assert transport.getSessions() == {UNC: 'user'}
+
+    # Once released, the session is opened again with the other credentials
+    assert sessionManager.release(HostAddress)
+    assert sessionManager.acquire(HostAddress, 'other', 'password')
+    assert transport.getSessions() == {UNC: 'other'}
+    assert transport.getStatistics()['Connects'] == 2
+
+
+def test_credential_conflict_is_retried_as_an_attempt(monkeypatch):
+    _noSleep(monkeypatch)
+    transport = LocalTransport()
+    transport.failNextConnects(UNC, [ShareTransport.SessionCredentialConflict])
+    assert not SessionManager(transport, inMaxAttempts=1).acquire(HostAddress, 'user', 'password')
+
+    transport.failNextConnects(UNC, [ShareTransport.SessionCredentialConflict])
+    sessionManager = SessionManager(transport, inMaxAttempts=2)
+    assert sessionManager.acquire(HostAddress, 'user', 'password')
+    assert sessionManager.getStatistics()['Retries'] == 1
+    assert transport.getStatistics()['Connects'] == 3
+
+
+def test_connecting_gives_up_after_the_attempts_with_bounded_delays(monkeypatch):
+    delays = _noSleep(monkeypatch)
+    transport = LocalTransport()
+    transport.failNextConnects(UNC, [ShareTransport.BadNetworkPath] * 10)
+    sessionManager = SessionManager(transport, inMaxAttempts=5, inBaseDelayInSeconds=0.5, inMaxDelayInSeconds=1)
+
+    assert not sessionManager.acquire(HostAddress, 'user', 'password')
+    assert transport.getStatistics()['Connects'] == 5
+    assert delays == [0.5, 1, 1, 1]
+    assert sessionManager.getStatistics()['Retries'] == 4
+    assert sessionManager.getStatistics()['Sessions'] == dict()
+
+
+def test_logon_failure_is_not_retried(monkeypatch):
+    delays = _noSleep(monkeypatch)
+    transport = LocalTransport()
+    transport.failNextConnects(UNC, [ShareTransport.LogonFailure])
+
+    assert not SessionManager(transport).acquire(HostAddress, 'user', 'password')
+    assert transport.getStatistics()['Connects'] == 1
+    assert delays == list()
+
+
+def test_lost_session_is_connected_again():
+    transport = LocalTransport()
+    sessionManager = SessionManager(transport, inHealthCheckIntervalInSeconds=0)
+    assert sessionManager.acquire(HostAddress, 'user', 'password')
+    assert sessionManager.release(HostAddress)
+
+    transport.dropSession(UNC)
+
+    assert sessionManager.acquire(HostAddress, 'user', 'password')
+    assert sessionManager.getStatistics()['HealthCheckFailures'] == 1
+    assert transport.getStatistics()['Connects'] == 2
+    assert transport.getStatistics()['Disconnects'] == 1
+    # The new session is healthy & reused
+    assert sessionManager.release(HostAddress)
+    assert sessionManager.acquire(HostAddress, 'user', 'password')
+    assert transport.getStatistics()['Connects'] == 2
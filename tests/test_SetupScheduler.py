@@ -0,0 +1,33 @@
+import os
+
+from Benchmark import CoreBranch, generateCore, generatePlugin
+from Packages import Core, Plugin
+from SetupScheduler import TaskScheduler, schedulePluginSetup
+
+
+def test_entries_of_one_package_share_the_download_and_write_their_own_dsn(tmp_path):
+    corePath = generateCore(str(tmp_path / 'Source'), 2, 16)
+    pluginPath = generatePlugin(str(tmp_path / 'Source'), 2, 16)
+    coreInfo = Core(corePath, str(tmp_path / 'Core'), CoreBranch)
+    plugins = [Plugin(pluginPath, str(tmp_path / 'Plugin'), 'Simba', {'Host': host}) for host in ['first', 'second']]
+    Plugin.assignUniqueDataSourceNames(plugins)
+    configuredHosts = list()
+    for pluginInfo in plugins:
+        # The Registry is not available here, only the configuration written is checked
+        pluginInfo.configureRegistry = lambda inPluginInfo=pluginInfo: configuredHosts.append(
+            (inPluginInfo.getDataSourceName(), inPluginInfo.getDataSourceConfiguration()['Host'])) is None
+
+    scheduler = TaskScheduler()
+    setupTasks = [schedulePluginSetup(scheduler, pluginInfo, coreInfo) for pluginInfo in plugins]
+    scheduler.run()
+
+    assert len(set(setupTasks)) == 2
+    assert all(scheduler.succeeded(setupTask) for setupTask in setupTasks)
+    assert sorted(configuredHosts) == [(plugins[0].getDataSourceName(), 'first'),
+                                       (plugins[1].getDataSourceName(), 'second')]
+    assert plugins[0].getDataSourceName() != plugins[1].getDataSourceName()
+    # The Package is extracted & overlaid once for both entries
+    report = scheduler.getReport()
+    assert len([name for name in report if name.endswith(':Extract') and 'Core' not in name]) == 1
+    assert len([name for name in report if name.endswith(':Overlay')]) == 1
+    assert os.path.exists(os.path.join(plugins[0].getDestinationPath(), 'lib'))
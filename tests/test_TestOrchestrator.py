@@ -0,0 +1,104 @@
+import glob
+import json
+import os
+import subprocess
+import sys
+
+import MetaTestRunner
+import TestOrchestrator
+from Benchmark import CoreBranch, generateCore, generatePlugin
+from Input import InputReader
+from Packages import Plugin
+from TestOrchestrator import TestKind
+
+RepositoryDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_runners_are_not_imported_with_the_orchestrator():
+    modules = ['MetaTestRunner', 'INIFileTestRunner', 'FailureStore', 'LogArchive', 'MismatchClassifier']
+    output = subprocess.run([sys.executable, '-c', f"import sys, TestOrchestrator; "
+                                                   f"print([name for name in {modules} if name in sys.modules])"],
+                            cwd=RepositoryDir, capture_output=True, text=True, check=True).stdout
+
+    assert output.strip() == '[]'
+
+
+def _writeInputFile(inDir: str, inInputFile: dict):
+    with open(os.path.join(inDir, 'input.json'), 'w') as file:
+        json.dump(inInputFile, file)
+    return 'input.json'
+
+
+def _createInputFile(inDir: str, inPackageCache: dict = None):
+    corePath = generateCore(os.path.join(inDir, 'Source'), 2, 16)
+    pluginPath = generatePlugin(os.path.join(inDir, 'Source'), 2, 16)
+    inputFile = {InputReader.RemoteMachineAddress: 'localhost',
+                 InputReader.Core: {InputReader.SourcePath: corePath, InputReader.DestPath: os.path.join(inDir, 'Core'),
+                                    InputReader.Branch: CoreBranch, InputReader.ForceUpdate: False},
+                 InputReader.Plugin: {InputReader.Compile: [
+                     {InputReader.SourcePath: pluginPath, InputReader.DestPath: os.path.join(inDir, 'Plugin'),
+                      InputReader.Brand: 'Simba', InputReader.DataSourceConfiguration: {'Host': 'localhost'},
+                      InputReader.WaitForUserToSetupDSN: False, InputReader.ForceUpdate: False}]}}
+    if inPackageCache is not None:
+        inputFile[InputReader.PackageCache] = inPackageCache
+    return inputFile
+
+
+def _orchestrate(inBasePath: str, inputFileName: str, inMonkeyPatch):
+    # Neither the Remote Machine, the Registry nor MetaTester are available here
+    inMonkeyPatch.setattr(TestOrchestrator.RemoteConnection, 'connect', lambda self: True)
+    inMonkeyPatch.setattr(TestOrchestrator.RemoteConnection, 'disconnect', lambda self: True)
+    inMonkeyPatch.setattr(Plugin, 'configureRegistry', lambda self, *arguments: True)
+    testedHosts = list()
+    inMonkeyPatch.setattr(MetaTestRunner, '_runMetaDataTest', lambda inPluginInfo, *arguments: testedHosts.append(
+        inPluginInfo.getDataSourceConfiguration()['Host']) or {TestKind.MetaData: 'Succeed'})
+    return TestOrchestrator.orchestrate('user', 'password', inBasePath, inputFileName, [TestKind.MetaData]), \
+        testedHosts
+
+
+def test_packages_are_extracted_from_the_share_without_a_cache(tmp_path, monkeypatch):
+    inputFileName = _writeInputFile(str(tmp_path), _createInputFile(str(tmp_path)))
+
+    summary, testedHosts = _orchestrate(str(tmp_path), inputFileName, monkeypatch)
+
+    assert summary['CoreSetup'] == 'Succeed' and testedHosts == ['localhost']
+    assert 'PackageCache' not in summary
+    assert not (tmp_path / InputReader.PackageCache).exists()
+    # The only archives are the ones of the share
+    assert sorted(os.path.relpath(path, tmp_path) for path in glob.glob(str(tmp_path / '**' / '*.zip'),
+                                                                          recursive=True)) == \
+        [os.path.join('Source', 'Bench_64.zip'), os.path.join('Source', 'Core.zip')]
+
+
+def test_packages_are_copied_into_the_configured_cache(tmp_path, monkeypatch):
+    inputFileName = _writeInputFile(str(tmp_path), _createInputFile(str(tmp_path), {'SizeQuotaInGB': 1}))
+
+    summary, _ = _orchestrate(str(tmp_path), inputFileName, monkeypatch)
+
+    assert summary['PackageCache']['Misses'] == 2
+    assert len(glob.glob(str(tmp_path / InputReader.PackageCache / '*.zip'))) == 2
+
+
+def test_entries_of_several_cores_are_each_tested_on_their_own_core(tmp_path, monkeypatch):
+    inputFile = _createInputFile(str(tmp_path))
+    pluginEntry = inputFile[InputReader.Plugin][InputReader.Compile][0]
+    for release in ['Current', 'Next']:
+        generateCore(str(tmp_path / 'Source' / release), 2, 16)
+    inputFile[InputReader.Plugin][InputReader.Compile] = [{
+        InputReader.Matrix: {'Release': ['Current', 'Next']},
+        InputReader.Core: {InputReader.SourcePath: os.path.join(str(tmp_path), 'Source', '{Release}', 'Core.zip'),
+                           InputReader.DestPath: os.path.join(str(tmp_path), 'Core_{Release}'),
+                           InputReader.Branch: CoreBranch, InputReader.ForceUpdate: True},
+        InputReader.Plugin: dict(pluginEntry, **{InputReader.DestPath: os.path.join(str(tmp_path), 'Plugin_{Release}'),
+                                                 InputReader.DataSourceConfiguration: {'Host': '{Release}'}})}]
+    inputFileName = _writeInputFile(str(tmp_path), inputFile)
+    # Every entry is read in a batch of its own
+    monkeypatch.setattr(TestOrchestrator, 'BatchSize', 1)
+
+    summary, testedHosts = _orchestrate(str(tmp_path), inputFileName, monkeypatch)
+
+    assert 'InputErrors' not in summary and summary['CoreSetup'] == 'Succeed'
+    assert testedHosts == ['Current', 'Next']
+    assert [pluginSummary['Setup'] for pluginSummary in summary['Plugins'].values()] == ['Succeed', 'Succeed']
+    for release in ['Current', 'Next']:
+        assert (tmp_path / f"Core_{release}").is_dir() and (tmp_path / f"Plugin_{release}").is_dir()